@@ -0,0 +1,90 @@
+"""
+Benchmark of the native and Deepchecks feature correlation engines.
+
+Times the feature-label (PPS) and feature-feature correlation checks of
+`src.feature_correlation` on the processed training data, computed by the
+Deepchecks checks and by the native NumPy engine of
+`src.correlation_engine`, then times both engines on synthetic data with a
+growing number of numeric and categorical features. The Deepchecks engine
+is skipped on widths above --max-deepchecks-features.
+
+Usage:
+    python benchmarks/bench_correlation_engine.py --train-data data/processed_data/preprocess_train.csv --n-jobs 2
+"""
+
+import click
+import os
+import sys
+import time
+import warnings
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.correlation_engine import feature_feature_correlation, pairs_above_threshold, predictive_power_scores
+from src.feature_correlation import CAT_FEATURES, MAX_FEATURE_CORRELATION, MAX_FEATURE_PPS
+from src.read_data import read_data
+
+warnings.filterwarnings("ignore", category=FutureWarning)
+warnings.filterwarnings("ignore", category=UserWarning)
+
+
+def _synthetic(n_rows, n_features, seed=522):
+    """Returns data with n_features features (a quarter categorical) and a binary target."""
+    rng = np.random.default_rng(seed)
+    n_cat = n_features // 4
+    columns = {f"num_{i}": rng.normal(size=n_rows) for i in range(n_features - n_cat)}
+    columns.update({f"cat_{i}": rng.choice(list("abcdefgh"), n_rows) for i in range(n_cat)})
+    columns["target"] = rng.integers(0, 2, n_rows)
+    return pd.DataFrame(columns), [f"cat_{i}" for i in range(n_cat)]
+
+
+def _time_engines(df, cat_features, n_jobs, deepchecks):
+    """Returns the seconds and results of both checks per engine."""
+    rows = []
+    start = time.perf_counter()
+    pps = predictive_power_scores(df, "target", n_jobs=n_jobs)
+    pps_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    pairs = pairs_above_threshold(feature_feature_correlation(df, "target", cat_features), MAX_FEATURE_CORRELATION)
+    rows.append(("native", pps_seconds, pps.max(), time.perf_counter() - start, len(pairs)))
+
+    if deepchecks:
+        from deepchecks.tabular import Dataset
+        from deepchecks.tabular.checks import FeatureFeatureCorrelation, FeatureLabelCorrelation
+        ds = Dataset(df, label="target", cat_features=cat_features)
+        start = time.perf_counter()
+        pps = FeatureLabelCorrelation().run(ds).value
+        pps_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        matrix = FeatureFeatureCorrelation().run(ds).value.astype(float)
+        pairs = pairs_above_threshold(matrix, MAX_FEATURE_CORRELATION)
+        rows.append(("deepchecks", pps_seconds, max(pps.values()), time.perf_counter() - start, len(pairs)))
+    return pd.DataFrame(rows, columns=["engine", "pps_seconds", "max_pps", "correlation_seconds", "pairs_above"])
+
+
+@click.command()
+@click.option('--train-data', type=str, default='data/processed_data/preprocess_train.csv',
+              help="Path to the processed training data (CSV, Parquet or Arrow)")
+@click.option('--n-jobs', type=int, default=1, show_default=True, help="Parallel workers scoring the PPS")
+@click.option('--rows', type=int, default=10_000, show_default=True, help="Rows of the synthetic data")
+@click.option('--widths', type=str, default='20,50,100,200,400', show_default=True,
+              help="Comma-separated numbers of synthetic features")
+@click.option('--max-deepchecks-features', type=int, default=100, show_default=True,
+              help="Widest synthetic data timed with Deepchecks")
+def main(train_data, n_jobs, rows, widths, max_deepchecks_features):
+    """Prints the check timings of both engines."""
+    train_df = read_data(train_data)
+    print(f"{train_data}: {train_df.shape[0]} rows, {train_df.shape[1] - 1} features "
+          f"(thresholds: PPS {MAX_FEATURE_PPS}, pairwise {MAX_FEATURE_CORRELATION})")
+    print(_time_engines(train_df, CAT_FEATURES, n_jobs, deepchecks=True).round(4).to_string(index=False))
+
+    for width in [int(w) for w in widths.split(",")]:
+        df, cat_features = _synthetic(rows, width)
+        print(f"\nSynthetic: {rows} rows, {width} features ({len(cat_features)} categorical)")
+        results = _time_engines(df, cat_features, n_jobs, deepchecks=width <= max_deepchecks_features)
+        print(results.round(4).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark of the EDA distribution plots.
+
+Renders the numeric and categorical distribution plots of the raw data,
+repeated to several sizes, once with `altair_ally.dist` on the data rows
+and once from the aggregated chart data of `src.chart_data`, and reports
+the size of the Vega-Lite spec, the render time and the share of pixels
+that differ between the two PNGs.
+
+Usage:
+    python benchmarks/bench_eda_plots.py --raw-data data/raw/raw_data.csv --scale 1 --scale 4
+"""
+
+import click
+import io
+import json
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.chart_data import category_counts, density_curves, rug_ticks
+from src.create_visualizations import categorical_dist_chart, numeric_dist_chart
+
+
+def render(chart):
+    """Returns the spec size in MB, the PNG render seconds and the image as an array."""
+    from PIL import Image
+
+    spec_mb = len(json.dumps(chart.to_dict())) / 1e6
+    start = time.perf_counter()
+    png = io.BytesIO()
+    chart.save(png, format="png")
+    seconds = time.perf_counter() - start
+    return spec_mb, seconds, np.asarray(Image.open(png).convert("RGB")).astype(int)
+
+
+@click.command()
+@click.option('--raw-data', type=str, default='data/raw/raw_data.csv', help="Path to the raw data CSV")
+@click.option('--scale', 'scales', type=int, multiple=True, help="Times the raw data is repeated (repeatable)")
+def main(raw_data, scales):
+    """Prints the spec size, render time and pixel difference of both ways of plotting."""
+    import altair as alt
+    import altair_ally as aly
+
+    alt.data_transformers.disable_max_rows()
+    raw_df = pd.read_csv(raw_data, index_col=0)
+    numeric = raw_df.select_dtypes('number').columns.tolist()
+    categorical = raw_df.select_dtypes('object').columns.tolist()
+
+    rows = []
+    for scale in scales or (1,):
+        df = pd.concat([raw_df] * scale, ignore_index=True)
+        start = time.perf_counter()
+        aggregated = {
+            "numeric": numeric_dist_chart(density_curves(df, numeric, 'y'), rug_ticks(df, numeric)),
+            "categorical": categorical_dist_chart(category_counts(df, categorical, 'y')),
+        }
+        aggregate_seconds = time.perf_counter() - start
+        original = {"numeric": aly.dist(df, color='y'), "categorical": aly.dist(df, dtype='object', color='y')}
+        for plot in original:
+            spec_rows, seconds_rows, image_rows = render(original[plot])
+            spec_agg, seconds_agg, image_agg = render(aggregated[plot])
+            differ = (np.abs(image_rows - image_agg).max(axis=2) > 30).mean() if image_rows.shape == image_agg.shape \
+                else np.nan
+            rows.append((len(df), plot, spec_rows, spec_agg, seconds_rows, seconds_agg, differ))
+        print(f"{len(df)} rows: aggregation {aggregate_seconds:.2f} s")
+
+    print(pd.DataFrame(rows, columns=["rows", "plot", "spec_mb_rows", "spec_mb_aggregated", "render_s_rows",
+                                      "render_s_aggregated", "pixels_differing"]).round(4).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
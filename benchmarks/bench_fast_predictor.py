@@ -0,0 +1,77 @@
+"""
+Micro-benchmark of the compiled fast-path predictor against the pipeline.
+
+Scores single rows and a large batch of the processed data with the fitted
+sklearn pipeline and with the predictor compiled from it by
+`src.fast_predictor.compile_pipeline`, checks that the predictions are
+identical, and reports the time per call. Single rows are timed both as a
+one-row DataFrame and, for the compiled predictor, as a dict record.
+
+Usage:
+    python benchmarks/bench_fast_predictor.py --batch-rows 10000
+"""
+
+import click
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+import warnings
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.batch_predict import load_pipeline
+from src.fast_predictor import compile_pipeline
+
+warnings.filterwarnings("ignore", category=FutureWarning)
+warnings.filterwarnings("ignore", category=UserWarning)
+
+
+def time_per_call(fn, args, min_seconds=1.0):
+    """Returns the mean seconds per call of fn over the argument list, repeated for at least min_seconds."""
+    fn(args[0])
+    calls, start = 0, time.perf_counter()
+    while time.perf_counter() - start < min_seconds:
+        for arg in args:
+            fn(arg)
+        calls += len(args)
+    return (time.perf_counter() - start) / calls
+
+
+@click.command()
+@click.option('--pipeline-from', type=str, default='results/models/svc_pipeline.pickle',
+              help="Path to the trained pipeline pickle")
+@click.option('--data', type=str, default='data/processed_data/preprocess_test.csv',
+              help="Processed data CSV to score")
+@click.option('--target-col', type=str, default='target', help="Name of the target/label column")
+@click.option('--batch-rows', type=int, default=10000, show_default=True,
+              help="Rows in the batch, drawn with replacement from the data")
+@click.option('--seed', type=int, default=522, help="Random seed")
+def main(pipeline_from, data, target_col, batch_rows, seed):
+    """Prints the time per call of both predictors for single rows and a batch."""
+    pipe = load_pipeline(pipeline_from)
+    predictor = compile_pipeline(pipe)
+
+    X = pd.read_csv(data).drop(columns=target_col)
+    batch = X.sample(batch_rows, replace=batch_rows > len(X), random_state=seed)
+    assert np.array_equal(predictor.predict(batch), pipe.predict(batch)), "predictions differ"
+    max_diff = np.abs(predictor.decision_function(batch) - pipe.decision_function(batch)).max()
+
+    rows = [X.iloc[[i]] for i in range(min(len(X), 200))]
+    records = X.head(200).to_dict(orient="records")
+    timings = [
+        ("single row (DataFrame)", "sklearn pipeline", time_per_call(pipe.decision_function, rows)),
+        ("single row (DataFrame)", "fast predictor", time_per_call(predictor.decision_function, rows)),
+        ("single row (dict)", "fast predictor", time_per_call(predictor.decision_record, records)),
+        (f"{batch_rows} rows", "sklearn pipeline", time_per_call(pipe.decision_function, [batch], 3.0)),
+        (f"{batch_rows} rows", "fast predictor", time_per_call(predictor.decision_function, [batch], 3.0)),
+    ]
+
+    results = pd.DataFrame(timings, columns=["input", "predictor", "ms_per_call"])
+    results["ms_per_call"] = (results["ms_per_call"] * 1000).round(3)
+    print(results.to_string(index=False))
+    print(f"Predictions identical; max decision score difference {max_diff:.1e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark of the start-up time of the command-line scripts.
+
+Runs every script in scripts/ with `--help` in a fresh interpreter under
+`python -X importtime`, and reports the wall time of the run, the total
+import time and the heaviest top-level packages imported. The scoring
+path (`src.batch_predict` loading a model artifact) is timed the same way.
+
+Usage:
+    python benchmarks/bench_import_time.py --repeats 3 --top 3
+"""
+
+import click
+import glob
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+import pandas as pd
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Loads the exported model artifact and scores one processed row
+SCORING_CODE = """
+import sys
+sys.path.append('.')
+from src.batch_predict import load_pipeline
+import pandas as pd
+model = load_pipeline('results/models/svc_artifact')
+row = pd.read_csv('data/processed_data/preprocess_test.csv', nrows=1).drop(columns='target')
+model.predict(row)
+"""
+
+_IMPORT_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+\d+\s+\|\s*(\S+)")
+
+
+def import_profile(command):
+    """
+    Runs a command under `-X importtime`.
+
+    Parameters
+    ----------
+    command : list of str
+        Arguments after `python -X importtime`.
+
+    Returns
+    -------
+    tuple
+        The wall seconds of the run, the total import seconds and a dict of
+        the import seconds spent in each top-level package's own modules.
+    """
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", *command], cwd=PROJECT_ROOT,
+                            capture_output=True, text=True)
+    wall_seconds = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(command)} failed:\n{result.stderr[-2000:]}")
+    packages = defaultdict(float)
+    for line in result.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            packages[match.group(2).split('.')[0]] += int(match.group(1)) / 1e6
+    return wall_seconds, sum(packages.values()), packages
+
+
+@click.command()
+@click.option('--repeats', type=int, default=3, show_default=True, help="Runs per command; the fastest is reported")
+@click.option('--top', type=int, default=3, show_default=True, help="Number of heaviest packages listed")
+def main(repeats, top):
+    """Prints the start-up time of every script's --help and of the scoring path."""
+    commands = {os.path.relpath(path, PROJECT_ROOT): [os.path.relpath(path, PROJECT_ROOT), "--help"]
+                for path in sorted(glob.glob(os.path.join(PROJECT_ROOT, "scripts", "*.py")))}
+    commands["score one row (artifact)"] = ["-c", SCORING_CODE]
+
+    rows = []
+    for name, command in commands.items():
+        wall_seconds, import_seconds, packages = min((import_profile(command) for _ in range(repeats)),
+                                                     key=lambda profile: profile[0])
+        heaviest = sorted(packages.items(), key=lambda item: -item[1])[:top]
+        rows.append((name, round(wall_seconds, 3), round(import_seconds, 3),
+                     ", ".join(f"{package} {seconds:.2f}" for package, seconds in heaviest)))
+    print(pd.DataFrame(rows, columns=["command", "wall_seconds", "import_seconds", "heaviest_imports"])
+          .to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
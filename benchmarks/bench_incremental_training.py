@@ -0,0 +1,82 @@
+"""
+Benchmark of incremental model updates against full retraining.
+
+Engineers the features of the raw data, holds out a stratified test split
+and cuts the rest into consecutive "weekly" training files. For every week,
+updates the incremental model (src/incremental_training.py) from the
+previous week's checkpoint with that week's file only, and retrains the
+'approx' Nystroem + LinearSVC pipeline of src/svc_models.py from
+scratch on all the weeks so far, as the training script would. Reports the
+time of each update and retraining and the test accuracy of both models.
+
+Usage:
+    python benchmarks/bench_incremental_training.py --raw-data data/raw/raw_data.csv --weeks 8
+"""
+
+import click
+import os
+import pickle
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import warnings
+from sklearn.model_selection import train_test_split
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.feature_engineering import FeatureEngineer, encode_target
+from src.incremental_training import train_incremental
+from src.svc_models import build_svc_pipeline
+
+warnings.filterwarnings("ignore", category=FutureWarning)
+warnings.filterwarnings("ignore", category=UserWarning)
+
+
+@click.command()
+@click.option('--raw-data', type=str, default='data/raw/raw_data.csv', help="Path to the raw data CSV")
+@click.option('--preprocessor', type=str, default='results/models/data_preprocessor.pickle',
+              help="Path to preprocessor pickle object")
+@click.option('--weeks', type=int, default=8, show_default=True, help="Number of weekly training files")
+@click.option('--chunk-size', type=int, default=50000, show_default=True, help="Rows trained on at a time")
+@click.option('--seed', type=int, default=522, help="Random seed")
+def main(raw_data, preprocessor, weeks, chunk_size, seed):
+    """Prints the time and test accuracy of every incremental update and full retraining."""
+    raw_df = pd.read_csv(raw_data, index_col=0)
+    processed_df = FeatureEngineer().fit_transform(raw_df)
+    processed_df['target'] = encode_target(raw_df['y'])
+    train_df, test_df = train_test_split(processed_df, test_size=0.2, stratify=processed_df['target'],
+                                         random_state=seed)
+    X_test, y_test = test_df.drop(columns='target'), test_df['target']
+
+    with open(preprocessor, "rb") as f:
+        data_preprocessor = pickle.load(f)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        checkpoint = os.path.join(tmp_dir, "checkpoint.pickle")
+        for week, week_df in enumerate(np.array_split(train_df, weeks), start=1):
+            week_file = os.path.join(tmp_dir, f"week_{week}.csv")
+            week_df.to_csv(week_file, index=False)
+
+            start = time.perf_counter()
+            state = train_incremental(week_file, checkpoint, data_preprocessor, seed, chunk_size)
+            update_seconds = time.perf_counter() - start
+
+            seen_df = train_df.head(state["n_rows"])
+            pipe, _ = build_svc_pipeline(data_preprocessor, seed, "approx")
+            start = time.perf_counter()
+            pipe.fit(seen_df.drop(columns='target'), seen_df['target'])
+            retrain_seconds = time.perf_counter() - start
+
+            results.append((week, len(week_df), state["n_rows"], update_seconds, retrain_seconds,
+                            state["pipeline"].score(X_test, y_test), pipe.score(X_test, y_test)))
+
+    results = pd.DataFrame(results, columns=["week", "new_rows", "total_rows", "update_s", "retrain_s",
+                                             "update_accuracy", "retrain_accuracy"])
+    results["speedup"] = results["retrain_s"] / results["update_s"]
+    print(results.round(3).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark of loading the pickled search object against the model artifact.
+
+For each saved model, a fresh Python process imports the loader, loads the
+model and predicts one row. The benchmark reports the size on disk, the
+time to the first prediction (including interpreter start-up and imports)
+and the peak resident memory (RSS) of that process, which is what every
+new scoring or serving worker pays.
+
+Usage:
+    python benchmarks/bench_model_artifact.py --repeats 5
+"""
+
+import click
+import json
+import os
+import subprocess
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+# Run in a fresh interpreter: load one model, score one row, report peak RSS
+COLD_START = """
+import resource, sys, warnings
+warnings.filterwarnings("ignore")
+sys.path.append({root!r})
+import pandas as pd
+from src.batch_predict import load_pipeline
+model = load_pipeline({model!r})
+X = pd.read_csv({data!r}, nrows=1).drop(columns={target_col!r})
+model.decision_function(X)
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)
+"""
+
+
+def size_on_disk(path):
+    """Returns the size in bytes of a file, or of all files in a directory."""
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+    return os.path.getsize(path)
+
+
+def cold_start(model, data, target_col):
+    """Returns the seconds to the first prediction and the peak RSS in MB."""
+    code = COLD_START.format(root=ROOT, model=model, data=data, target_col=target_col)
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    return time.perf_counter() - start, float(output.split()[-1])
+
+
+@click.command()
+@click.option('--pickle-from', type=str, default='results/models/svc_pipeline.pickle',
+              help="Path to the pickled search object")
+@click.option('--artifact-from', type=str, default='results/models/svc_artifact',
+              help="Path to the model artifact directory")
+@click.option('--data', type=str, default='data/processed_data/preprocess_test.csv',
+              help="Processed data CSV to predict one row of")
+@click.option('--target-col', type=str, default='target', help="Name of the target/label column")
+@click.option('--repeats', type=int, default=5, show_default=True, help="Cold starts per model")
+def main(pickle_from, artifact_from, data, target_col, repeats):
+    """Prints size on disk, cold-start time and peak RSS of both formats."""
+    records = []
+    for name, path in [("pickle", pickle_from), ("artifact", artifact_from)]:
+        runs = [cold_start(path, data, target_col) for _ in range(repeats)]
+        seconds, rss = np.median(np.array(runs), axis=0)
+        records.append({"format": name, "size_kb": round(size_on_disk(path) / 1024, 1),
+                        "cold_start_seconds": round(seconds, 3), "peak_rss_mb": round(rss, 1)})
+
+    print(pd.DataFrame(records).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
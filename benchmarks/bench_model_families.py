@@ -0,0 +1,108 @@
+"""
+Benchmark of the model families of the model registry.
+
+Tunes every model family of src/model_registry.py (the exact and approx
+SVC, logistic regression and histogram gradient boosting) with the same
+randomized search on the processed training data, and reports for the
+best pipeline of each:
+
+- the cross-validation accuracy of the search and the test accuracy;
+- the search time and the time to fit the best pipeline on all rows;
+- the predict latency of a single row (median) and per row of a batch;
+- the size of the pickled pipeline, i.e. the deployed model.
+
+Usage:
+    python benchmarks/bench_model_families.py \
+        --train-data data/processed_data/preprocess_train.csv \
+        --test-data data/processed_data/preprocess_test.csv \
+        --preprocessor results/models/data_preprocessor.pickle
+"""
+
+import click
+import os
+import pickle
+import sys
+import time
+import numpy as np
+import pandas as pd
+import warnings
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.model_registry import search_model
+from src.read_data import read_data
+
+warnings.filterwarnings("ignore", category=FutureWarning)
+warnings.filterwarnings("ignore", category=UserWarning)
+
+# (model, svc mode) of every benchmarked model family
+FAMILIES = [("svc", "exact"), ("svc", "approx"), ("logistic_regression", None), ("hist_gradient_boosting", None)]
+
+
+def predict_latency(pipe, X, n_single):
+    """Returns the median seconds to predict one row, and the seconds per row of a batch predict."""
+    single = []
+    for i in range(min(n_single, len(X))):
+        row = X.iloc[[i]]
+        start = time.perf_counter()
+        pipe.predict(row)
+        single.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    pipe.predict(X)
+    return float(np.median(single)), (time.perf_counter() - start) / len(X)
+
+
+@click.command()
+@click.option('--train-data', type=str, default='data/processed_data/preprocess_train.csv',
+              help="Path to processed training data (CSV, Parquet or Arrow)")
+@click.option('--test-data', type=str, default='data/processed_data/preprocess_test.csv',
+              help="Path to processed test data (CSV, Parquet or Arrow)")
+@click.option('--preprocessor', type=str, default='results/models/data_preprocessor.pickle',
+              help="Path to preprocessor pickle object")
+@click.option('--target-col', type=str, default='target', help="Name of the target/label column")
+@click.option('--n-iter', type=int, default=20, show_default=True, help="Candidates sampled per model family")
+@click.option('--n-single', type=int, default=200, show_default=True, help="Rows timed one at a time")
+@click.option('--table-to', type=str, default=None, help="Optional CSV path for the results")
+@click.option('--seed', type=int, default=522, help="Random seed")
+def main(train_data, test_data, preprocessor, target_col, n_iter, n_single, table_to, seed):
+    """Prints the accuracy, training cost and serving cost of every model family."""
+    train_df = read_data(train_data, typed=True)
+    test_df = read_data(test_data, typed=True)
+    X_train, y_train = train_df.drop(columns=target_col), train_df[target_col]
+    X_test, y_test = test_df.drop(columns=target_col), test_df[target_col]
+
+    with open(preprocessor, "rb") as f:
+        data_preprocessor = pickle.load(f)
+
+    records = []
+    for model, mode in FAMILIES:
+        name = model if mode is None else f"{model} ({mode})"
+        start = time.perf_counter()
+        search_cv = search_model(model, X_train, y_train, data_preprocessor, seed, mode=mode or "exact",
+                                 n_iter=n_iter)
+        search_seconds = time.perf_counter() - start
+        pipe = search_cv.best_estimator_
+
+        single_seconds, batch_seconds = predict_latency(pipe, X_test, n_single)
+        records.append({
+            "model": name,
+            "cv_accuracy": search_cv.best_score_,
+            "test_accuracy": pipe.score(X_test, y_test),
+            "search_s": search_seconds,
+            "fit_s": search_cv.refit_time_,
+            "predict_row_ms": single_seconds * 1e3,
+            "predict_batch_us_per_row": batch_seconds * 1e6,
+            "size_kb": len(pickle.dumps(pipe)) / 1e3,
+        })
+        print(f"{name}: CV accuracy {search_cv.best_score_:.4f} in {search_seconds:.1f} s")
+
+    results = pd.DataFrame(records)
+    print()
+    print(results.round(4).to_string(index=False))
+    if table_to:
+        results.to_csv(table_to, index=False)
+        print(f"Benchmark table saved to {table_to}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""
+Comparison of hyperparameter search strategies for the SVC pipeline.
+
+Runs `search_svc` once per search strategy on the processed training data and
+reports the best cross-validation accuracy against the compute spent to find
+it. 'total_fit_seconds' sums the fit time of every candidate and fold, which
+is the CPU cost independent of how many cores the search was spread over.
+If test data is given, the refitted best model is also scored on it.
+
+Usage:
+    python benchmarks/bench_search_strategies.py --table-to results/tables/search_strategies.csv
+"""
+
+import click
+import os
+import pickle
+import sys
+import time
+import numpy as np
+import pandas as pd
+import warnings
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.model_registry import SEARCH_STRATEGIES
+from src.random_search_svc import search_svc
+from src.svc_models import SVC_MODES
+
+warnings.filterwarnings("ignore", category=FutureWarning)
+warnings.filterwarnings("ignore", category=UserWarning)
+
+
+def summarize_search(search_cv):
+    """
+    Summarizes the cost of a fitted search object.
+
+    Parameters
+    ----------
+    search_cv : sklearn.model_selection.BaseSearchCV
+        A fitted randomized or successive halving search.
+
+    Returns
+    -------
+    dict
+        Number of candidate/fold fits and their total fit seconds.
+    """
+    results = search_cv.cv_results_
+    n_splits = search_cv.n_splits_
+    fit_times = np.asarray(results["mean_fit_time"]) * n_splits
+    return {
+        "n_fits": len(fit_times) * n_splits,
+        "total_fit_seconds": round(float(fit_times.sum()), 2),
+    }
+
+
+@click.command()
+@click.option('--train-data', type=str, default='data/processed_data/preprocess_train.csv',
+              help="Path to processed training data CSV")
+@click.option('--test-data', type=str, default='data/processed_data/preprocess_test.csv',
+              help="Optional path to processed test data CSV")
+@click.option('--preprocessor', type=str, default='results/models/data_preprocessor.pickle',
+              help="Path to preprocessor pickle object")
+@click.option('--target-col', type=str, default='target', help="Name of the target/label column")
+@click.option('--svc-mode', type=click.Choice(SVC_MODES), default='exact', help="SVC backend")
+@click.option('--search', 'searches', type=click.Choice(SEARCH_STRATEGIES), multiple=True,
+              default=SEARCH_STRATEGIES, help="Search strategies to compare")
+@click.option('--n-iter', type=int, default=100, help="Number of candidates per search")
+@click.option('--table-to', type=str, default=None, help="Optional CSV path for the results")
+@click.option('--seed', type=int, default=522, help="Random seed")
+def main(train_data, test_data, preprocessor, target_col, svc_mode, searches, n_iter, table_to, seed):
+    """
+    Reports best score against total fit seconds for each search strategy.
+
+    Parameters
+    ----------
+    train_data : str
+        Path to the processed training data CSV.
+    test_data : str or None
+        Path to the processed test data CSV. Skipped if the file is missing.
+    preprocessor : str
+        Path to the (unfitted) preprocessor pickle object.
+    target_col : str
+        The name of the target column.
+    svc_mode : str
+        SVC backend passed to `search_svc`.
+    searches : tuple of str
+        Search strategies to compare.
+    n_iter : int
+        Number of parameter candidates sampled by every strategy.
+    table_to : str or None
+        If given, the comparison table is also written to this CSV file.
+    seed : int
+        Random seed for reproducibility.
+
+    Returns
+    -------
+    None
+    """
+    train_df = pd.read_csv(train_data)
+    X_train = train_df.drop(columns=target_col)
+    y_train = train_df[target_col]
+
+    test_df = pd.read_csv(test_data) if test_data and os.path.exists(test_data) else None
+
+    records = []
+    for search in searches:
+        with open(preprocessor, "rb") as f:
+            data_preprocessor = pickle.load(f)
+
+        start = time.perf_counter()
+        search_cv = search_svc(X_train, y_train, data_preprocessor, seed,
+                               mode=svc_mode, search=search, n_iter=n_iter)
+        wall_seconds = time.perf_counter() - start
+
+        record = {
+            "search": search,
+            "best_cv_accuracy": round(search_cv.best_score_, 4),
+            **summarize_search(search_cv),
+            "wall_seconds": round(wall_seconds, 2),
+            "best_params": search_cv.best_params_,
+        }
+        if test_df is not None:
+            record["test_accuracy"] = round(
+                search_cv.score(test_df.drop(columns=target_col), test_df[target_col]), 4
+            )
+        records.append(record)
+        print(f"{search} search finished in {wall_seconds:.1f} s")
+
+    results = pd.DataFrame(records)
+    print()
+    print(results.to_string(index=False))
+    if table_to:
+        results.to_csv(table_to, index=False)
+        print(f"Comparison table saved to {table_to}")
+
+
+if __name__ == '__main__':
+    main()
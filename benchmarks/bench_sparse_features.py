@@ -0,0 +1,104 @@
+"""
+Benchmark of the sparse feature path of the preprocessor.
+
+Replicates the raw data to several sizes, applies the feature engineering
+and fits and applies the preprocessor of `scripts/preprocess.py` as it was
+written before (object ordinal encoder, dense object output densified again
+into the scaled DataFrame) and as it is now (float ordinal encoder, CSR
+output kept as sparse float32 columns). Checks that both give the same
+values, and reports the transform time, the memory of the transformed
+matrix and the memory of the scaled DataFrame written to disk.
+
+Usage:
+    python benchmarks/bench_sparse_features.py --rows 45211 --rows 500000
+"""
+
+import click
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.compose import make_column_transformer
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.feature_engineering import FeatureEngineer
+from src.read_data import read_data
+
+CATEGORICAL_COLS = ['job', 'marital', 'default', 'housing', 'loan', 'contact', 'month', 'pdays_contacted']
+ORDINAL_COLS = ['education']
+NUMERICAL_COLS = ['age', 'balance', 'duration', 'campaign', 'previous']
+
+
+def make_preprocessor(sparse_output):
+    """The preprocessor of scripts/preprocess.py, with the sparse feature path or as it was before."""
+    ordinal_dtype, sparse_threshold = (np.float64, 1.0) if sparse_output else (object, 0.3)
+    return make_column_transformer(
+        (make_pipeline(SimpleImputer(strategy='most_frequent'), OneHotEncoder(handle_unknown='ignore')),
+         CATEGORICAL_COLS),
+        (make_pipeline(SimpleImputer(strategy='most_frequent'),
+                       OrdinalEncoder(categories=[['unknown', 'primary', 'secondary', 'tertiary']],
+                                      dtype=ordinal_dtype)),
+         ORDINAL_COLS),
+        (StandardScaler(), NUMERICAL_COLS),
+        sparse_threshold=sparse_threshold,
+    )
+
+
+def matrix_mb(X):
+    """Returns the memory of a dense or CSR matrix, including the objects of an object array, in MB."""
+    if sparse.issparse(X):
+        return (X.data.nbytes + X.indices.nbytes + X.indptr.nbytes) / 1e6
+    if X.dtype == object:
+        return (X.nbytes + sum(sys.getsizeof(value) for value in X.ravel())) / 1e6
+    return X.nbytes / 1e6
+
+
+def scaled_frame(X, columns, sparse_output):
+    """The scaled DataFrame of scripts/preprocess.py, with the sparse feature path or as it was before."""
+    if sparse_output:
+        return pd.DataFrame.sparse.from_spmatrix(X.astype(np.float32), columns=columns)
+    return pd.DataFrame(X, columns=columns)
+
+
+@click.command()
+@click.option('--raw-data', type=str, default='data/raw/raw_data.csv', help="Path to the raw data CSV")
+@click.option('--rows', type=int, multiple=True, default=(45211, 500000), show_default=True,
+              help="Number of rows to benchmark; may be given several times")
+def main(raw_data, rows):
+    """Prints the transform time and memory of the dense and sparse feature paths for each number of rows."""
+    raw_df = read_data(raw_data, typed=True, index_col=0)
+
+    results = []
+    for n_rows in rows:
+        data = pd.concat([raw_df] * (n_rows // len(raw_df) + 1), ignore_index=True).head(n_rows)
+        X = FeatureEngineer().fit_transform(data)
+
+        outputs = {}
+        for name, sparse_output in (("dense object", False), ("sparse float", True)):
+            preprocessor = make_preprocessor(sparse_output)
+            start = time.perf_counter()
+            X_scaled = preprocessor.fit(X).transform(X)
+            transform_seconds = time.perf_counter() - start
+            frame = scaled_frame(X_scaled, preprocessor.get_feature_names_out(), sparse_output)
+            outputs[name] = frame
+            results.append((n_rows, name, transform_seconds, matrix_mb(X_scaled),
+                            frame.memory_usage(deep=True).sum() / 1e6))
+
+        dense = outputs["dense object"].astype(np.float64)
+        np.testing.assert_allclose(outputs["sparse float"].sparse.to_dense().to_numpy(np.float64),
+                                   dense.to_numpy(), rtol=1e-6, atol=1e-6)
+
+    results = pd.DataFrame(results, columns=["rows", "path", "transform_s", "matrix_mb", "frame_mb"])
+    dense = results[results["path"] == "dense object"].set_index("rows")
+    results["speedup"] = results["rows"].map(dense["transform_s"]) / results["transform_s"]
+    results["frame_reduction"] = results["rows"].map(dense["frame_mb"]) / results["frame_mb"]
+    print(results.round(3).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
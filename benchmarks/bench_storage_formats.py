@@ -0,0 +1,66 @@
+"""
+Benchmark of the intermediate data file formats.
+
+Writes the full raw dataset, and the engineered feature frame derived from
+it, as CSV, zstd-compressed Parquet and Arrow IPC files with
+`src.write_csv.write_csv`, reads each back with `src.read_data.read_data`,
+checks that the round trip preserves the values, and reports the file size
+and the read (parse) time of each format.
+
+Usage:
+    python benchmarks/bench_storage_formats.py --raw-data data/raw/raw_data.csv
+"""
+
+import click
+import os
+import sys
+import tempfile
+import time
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.feature_engineering import engineer_features
+from src.read_data import read_data
+from src.write_csv import write_csv
+
+FORMATS = ("csv", "parquet", "arrow")
+
+
+def best_read_seconds(path, repeats):
+    """Returns the fastest of several full reads of the file, in seconds."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        read_data(path)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+@click.command()
+@click.option('--raw-data', type=str, default='data/raw/raw_data.csv', help="Path to the raw data CSV")
+@click.option('--repeats', type=int, default=5, show_default=True, help="Timed reads per file")
+def main(raw_data, repeats):
+    """Prints the size and read time of each format for the raw and engineered data."""
+    raw_df = pd.read_csv(raw_data, index_col=0)
+    frames = {"raw": raw_df, "engineered": engineer_features(raw_df)}
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, df in frames.items():
+            for fmt in FORMATS:
+                filename = f"{name}.{fmt}"
+                write_csv(df, tmp, filename)
+                path = os.path.join(tmp, filename)
+                pd.testing.assert_frame_equal(read_data(path), df.reset_index(drop=True), check_dtype=False)
+                rows.append((name, fmt, os.path.getsize(path) / 1e6, best_read_seconds(path, repeats) * 1000))
+
+    results = pd.DataFrame(rows, columns=["data", "format", "size_mb", "read_ms"])
+    csv_rows = results[results["format"] == "csv"].set_index("data")
+    results["size_vs_csv"] = results["size_mb"] / results["data"].map(csv_rows["size_mb"])
+    results["read_speedup"] = results["data"].map(csv_rows["read_ms"]) / results["read_ms"]
+    print(f"{len(raw_df)} rows")
+    print(results.round(3).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
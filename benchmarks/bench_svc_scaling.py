@@ -0,0 +1,133 @@
+"""
+Benchmark of SVC training cost against the number of training rows.
+
+Fits the 'exact' kernel SVC and the 'approx' Nystroem + linear SVM pipelines
+from src/svc_models.py on increasing row counts and reports the wall
+time and peak resident memory (RSS) of each fit. Rows are drawn with
+replacement from the processed training data so that row counts beyond the
+size of the dataset can be simulated.
+
+Each fit runs in a fresh process so that the peak RSS of one run does not
+leak into the next.
+
+Usage:
+    python benchmarks/bench_svc_scaling.py --rows 1000 --rows 4000 --rows 16000
+"""
+
+import click
+import multiprocessing
+import os
+import pickle
+import resource
+import sys
+import time
+import pandas as pd
+import warnings
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.svc_models import build_svc_pipeline, SVC_MODES
+
+warnings.filterwarnings("ignore", category=FutureWarning)
+warnings.filterwarnings("ignore", category=UserWarning)
+
+# Fixed hyperparameters so that every row count fits the same model
+FIXED_PARAMS = {
+    "exact": {"svc__C": 1.0, "svc__gamma": 0.1},
+    "approx": {"linearsvc__C": 1.0, "nystroem__gamma": 0.1},
+}
+
+
+def _fit_once(train_data, preprocessor_path, target_col, mode, n_rows, seed):
+    """Fit one pipeline in the current process and return its cost."""
+    train_df = pd.read_csv(train_data)
+    train_df = train_df.sample(n_rows, replace=n_rows > len(train_df), random_state=seed)
+    X = train_df.drop(columns=target_col)
+    y = train_df[target_col]
+
+    with open(preprocessor_path, "rb") as f:
+        preprocessor = pickle.load(f)
+    pipe, _ = build_svc_pipeline(preprocessor, seed, mode)
+    pipe.set_params(**FIXED_PARAMS[mode])
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    pipe.fit(X, y)
+    seconds = time.perf_counter() - start
+    rss_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # ru_maxrss is reported in kilobytes on Linux
+    return seconds, rss_before / 1024, rss_peak / 1024
+
+
+@click.command()
+@click.option('--train-data', type=str, default='data/processed_data/preprocess_train.csv',
+              help="Path to processed training data CSV")
+@click.option('--preprocessor', type=str, default='results/models/data_preprocessor.pickle',
+              help="Path to preprocessor pickle object")
+@click.option('--target-col', type=str, default='target', help="Name of the target/label column")
+@click.option('--rows', type=int, multiple=True, default=(1000, 2000, 4000, 8000, 16000),
+              help="Row counts to benchmark; may be given several times")
+@click.option('--mode', 'modes', type=click.Choice(SVC_MODES), multiple=True, default=SVC_MODES,
+              help="SVC backends to benchmark")
+@click.option('--max-exact-rows', type=int, default=20000,
+              help="Skip the exact SVC above this many rows")
+@click.option('--table-to', type=str, default=None, help="Optional CSV path for the results")
+@click.option('--seed', type=int, default=522, help="Random seed")
+def main(train_data, preprocessor, target_col, rows, modes, max_exact_rows, table_to, seed):
+    """
+    Reports fit wall time and peak RSS of each SVC backend against row count.
+
+    Parameters
+    ----------
+    train_data : str
+        Path to the processed training data CSV.
+    preprocessor : str
+        Path to the (unfitted) preprocessor pickle object.
+    target_col : str
+        The name of the target column.
+    rows : tuple of int
+        Row counts to benchmark.
+    modes : tuple of str
+        SVC backends to benchmark ('exact' and/or 'approx').
+    max_exact_rows : int
+        Row counts above this are skipped for the exact SVC.
+    table_to : str or None
+        If given, the results table is also written to this CSV file.
+    seed : int
+        Random seed for reproducibility.
+
+    Returns
+    -------
+    None
+    """
+    ctx = multiprocessing.get_context("spawn")
+    records = []
+    for n_rows in rows:
+        for mode in modes:
+            if mode == "exact" and n_rows > max_exact_rows:
+                print(f"{mode:>6} {n_rows:>9} rows: skipped (above --max-exact-rows)")
+                continue
+            with ctx.Pool(1) as pool:
+                seconds, rss_before, rss_peak = pool.apply(
+                    _fit_once, (train_data, preprocessor, target_col, mode, n_rows, seed)
+                )
+            records.append({
+                "mode": mode,
+                "rows": n_rows,
+                "fit_seconds": round(seconds, 3),
+                "peak_rss_mb": round(rss_peak, 1),
+                "fit_rss_mb": round(rss_peak - rss_before, 1),
+            })
+            print(f"{mode:>6} {n_rows:>9} rows: {seconds:8.2f} s, "
+                  f"peak RSS {rss_peak:8.1f} MB (+{rss_peak - rss_before:.1f} MB during fit)")
+
+    results = pd.DataFrame(records)
+    print()
+    print(results.to_string(index=False))
+    if table_to:
+        results.to_csv(table_to, index=False)
+        print(f"Benchmark table saved to {table_to}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Tuning benchmark for the fold-level transform cache in `search_svc`.
+
+Runs the same randomized search with the preprocessor cache disabled and
+enabled and reports the wall time of each. Both searches sample the same
+candidates and folds, so they must select the same parameters; only the
+number of preprocessor fits differs (one per candidate and fold without the
+cache; with it, the fitted preprocessor of each fold is read from a disk
+cache after its first fit).
+
+Usage:
+    python benchmarks/bench_transform_cache.py --n-iter 20 --rows 3200
+"""
+
+import click
+import os
+import pickle
+import sys
+import time
+import pandas as pd
+import warnings
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.model_registry import SEARCH_STRATEGIES
+from src.random_search_svc import search_svc
+from src.svc_models import SVC_MODES
+
+warnings.filterwarnings("ignore", category=FutureWarning)
+warnings.filterwarnings("ignore", category=UserWarning)
+
+
+@click.command()
+@click.option('--train-data', type=str, default='data/processed_data/preprocess_train.csv',
+              help="Path to processed training data CSV")
+@click.option('--preprocessor', type=str, default='results/models/data_preprocessor.pickle',
+              help="Path to preprocessor pickle object")
+@click.option('--target-col', type=str, default='target', help="Name of the target/label column")
+@click.option('--rows', type=int, default=None,
+              help="Rows drawn (with replacement if needed) from the training data")
+@click.option('--svc-mode', type=click.Choice(SVC_MODES), default='exact', help="SVC backend")
+@click.option('--search', type=click.Choice(SEARCH_STRATEGIES), default='random', help="Search strategy")
+@click.option('--n-iter', type=int, default=20, help="Number of candidates per search")
+@click.option('--seed', type=int, default=522, help="Random seed")
+def main(train_data, preprocessor, target_col, rows, svc_mode, search, n_iter, seed):
+    """
+    Reports tuning wall time with and without the transform cache.
+
+    Parameters
+    ----------
+    train_data : str
+        Path to the processed training data CSV.
+    preprocessor : str
+        Path to the (unfitted) preprocessor pickle object.
+    target_col : str
+        The name of the target column.
+    rows : int or None
+        Number of training rows. Default uses the file as is.
+    svc_mode : str
+        SVC backend passed to `search_svc`.
+    search : str
+        Search strategy passed to `search_svc`.
+    n_iter : int
+        Number of parameter candidates sampled.
+    seed : int
+        Random seed for reproducibility.
+
+    Returns
+    -------
+    None
+    """
+    train_df = pd.read_csv(train_data)
+    if rows:
+        train_df = train_df.sample(rows, replace=rows > len(train_df), random_state=seed)
+    X_train = train_df.drop(columns=target_col)
+    y_train = train_df[target_col]
+
+    records = []
+    for cache in (False, True):
+        with open(preprocessor, "rb") as f:
+            data_preprocessor = pickle.load(f)
+
+        start = time.perf_counter()
+        search_cv = search_svc(X_train, y_train, data_preprocessor, seed, mode=svc_mode,
+                               search=search, n_iter=n_iter, cache=cache)
+        wall_seconds = time.perf_counter() - start
+
+        records.append({
+            "transform_cache": cache,
+            "wall_seconds": round(wall_seconds, 2),
+            "best_cv_accuracy": round(search_cv.best_score_, 4),
+            "best_params": search_cv.best_params_,
+        })
+        print(f"cache={cache}: {wall_seconds:.1f} s")
+
+    results = pd.DataFrame(records)
+    print()
+    print(results.to_string(index=False))
+    saving = 1 - results["wall_seconds"].iloc[1] / results["wall_seconds"].iloc[0]
+    print(f"\nTransform cache saves {saving:.0%} of tuning wall time.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark of the full and tiered Deepchecks validation modes.
+
+Splits the raw data like scripts/eda.py, preprocesses the training split
+and runs the validation checks of `src.preprocess_deepcheck` in 'full' mode
+and in 'tiered' mode (outlier check on a stratified sample), reporting the
+rows, result, condition details and wall time of every check and the total
+wall time of each mode.
+
+Usage:
+    python benchmarks/bench_validation_tiers.py --raw-data data/raw/raw_data.csv --n-jobs 2
+"""
+
+import click
+import os
+import sys
+import time
+import pandas as pd
+import warnings
+from sklearn.model_selection import train_test_split
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.feature_engineering import FeatureEngineer, encode_target
+from src.preprocess_deepcheck import SAMPLE_ROWS, run_validation_checks
+
+warnings.filterwarnings("ignore", category=FutureWarning)
+warnings.filterwarnings("ignore", category=UserWarning)
+
+
+@click.command()
+@click.option('--raw-data', type=str, default='data/raw/raw_data.csv', help="Path to the raw data CSV")
+@click.option('--n-jobs', type=int, default=1, show_default=True, help="Parallel workers running the checks")
+@click.option('--sample-rows', type=int, default=SAMPLE_ROWS, show_default=True,
+              help="Rows of the stratified sample of the sampled checks")
+def main(raw_data, n_jobs, sample_rows):
+    """Prints the per-check timings of both validation modes."""
+    raw_df = pd.read_csv(raw_data, index_col=0)
+    train_df, _ = train_test_split(raw_df, train_size=0.8, stratify=raw_df['y'], random_state=522)
+    target_df = FeatureEngineer().fit_transform(train_df)
+    target_df.insert(target_df.columns.get_loc('pdays_contacted'), 'target', encode_target(train_df['y']))
+
+    print(f"{len(target_df)} training rows; sampled checks use {sample_rows} rows")
+    for mode in ['full', 'tiered']:
+        start = time.perf_counter()
+        results = run_validation_checks(target_df, mode=mode, n_jobs=n_jobs, sample_rows=sample_rows)
+        wall_seconds = time.perf_counter() - start
+        print(f"\n{mode} mode: {wall_seconds:.2f} s wall time")
+        print(results.round(3).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Load test for the online inference server.
+
+Starts scripts/serve.py on a free localhost port (or targets a running
+server with --port), then sends single-record /predict requests from
+several concurrent keep-alive clients, each waiting for its response before
+sending the next request. Reports the client-side p50/p99 latency and
+throughput, and the server's own /metrics.
+
+Usage:
+    python benchmarks/load_test_server.py --concurrency 16 --requests 4000
+"""
+
+import click
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.inference_server import REQUEST_COLUMNS
+
+
+def load_records(raw_data, n_records):
+    """Reads up to n_records raw records as JSON-ready dicts."""
+    raw = pd.read_csv(raw_data, index_col=0, nrows=n_records)
+    raw = raw[REQUEST_COLUMNS].astype(object).where(raw[REQUEST_COLUMNS].notna(), None)
+    return [{key: (value.item() if hasattr(value, "item") else value) for key, value in record.items()}
+            for record in raw.to_dict(orient="records")]
+
+
+def wait_for_server(port, timeout=60):
+    """Polls /health until the server answers."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError(f"Server on port {port} did not start within {timeout} s.")
+
+
+def run_client(port, bodies, latencies_ms, failures):
+    """Sends bodies one at a time over one keep-alive connection."""
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    headers = {"Content-Type": "application/json"}
+    for body in bodies:
+        start = time.perf_counter()
+        conn.request("POST", "/predict", body=body, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        latencies_ms.append((time.perf_counter() - start) * 1000)
+        if response.status != 200:
+            failures.append(response.status)
+    conn.close()
+
+
+@click.command()
+@click.option('--pipeline-from', type=str, default='results/models/svc_pipeline.pickle',
+              help="Trained pipeline to serve when starting the server")
+@click.option('--raw-data', type=str, default='data/raw/raw_data_sample.csv',
+              help="Raw data CSV the request records are drawn from")
+@click.option('--port', type=int, default=None,
+              help="Port of an already running server; starts one if omitted")
+@click.option('--concurrency', type=int, default=16, show_default=True, help="Concurrent clients")
+@click.option('--requests', 'n_requests', type=int, default=4000, show_default=True,
+              help="Total requests across all clients")
+@click.option('--max-batch-size', type=int, default=64, show_default=True,
+              help="Micro-batch size of the started server")
+@click.option('--max-wait-ms', type=float, default=2.0, show_default=True,
+              help="Micro-batch wait of the started server")
+def main(pipeline_from, raw_data, port, concurrency, n_requests, max_batch_size, max_wait_ms):
+    """Runs the load test and prints the latency and throughput summary."""
+    records = load_records(raw_data, n_requests)
+    bodies = [json.dumps(records[i % len(records)]) for i in range(n_requests)]
+
+    server = None
+    if port is None:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(os.path.dirname(__file__), '..', 'scripts', 'serve.py'),
+             '--pipeline-from', pipeline_from, '--port', str(port),
+             '--max-batch-size', str(max_batch_size), '--max-wait-ms', str(max_wait_ms)],
+            stdout=subprocess.DEVNULL)
+    try:
+        wait_for_server(port)
+        # warm up the model and the connection handling
+        run_client(port, bodies[:20], [], [])
+
+        latencies_ms, failures = [], []
+        clients = [threading.Thread(target=run_client,
+                                    args=(port, bodies[i::concurrency], latencies_ms, failures))
+                   for i in range(concurrency)]
+        start = time.perf_counter()
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+        seconds = time.perf_counter() - start
+
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        conn.request("GET", "/metrics")
+        server_metrics = json.loads(conn.getresponse().read())
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    p50, p99 = np.percentile(latencies_ms, [50, 99])
+    print(f"{len(latencies_ms)} requests from {concurrency} clients in {seconds:.2f} s "
+          f"({len(latencies_ms) / seconds:.0f} req/s), {len(failures)} failed")
+    print(f"client latency: p50 {p50:.2f} ms, p99 {p99:.2f} ms")
+    print(f"server metrics: {json.dumps(server_metrics)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -13,11 +13,12 @@ import os
 import sys
 import click
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.validate_data import validate_data
 
 @click.command()
 @click.option('--raw_data', type=str, help="Path to raw data")
-def main(raw_data):
+@click.option('--chunk_size', type=int, default=None,
+              help="Validate the file this many rows at a time (same report, bounded memory)")
+def main(raw_data, chunk_size):
     """
     This script validates the data, checking for: 
         - correct column names
@@ -30,12 +31,17 @@ def main(raw_data):
     -----------
     raw_data : str
         path to the raw data CSV file
+    chunk_size : int or None
+        number of rows validated at a time, or None to validate the whole
+        file at once
 
     Returns:
     --------
     None
     """
-    validate_data(raw_data)
+    from src.validate_data import validate_data
+
+    validate_data(raw_data, chunk_size=chunk_size)
 
 if __name__ == '__main__':
     main()
@@ -16,12 +16,13 @@ import click
 import os
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.read_uci_id import read_uci_id
 
 @click.command()
 @click.option('--id', type=str, help="id of dataset to be downloaded")
 @click.option('--write_to', type=str, help="Path to directory where raw data will be written to")
-def main(id, write_to):
+@click.option('--sample_size', type=int, default=4000, show_default=True,
+              help="Rows in raw_data_sample.csv; 0 skips the sample and keeps only the full data")
+def main(id, write_to, sample_size):
     """
     Read in a data set from the UCI Machine Learning 
     repository using their API and save the 
@@ -33,6 +34,9 @@ def main(id, write_to):
         The ucimlrepo id of the dataset to read in. 
     write_to : str
         The path to the directory where the data set will be saved.
+    sample_size : int
+        Number of rows written to raw_data_sample.csv. 0 writes only
+        the full data set to raw_data.csv.
 
     Raises:
     -------
@@ -46,11 +50,14 @@ def main(id, write_to):
     --------
     None
     """
+    from src.read_uci_id import read_uci_id
+
+    sample_size = sample_size or None
     try:
-        read_uci_id(id, write_to)
+        read_uci_id(id, write_to, sample_size)
     except Exception as e:
         os.makedirs(write_to)
-        read_uci_id(id, write_to)
+        read_uci_id(id, write_to, sample_size)
 
 if __name__ == '__main__':
     main()
@@ -2,6 +2,10 @@
 
 This script performs exploratory data analysis on the bank marketing dataset,
 including data splitting, visualization generation, and saving processed data.
+The split and the plots can also run as separate stages (`--stage split` and
+`--stage plots`); both make the same seeded split, so the plots do not wait
+for the split files. The plots render in parallel worker processes
+(`--plot-jobs`), and plots whose input data is unchanged are skipped.
 
 The script generates three types of visualizations:
 - Numeric variable distributions
@@ -10,13 +14,9 @@ The script generates three types of visualizations:
 """
 import click
 import os
-import pandas as pd
-import altair_ally as aly
-from sklearn.model_selection import train_test_split
 import sys
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.create_visualizations import create_visualizations
 
 
 # split data
@@ -38,9 +38,27 @@ from src.create_visualizations import create_visualizations
     type=str,
     help="Path to directory where the plot will be written to",
 )
+@click.option(
+    "--data-format",
+    type=click.Choice(["csv", "parquet", "arrow"]),
+    default="csv",
+    help="File format of the train and test split",
+)
+@click.option(
+    "--stage",
+    type=click.Choice(["all", "split", "plots"]),
+    default="all",
+    help="Run the split and the plots, or only one of them",
+)
+@click.option(
+    "--plot-jobs",
+    type=int,
+    default=1,
+    help="Number of worker processes rendering the plots",
+)
 
 
-def main(loaded_data, processed_data, plot_to):
+def main(loaded_data, processed_data, plot_to, data_format, stage, plot_jobs):
     """Run exploratory data analysis and generate visualizations.
 
     This function loads the bank marketing dataset, splits it into training and
@@ -55,6 +73,15 @@ def main(loaded_data, processed_data, plot_to):
         Directory path where the processed train and test CSV files as pandas DataFrames will be saved.
     plot_to : str
         Directory path where the generated visualization plots will be saved.
+    data_format : str
+        File format of the saved train and test split: 'csv', or the
+        columnar 'parquet' or 'arrow'.
+    stage : str
+        'all' to save the split and the plots, 'split' to save only the
+        train and test split, or 'plots' to save only the plots.
+    plot_jobs : int
+        Number of worker processes rendering the plots. Plots whose input
+        data is unchanged since they were saved are not rendered again.
 
     Returns
     -------
@@ -77,13 +104,21 @@ def main(loaded_data, processed_data, plot_to):
          plot_to='results/figures'
      )
     """
+    # heavy imports are deferred until the analysis runs
+    from sklearn.model_selection import train_test_split
+    from src.create_visualizations import create_visualizations
+    from src.read_data import read_data
+    from src.write_csv import write_csv
+
     # Create output directories
-    os.makedirs(processed_data, exist_ok=True)
-    os.makedirs(plot_to, exist_ok=True)
+    if stage != "plots":
+        os.makedirs(processed_data, exist_ok=True)
+    if stage != "split":
+        os.makedirs(plot_to, exist_ok=True)
 
-    # Load Data
-    bank_marketing_sample = pd.read_csv(
-        loaded_data, index_col=0)
+    # Load Data, with categorical and downcast integer columns
+    bank_marketing_sample = read_data(
+        loaded_data, typed=True, index_col=0)
 
     train_df, test_df = train_test_split(
         bank_marketing_sample,
@@ -95,12 +130,12 @@ def main(loaded_data, processed_data, plot_to):
     train_df.info()
 
     # Saves the data
-    train_path = os.path.join(processed_data, "train.csv")
-    test_path = os.path.join(processed_data, "test.csv")
-    train_df.to_csv(train_path, index=False)
-    test_df.to_csv(test_path, index=False)
+    if stage != "plots":
+        write_csv(train_df, processed_data, f"train.{data_format}")
+        write_csv(test_df, processed_data, f"test.{data_format}")
 
-    create_visualizations(train_df, bank_marketing_sample, plot_to)
+    if stage != "split":
+        create_visualizations(train_df, bank_marketing_sample, plot_to, n_jobs=plot_jobs)
 
     print("All tasks completed!")
 
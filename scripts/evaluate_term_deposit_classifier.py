@@ -2,8 +2,10 @@
 Evaluation script for term deposit classifier.
 
 This module evaluates a pre-trained Support Vector Classifier (SVC) model on processed test data. 
-It generates performance metrics, including accuracy scores and confusion matrices, to
-assess the model's predictive capability regarding term deposit subscriptions.
+It generates performance metrics, including accuracy scores, confusion matrices and ROC and
+precision-recall curves, to assess the model's predictive capability regarding term deposit
+subscriptions. The model is run once over the test set and every metric is derived from
+those predictions and decision scores.
 
 Author: Godsgift Braimah
 Date: 2025-12-01
@@ -11,88 +13,92 @@ Date: 2025-12-01
 
 import click
 import os
-import pandas as pd
-import pickle
-import matplotlib.pyplot as plt
-from sklearn.metrics import ConfusionMatrixDisplay, classification_report
+import sys
 import warnings
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 warnings.filterwarnings("ignore", category=FutureWarning)
 warnings.filterwarnings("ignore", category=UserWarning)
 
 @click.command()
-@click.option('--processed-test-data', type=str, help="Path to scaled test data CSV")
+@click.option('--processed-test-data', type=str, help="Path to processed test data (CSV, Parquet or Arrow)")
 @click.option('--pipeline-from', type=str, help="Path to the Directory where the pipeline was saved")
 @click.option('--plot-to', type=str, help="Directory to save the plots")
 @click.option('--table-to', type=str, help="Directory to save the score table")
 @click.option('--target-col', type=str, default='target', help="Name of the target/label column")
-def main(processed_test_data, pipeline_from, plot_to, table_to, target_col):
+@click.option('--model', type=str, default='svc', help="Name of the model family; the outputs are prefixed with it")
+def main(processed_test_data, pipeline_from, plot_to, table_to, target_col, model):
     '''
     Evaluates the term deposit classifier on the test data and saves the results.
 
     This function loads a pre-trained SVC model pipeline and processed test data. 
-    It calculates the model's accuracy score, generates a classification 
-    report, and visualizes the confusion matrix. These artifacts are saved to 
-    specified output directories to facilitate model validation and reporting.
+    It predicts the test set once, then calculates the model's accuracy, ROC AUC
+    and average precision, generates a classification report, and visualizes the
+    confusion matrix and ROC and precision-recall curves. These artifacts are saved
+    to specified output directories to facilitate model validation and reporting.
     
     Parameters
     ----------
     processed_test_data : str
-        Path to the CSV file containing the processed test data.
+        Path to the CSV, Parquet or Arrow file containing the processed
+        test data.
     pipeline_from : str
         Path to the pickle file containing the trained model pipeline.
     plot_to : str
-        Path to the directory where the confusion matrix plot will be saved.
+        Path to the directory where the confusion matrix and curve plots will be saved.
     table_to : str
         Path to the directory where the tables will be saved.
     target_col : str, optional
         The name of the target class column in the dataframe. Default is 'target'.
+    model : str, optional
+        Name of the model family the pipeline was trained as (see
+        src/model_registry.py); the table and plot file names start with it.
+        Default is 'svc'.
 
     Returns
     -------
     None
         This function does not return a value; it saves output files to disk.
     '''
+    # deferred so that --help does not load pandas, scikit-learn and matplotlib
+    import pandas as pd
+    from src.batch_predict import load_pipeline
+    from src.read_data import read_data
+    from src.evaluation_metrics import (
+        evaluate_classifier, score_table, classification_report_table, save_evaluation_plots
+    )
+
     # Read Data
-    test_df = pd.read_csv(processed_test_data)
+    test_df = read_data(processed_test_data, typed=True)
     
     # Load Pipeline    
-    with open(pipeline_from, "rb") as f:
-        pipe = pickle.load(f)   
+    pipe = load_pipeline(pipeline_from)
 
     # Prepare X and y
     X_test = test_df.drop(columns=[target_col])
     y_test = test_df[target_col]
 
+    # Predict once; every table and plot below reuses these arrays
+    evaluation = evaluate_classifier(pipe, X_test, y_test)
+
     # Score on Test Data
-    test_score = round(pipe.score(X_test, y_test), 4)
-    test_score_df = pd.DataFrame({'metric':['accuracy'], 'score': [test_score]})
+    test_score_df = score_table(evaluation)
     
     # Create path and store file.
-    score_path = os.path.join(table_to, "svc_test_score.csv")
+    score_path = os.path.join(table_to, f"{model}_test_score.csv")
     test_score_df.to_csv(score_path, index=False)
     print(f"Test score saved to {score_path}")
 
     # Classification Report on Test Data
-    report = classification_report(y_test, pipe.predict(X_test), output_dict=True) 
-    classification_report_df = pd.DataFrame(report).T.round(2)
+    classification_report_df = classification_report_table(evaluation)
     
-    report_path = os.path.join(table_to, "svc_classification_report.csv")
+    report_path = os.path.join(table_to, f"{model}_classification_report.csv")
     classification_report_df.to_csv(report_path, index=True)
     print(f"Classification Report saved to {report_path}")
     
-    # Generate and Save Confusion Matrix
-    ConfusionMatrixDisplay.from_estimator(
-        pipe,
-        X_test,
-        y_test,
-        values_format="d"
-    )
-    plt.title("Test Data: Confusion Matrix for SVC model")
-    
-    plot_path = os.path.join(plot_to, "test_svc_confusion_matrix.png")
-    plt.savefig(plot_path)
-    print(f"Confusion matrix saved to {plot_path}")
+    # Generate and Save Confusion Matrix, ROC and Precision-Recall Curves
+    for plot_path in save_evaluation_plots(evaluation, plot_to, f"test_{model}", "Test Data", model):
+        print(f"Plot saved to {plot_path}")
 
 if __name__ == '__main__':
     main()
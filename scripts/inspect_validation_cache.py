@@ -0,0 +1,53 @@
+"""
+Inspection script for the validation cache.
+
+Lists the data validation checks recorded as passed in a validation cache
+directory (the check, the dataset fingerprint, its rows, the run time the
+cache saves and when the entry was created), or clears the cache.
+
+Usage:
+    python scripts/inspect_validation_cache.py --cache-dir .validation_cache
+    python scripts/inspect_validation_cache.py --cache-dir .validation_cache --clear
+"""
+
+import click
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.validation_cache import DEFAULT_CACHE_DIR, ValidationCache
+
+
+@click.command()
+@click.option('--cache-dir', type=str, default=DEFAULT_CACHE_DIR, show_default=True,
+              help="Directory of the validation cache")
+@click.option('--clear', is_flag=True, help="Delete all cache entries")
+def main(cache_dir, clear):
+    """
+    Lists or clears the entries of a validation cache.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory of the validation cache.
+    clear : bool
+        Whether to delete all entries instead of listing them.
+
+    Returns
+    -------
+    None
+        The function prints the entries, or the number of deleted entries.
+    """
+    cache = ValidationCache(cache_dir)
+    if clear:
+        print(f"Deleted {cache.clear()} entries from {cache_dir}")
+        return
+
+    entries = cache.entries()
+    if entries.empty:
+        print(f"No entries in {cache_dir}")
+    else:
+        print(entries.to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -5,25 +5,38 @@ This script performs data validation, feature engineering,
 and saves the processed data and preprocessor pipeline. It also generates
 a correlation heatmap for numerical features.
 
+The train and test splits are independent once the feature transformer
+and the preprocessor are fitted on the training data, so their
+validation and their transformation can run in parallel worker processes
+(`--workers`). The processed files are written by as many threads, so the
+frames are not copied to other processes. The time of every stage is
+reported.
+
+Every encoder of the preprocessor outputs numbers and the one-hot blocks
+stay sparse, so the preprocessor outputs a CSR matrix instead of a dense
+object array, and the models are fitted on the sparse matrix. The scaled
+splits are held as sparse float32 columns.
+
 Author: Teem KWONG
 Date: 2025-12-13
 """
 
 import os
 import sys
+import time
 import pickle
-import altair as alt
-import pandas as pd
-import pandera as pa
 import click
-from deepchecks.tabular import Dataset
-from deepchecks.tabular.checks import *
-from sklearn.compose import make_column_transformer
-from sklearn.pipeline import make_pipeline
-from sklearn.impute import SimpleImputer
-from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+from contextlib import contextmanager
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.preprocess_deepcheck import preprocess_deepcheck
+
+
+@contextmanager
+def timed_stage(timings, stage):
+    """Appends the stage name and the seconds spent in the block to timings."""
+    start = time.perf_counter()
+    yield
+    timings.append((stage, time.perf_counter() - start))
+
 
 @click.command()
 @click.option('--train-csv-file', type=str, help="Path to raw train data")
@@ -31,7 +44,19 @@ from src.preprocess_deepcheck import preprocess_deepcheck
 @click.option('--data-to', type=str, help="Path to directory where processed data will be written to")
 @click.option('--preprocessor-to', type=str, help="Path to directory where the preprocessor object will be written to")
 @click.option('--plot-to', type=str, help="Path to directory where the chart will be written to")
-def main(train_csv_file, test_csv_file, data_to, preprocessor_to, plot_to):
+@click.option('--data-format', type=click.Choice(['csv', 'parquet', 'arrow']), default='csv',
+              help="File format of the processed data")
+@click.option('--validation', type=click.Choice(['full', 'tiered']), default='full',
+              help="'full' Deepchecks validation, or 'tiered' with the outlier check on a stratified sample")
+@click.option('--validation-jobs', type=int, default=1, help="Number of parallel workers running the checks")
+@click.option('--validation-cache', type=str, default=None,
+              help="Directory of the validation cache; correlation checks that passed on identical data are skipped")
+@click.option('--correlation-engine', type=click.Choice(['native', 'deepchecks']), default='native',
+              help="Engine of the correlation checks: the 'native' NumPy engine or 'deepchecks'")
+@click.option('--workers', type=int, default=1,
+              help="Number of worker processes validating and transforming the splits (and threads writing them)")
+def main(train_csv_file, test_csv_file, data_to, preprocessor_to, plot_to, data_format, validation, validation_jobs,
+         validation_cache, correlation_engine, workers):
     """
     Performs validation, preprocessing and exploratory analysis.
 
@@ -44,15 +69,31 @@ def main(train_csv_file, test_csv_file, data_to, preprocessor_to, plot_to):
     Parameters
     ----------
     train_csv_file : str
-        Path to raw train data.
+        Path to raw train data (CSV, Parquet or Arrow).
     test_csv_file : str
-        Path to raw test data.
+        Path to raw test data (CSV, Parquet or Arrow).
     data_to : str
         Path to directory where processed data will be written to.
     preprocessor_to : str
         Path to directory where the preprocessor object will be written to.
     plot_to : str
         Path to directory where the chart will be written to.
+    data_format : str
+        File format of the processed data: 'csv', 'parquet' or 'arrow'.
+    validation : str
+        'full' to run every Deepchecks check on all rows, or 'tiered' to run
+        the outlier check on a stratified sample.
+    validation_jobs : int
+        Number of parallel workers running the Deepchecks checks.
+    validation_cache : str or None
+        Directory of the validation cache, or None to run the correlation
+        checks without caching.
+    correlation_engine : str
+        Engine of the correlation checks: 'native' or 'deepchecks'.
+    workers : int
+        Number of worker processes running the per-split validation and
+        transformation in parallel, and of threads writing the processed
+        files. 1 runs them one after the other in this process.
 
     Returns
     -------
@@ -64,17 +105,38 @@ def main(train_csv_file, test_csv_file, data_to, preprocessor_to, plot_to):
     ValueError
         If any of the Deepchecks data validation conditions fail.
     """
+    # heavy dependencies load only when the step runs, not for --help
+    import altair as alt
+    import numpy as np
+    import pandas as pd
+    from joblib import Parallel, delayed
+    from sklearn.compose import make_column_transformer
+    from sklearn.pipeline import make_pipeline
+    from sklearn.impute import SimpleImputer
+    from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+    from src.feature_correlation import feature_corr
+    from src.feature_engineering import FeatureEngineer
+    from src.preprocess_deepcheck import preprocess_deepcheck
+    from src.read_data import read_data
+    from src.validation_cache import ValidationCache
+    from src.write_csv import write_csv
+
+    timings = []
+
     ############################################################
     ### The following code is for BOTH train and test data. ###
     ############################################################
-    ### The following code is for train data. ###
-    # preprocessing
-    train_df = pd.read_csv(train_csv_file)
-    processed_train_df, X_train, y_train = preprocess_deepcheck(train_df)
-
-    ### The following code is for test data. ###
-    test_df = pd.read_csv(test_csv_file)
-    processed_test_df, X_test, y_test = preprocess_deepcheck(test_df)
+    with timed_stage(timings, "read"):
+        train_df = read_data(train_csv_file, typed=True)
+        test_df = read_data(test_csv_file, typed=True)
+
+    # preprocessing and validation of each split; the test data is
+    # transformed with the categories learned on the train data
+    with timed_stage(timings, "validate"):
+        feature_engineer = FeatureEngineer().fit(train_df)
+        (processed_train_df, X_train, y_train), (processed_test_df, X_test, y_test) = Parallel(n_jobs=workers)(
+            delayed(preprocess_deepcheck)(split_df, feature_engineer, validation, validation_jobs)
+            for split_df in (train_df, test_df))
     ############################################################
     ### END ###
     ############################################################
@@ -87,7 +149,7 @@ def main(train_csv_file, test_csv_file, data_to, preprocessor_to, plot_to):
     # Standard scaling
     numerical_cols = ['age', 'balance', 'duration', 'campaign', 'previous']
 
-    # defining the preprocessor
+    # defining the preprocessor; its output is a float CSR matrix
     data_preprocessor = make_column_transformer(
     (
         make_pipeline(SimpleImputer(strategy='most_frequent'), 
@@ -95,11 +157,12 @@ def main(train_csv_file, test_csv_file, data_to, preprocessor_to, plot_to):
                       categorical_cols
     ), (
         make_pipeline(SimpleImputer(strategy='most_frequent'), 
-                      OrdinalEncoder(categories=[['unknown', 'primary', 'secondary', 'tertiary']], dtype=object)), 
+                      OrdinalEncoder(categories=[['unknown', 'primary', 'secondary', 'tertiary']], dtype=np.float64)), 
                       ordinal_cols
     ), (
         StandardScaler(), numerical_cols
-        )
+        ),
+    sparse_threshold=1.0
     )
     pickle.dump(data_preprocessor, open(os.path.join(preprocessor_to, "data_preprocessor.pickle"), "wb"))
 
@@ -107,65 +170,61 @@ def main(train_csv_file, test_csv_file, data_to, preprocessor_to, plot_to):
     ### The following code is for BOTH train and test data. ###
     ############################################################
     # Code adapted from from Tiffany A. Timbers, Joel Ostblom & Melissa Lee 2023/11/09: Breast Cancer Predictor Report
-    data_preprocessor.fit(X_train)
-    scaled_X_train = data_preprocessor.transform(X_train)
-    scaled_X_test = data_preprocessor.transform(X_test)
+    with timed_stage(timings, "transform"):
+        data_preprocessor.fit(X_train)
+        scaled_X_train, scaled_X_test = Parallel(n_jobs=workers)(
+            delayed(data_preprocessor.transform)(X) for X in (X_train, X_test))
 
     col_names = data_preprocessor.get_feature_names_out()
 
-    scaled_X_train_df = pd.DataFrame(scaled_X_train, columns=col_names)
-    scaled_X_test_df = pd.DataFrame(scaled_X_test, columns=col_names)
-
-    scaled_X_train_df.to_csv(os.path.join(data_to, "scaled_train.csv"), index=False)
-    scaled_X_test_df.to_csv(os.path.join(data_to, "scaled_test.csv"), index=False)
+    scaled_X_train_df = pd.DataFrame.sparse.from_spmatrix(scaled_X_train.astype(np.float32), columns=col_names)
+    scaled_X_test_df = pd.DataFrame.sparse.from_spmatrix(scaled_X_test.astype(np.float32), columns=col_names)
 
-    processed_train_df.to_csv(os.path.join(data_to, "preprocess_train.csv"), index=False)
-    processed_test_df.to_csv(os.path.join(data_to, "preprocess_test.csv"), index=False)
+    with timed_stage(timings, "write"):
+        outputs = {
+            "scaled_train": scaled_X_train_df,
+            "scaled_test": scaled_X_test_df,
+            "preprocess_train": processed_train_df,
+            "preprocess_test": processed_test_df,
+        }
+        # threads share the frames, which processes would have to receive pickled
+        Parallel(n_jobs=workers, prefer="threads")(
+            delayed(write_csv)(df, data_to, f"{name}.{data_format}") for name, df in outputs.items())
 
     ######################################################
     ### The following code is for train data ONLY. ###
     ######################################################
     col_names = data_preprocessor.named_transformers_['pipeline-1'].get_feature_names_out().tolist() + ordinal_cols + numerical_cols
-    scaled_X_train_df = pd.DataFrame(scaled_X_train, columns=col_names)
-
-    correlation_matrix = scaled_X_train_df[numerical_cols].corr()
-    correlation_long = correlation_matrix.reset_index().melt(id_vars='index')
-    correlation_long.columns = ['Feature 1', 'Feature 2', 'Correlation']
-
-    corr_plot = alt.Chart(correlation_long).mark_rect().encode(
-        x='Feature 1:O',
-        y='Feature 2:O',
-        color=alt.Color('Correlation:Q', scale=alt.Scale(scheme='viridis')),
-        tooltip=['Feature 1', 'Feature 2', 'Correlation']
-    ).properties(
-        width=400,
-        height=400,
-        title="Correlation Heatmap"
-    )
-
-    corr_plot.save(os.path.join(plot_to, "correlation_heat_map.png"),
-              scale_factor=2.0)
-
-    # Code adapted from from Tiffany A. Timbers, Joel Ostblom & Melissa Lee 2023/11/09: Breast Cancer Predictor Report
-    # Data validation checks: feature-target and feature-feature correlations
-    # Check feature-label correlations
-
-    X_train_ds = Dataset(processed_train_df, label="target", cat_features=['job', 'marital', 'education', 'default', 'housing', 'loan', 'contact',
-        'month', 'pdays_contacted'])
+    scaled_X_train_df = pd.DataFrame.sparse.from_spmatrix(scaled_X_train, columns=col_names)
+
+    with timed_stage(timings, "plot"):
+        correlation_matrix = scaled_X_train_df[numerical_cols].sparse.to_dense().corr()
+        correlation_long = correlation_matrix.reset_index().melt(id_vars='index')
+        correlation_long.columns = ['Feature 1', 'Feature 2', 'Correlation']
+
+        corr_plot = alt.Chart(correlation_long).mark_rect().encode(
+            x='Feature 1:O',
+            y='Feature 2:O',
+            color=alt.Color('Correlation:Q', scale=alt.Scale(scheme='viridis')),
+            tooltip=['Feature 1', 'Feature 2', 'Correlation']
+        ).properties(
+            width=400,
+            height=400,
+            title="Correlation Heatmap"
+        )
 
-    check_feat_lab_corr = FeatureLabelCorrelation().add_condition_feature_pps_less_than(0.9)
-    check_feat_lab_corr_result = check_feat_lab_corr.run(dataset=X_train_ds)
+        corr_plot.save(os.path.join(plot_to, "correlation_heat_map.png"),
+                  scale_factor=2.0)
 
-    # Check feature-feature correlations
-    check_feat_feat_corr = FeatureFeatureCorrelation().add_condition_max_number_of_pairs_above_threshold(threshold = 0.92, n_pairs = 0)
-    check_feat_feat_corr_result = check_feat_feat_corr.run(dataset=X_train_ds)
+    # Data validation checks: feature-target and feature-feature correlations.
+    # Passes are cached, so the training step skips them on the same data.
+    with timed_stage(timings, "correlation checks"):
+        feature_corr(processed_train_df, "target",
+                     cache=ValidationCache(validation_cache) if validation_cache else None,
+                     engine=correlation_engine)
 
-    if not check_feat_lab_corr_result.passed_conditions():
-        raise ValueError("Feature-Label correlation exceeds the maximum acceptable threshold.")
+    print(pd.DataFrame(timings, columns=["stage", "seconds"]).round(3).to_string(index=False))
 
-    if not check_feat_feat_corr_result.passed_conditions():
-        raise ValueError("Feature-feature correlation exceeds the maximum acceptable threshold.")
-    
     ######################################################
     ### END ###
     ######################################################
@@ -0,0 +1,94 @@
+"""
+Incremental pipeline script for the term deposit analysis.
+
+Runs the stages of the analysis (raw data validation, train/test split,
+exploratory plots, preprocessing, training and evaluation) with
+`src.pipeline_runner`, skipping every stage whose parameters, inputs and
+code have not changed since it last ran, and running independent stages
+(the plots alongside the split and preprocessing) concurrently. Prints the
+status and wall time of every stage.
+
+Usage:
+    python scripts/run_pipeline.py --raw-data data/raw/raw_data_sample.csv --target evaluate --target plots
+"""
+
+import click
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.pipeline_runner import DEFAULT_CACHE_DIR, PipelineRunner, analysis_stages
+
+STAGE_NAMES = ['validate', 'split', 'plots', 'preprocess', 'train', 'evaluate']
+
+
+@click.command()
+@click.option('--raw-data', type=str, default='data/raw/raw_data_sample.csv', show_default=True,
+              help="Path to the raw data CSV")
+@click.option('--data-format', type=click.Choice(['csv', 'parquet', 'arrow']), default='csv',
+              help="File format of the intermediate data")
+@click.option('--model', type=click.Choice(['svc', 'logistic_regression', 'hist_gradient_boosting']), default='svc',
+              help="Model family to train")
+@click.option('--svc-mode', type=click.Choice(['exact', 'approx']), default='exact', help="SVC backend")
+@click.option('--search', type=click.Choice(['random', 'halving', 'precomputed', 'distributed']), default='random',
+              help="Hyperparameter search strategy")
+@click.option('--validation', type=click.Choice(['full', 'tiered']), default='full', help="Deepchecks validation mode")
+@click.option('--validation-cache', type=str, default='.validation_cache', show_default=True,
+              help="Directory of the validation cache")
+@click.option('--correlation-engine', type=click.Choice(['native', 'deepchecks']), default='native',
+              help="Engine of the correlation checks")
+@click.option('--target', 'targets', type=click.Choice(STAGE_NAMES), multiple=True,
+              help="Stage to bring up to date, with the stages it depends on (repeatable; default: plots and evaluate)")
+@click.option('--cache-dir', type=str, default=DEFAULT_CACHE_DIR, show_default=True,
+              help="Directory of the pipeline cache")
+@click.option('--jobs', type=int, default=2, show_default=True, help="Maximum number of stages running at a time")
+@click.option('--force', is_flag=True, help="Run the stages even if they are cached")
+def main(raw_data, data_format, model, svc_mode, search, validation, validation_cache, correlation_engine, targets,
+         cache_dir, jobs, force):
+    """
+    Runs the analysis stages that are not cached.
+
+    Parameters
+    ----------
+    raw_data : str
+        Path to the raw data CSV.
+    data_format : str
+        File format of the intermediate data: 'csv', 'parquet' or 'arrow'.
+    model : str
+        Model family to train: 'svc', 'logistic_regression' or
+        'hist_gradient_boosting'.
+    svc_mode : str
+        'exact' or 'approx' SVC backend, for model='svc'.
+    search : str
+        Hyperparameter search: 'random', 'halving', 'precomputed' or
+        'distributed'.
+    validation : str
+        Deepchecks validation mode: 'full' or 'tiered'.
+    validation_cache : str
+        Directory of the validation cache.
+    correlation_engine : str
+        Engine of the correlation checks: 'native' or 'deepchecks'.
+    targets : tuple of str
+        Stages to bring up to date; empty for 'plots' and 'evaluate'.
+    cache_dir : str
+        Directory of the pipeline cache.
+    jobs : int
+        Maximum number of stages running at a time.
+    force : bool
+        Whether to run the stages even if they are cached.
+
+    Returns
+    -------
+    None
+        The function prints the status of every stage.
+    """
+    stages = analysis_stages(raw_data=raw_data, data_format=data_format, model=model, svc_mode=svc_mode, search=search,
+                             validation=validation, validation_cache=validation_cache,
+                             correlation_engine=correlation_engine)
+    runner = PipelineRunner(stages, cache_dir=cache_dir, max_workers=jobs)
+    summary = runner.run(list(targets) or ['plots', 'evaluate'], force=force)
+    print()
+    print(summary.to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Batch scoring script for the term deposit classifier.
+
+This script loads the trained pipeline once and scores a customer file of
+any size in chunks, writing the predicted class and decision score of
+every row to a CSV file as it goes.
+
+Usage:
+    python scripts/score.py \
+        --input-data data/processed_data/preprocess_test.csv \
+        --pipeline-from results/models/svc_pipeline.pickle \
+        --predictions-to results/tables/svc_predictions.csv
+"""
+
+import click
+import os
+import sys
+import time
+import warnings
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+warnings.filterwarnings("ignore", category=FutureWarning)
+warnings.filterwarnings("ignore", category=UserWarning)
+
+
+@click.command()
+@click.option('--input-data', type=str, required=True, help="Path to the processed features file (CSV, Parquet or Arrow) to score")
+@click.option('--pipeline-from', type=str, required=True,
+              help="Path to the trained pipeline pickle or model artifact directory")
+@click.option('--predictions-to', type=str, required=True, help="Path of the predictions CSV to write")
+@click.option('--chunk-size', type=int, default=10000, show_default=True, help="Rows scored at a time")
+@click.option('--target-col', type=str, default='target', help="Target column to ignore if present")
+@click.option('--id-col', type=str, default=None, help="Identifier column copied to the output")
+def main(input_data, pipeline_from, predictions_to, chunk_size, target_col, id_col):
+    """
+    Scores a customer file in chunks and writes predictions incrementally.
+
+    Parameters
+    ----------
+    input_data : str
+        Path to the CSV, Parquet or Arrow file of processed features to score.
+    pipeline_from : str
+        Path to the pickle file containing the trained model pipeline, or
+        to a model artifact directory.
+    predictions_to : str
+        Path of the CSV file the predictions are written to.
+    chunk_size : int
+        Number of rows read and scored at a time.
+    target_col : str
+        Name of a target column to ignore if present.
+    id_col : str or None
+        Name of an identifier column copied to the output.
+
+    Returns
+    -------
+    None
+    """
+    from src.batch_predict import load_pipeline, stream_predictions
+
+    pipe = load_pipeline(pipeline_from)
+
+    start = time.perf_counter()
+    n_rows = stream_predictions(pipe, input_data, predictions_to, chunk_size, target_col, id_col)
+    seconds = time.perf_counter() - start
+
+    print(f"Scored {n_rows} rows in {seconds:.2f} s; predictions saved to {predictions_to}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Search worker script for the distributed hyperparameter search.
+
+This script joins a running distributed search (`--search distributed` of
+scripts/term_deposit_classifier.py) from any host that shares the trial
+store's file system. It reads the same training data and builds the same
+pipeline from the preprocessor, model family, SVC mode and seed of the
+search, pulls pending candidates from the store, cross-validates them and
+writes their scores back, until no candidate is left. The store holds no
+code: a worker whose pipeline differs from the search's runs no trials.
+
+Usage:
+    python scripts/search_worker.py \
+        --store results/models/search_trials.sqlite \
+        --processed-train-data data/processed_data/preprocess_train.csv \
+        --preprocessor results/models/data_preprocessor.pickle
+"""
+
+import click
+import os
+import pickle
+import sys
+import time
+import warnings
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+warnings.filterwarnings("ignore", category=FutureWarning)
+warnings.filterwarnings("ignore", category=UserWarning)
+
+
+@click.command()
+@click.option('--store', type=str, default='results/models/search_trials.sqlite', show_default=True,
+              help="Path to the trial store of the search")
+@click.option('--processed-train-data', type=str, required=True,
+              help="Path to the processed training data (CSV, Parquet or Arrow) the search runs on")
+@click.option('--preprocessor', type=str, required=True, help="Path to the preprocessor pickle object of the search")
+@click.option('--target-col', type=str, default='target', help="Name of the target/label column")
+@click.option('--seed', type=int, default=522, help="Random seed of the search")
+@click.option('--model', type=click.Choice(['svc', 'logistic_regression', 'hist_gradient_boosting']),
+              default='svc', help="Model family of the search")
+@click.option('--svc-mode', type=click.Choice(['exact', 'approx']), default='exact', help="SVC backend of the search")
+@click.option('--lease-seconds', type=float, default=60, show_default=True,
+              help="Seconds after which a trial of a silent worker is run again")
+@click.option('--max-trial-seconds', type=float, default=3600, show_default=True,
+              help="Seconds after which this worker gives up the lease of a trial it is still running")
+def main(store, processed_train_data, preprocessor, target_col, seed, model, svc_mode, lease_seconds,
+         max_trial_seconds):
+    """
+    Runs pending trials of the searches on the training data until none is left.
+
+    Parameters
+    ----------
+    store : str
+        Path of the SQLite trial store shared with the search.
+    processed_train_data : str
+        Path to the CSV, Parquet or Arrow file containing the processed
+        training data. It must hold the same data as the search's.
+    preprocessor : str
+        Path to the pickled preprocessor of the search.
+    target_col : str
+        The name of the target class column.
+    seed : int
+        Random seed the search's pipeline was built with.
+    model : str
+        Model family of the search, one of `src.model_registry.MODEL_BUILDERS`.
+    svc_mode : str
+        'exact' or 'approx' SVC backend, for model='svc'.
+    lease_seconds : float
+        Seconds without a lease renewal after which a running trial is
+        considered abandoned and run again.
+    max_trial_seconds : float
+        Seconds after which the worker stops renewing the lease of its
+        trial, so that a hung worker does not hold a trial forever.
+
+    Returns
+    -------
+    None
+    """
+    from src.distributed_search import run_worker
+    from src.model_registry import MODEL_BUILDERS
+    from src.read_data import read_data
+
+    train_df = read_data(processed_train_data, typed=True)
+    X_train = train_df.drop(columns=target_col, axis=1)
+    y_train = train_df[target_col]
+
+    with open(preprocessor, "rb") as f:
+        data_preprocessor = pickle.load(f)
+    pipe, _ = MODEL_BUILDERS[model](data_preprocessor, seed, mode=svc_mode)
+
+    start = time.perf_counter()
+    n_trials = run_worker(store, pipe, X_train, y_train, lease_seconds=lease_seconds,
+                          max_trial_seconds=max_trial_seconds)
+    print(f"Ran {n_trials} trials in {time.perf_counter() - start:.1f} s; no trials left in {store}")
+
+
+if __name__ == '__main__':
+    main()
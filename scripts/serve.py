@@ -0,0 +1,79 @@
+"""
+Online inference server script for the term deposit classifier.
+
+This script loads the trained pipeline once and serves predictions for raw
+customer records over HTTP until interrupted. See src/inference_server.py
+for the endpoints.
+
+Usage:
+    python scripts/serve.py --pipeline-from results/models/svc_artifact --port 8080
+
+    curl -X POST localhost:8080/predict -d '{"age": 35, "job": "admin.", ...}'
+    curl localhost:8080/metrics
+"""
+
+import asyncio
+import click
+import os
+import sys
+import warnings
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+warnings.filterwarnings("ignore", category=FutureWarning)
+warnings.filterwarnings("ignore", category=UserWarning)
+
+
+@click.command()
+@click.option('--pipeline-from', type=str, required=True,
+              help="Path to the trained pipeline pickle or model artifact directory")
+@click.option('--host', type=str, default='127.0.0.1', show_default=True, help="Interface to listen on")
+@click.option('--port', type=int, default=8080, show_default=True, help="TCP port to listen on")
+@click.option('--unix-socket', type=str, default=None, help="Listen on this Unix socket path instead of TCP")
+@click.option('--max-batch-size', type=int, default=64, show_default=True,
+              help="Maximum records scored in one micro-batch")
+@click.option('--max-wait-ms', type=float, default=2.0, show_default=True,
+              help="Longest wait for more requests before scoring a batch")
+@click.option('--max-body-bytes', type=int, default=10 * 2**20, show_default=True,
+              help="Largest request body accepted; larger requests get status 413")
+def main(pipeline_from, host, port, unix_socket, max_batch_size, max_wait_ms, max_body_bytes):
+    """
+    Serves predictions of the trained pipeline until interrupted.
+
+    Parameters
+    ----------
+    pipeline_from : str
+        Path to the pickle file containing the trained model pipeline, or
+        to a model artifact directory.
+    host : str
+        Interface to listen on.
+    port : int
+        TCP port to listen on.
+    unix_socket : str or None
+        Unix socket path to listen on instead of TCP.
+    max_batch_size : int
+        Maximum number of records scored in one micro-batch.
+    max_wait_ms : float
+        Longest time in milliseconds to wait for more requests before
+        scoring a batch.
+    max_body_bytes : int
+        Largest request body in bytes read into memory.
+
+    Returns
+    -------
+    None
+    """
+    from src.batch_predict import load_pipeline
+    from src.inference_server import InferenceServer
+
+    server = InferenceServer(load_pipeline(pipeline_from), host=host, port=port,
+                             unix_socket=unix_socket, max_batch_size=max_batch_size,
+                             max_wait_ms=max_wait_ms, max_body_bytes=max_body_bytes)
+    print(f"Serving {pipeline_from} on {unix_socket or f'http://{host}:{port}'}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
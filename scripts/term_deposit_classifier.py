@@ -3,7 +3,9 @@ Training and validation script for term deposit classifier.
 
 This module orchestrates the training pipeline for the term deposit classification
 model. It performs data validation checks, tunes a Support Vector Classifier (SVC)
-using randomized search, and persists the best performing model pipeline. Additionally,
+using randomized search, and persists the best performing model pipeline. Other model
+families of src/model_registry.py (logistic regression, histogram gradient boosting)
+are tuned by the same harness with `--model`. Additionally,
 it generates training performance artifacts including accuracy scores and confusion
 matrices.
 
@@ -14,53 +16,61 @@ Date: 2025-12-01
 import click
 import os
 import sys
-import pandas as pd
 import pickle
-import matplotlib.pyplot as plt
-from scipy.stats import loguniform
-from sklearn.pipeline import make_pipeline
-from sklearn.svm import SVC
-from sklearn.model_selection import RandomizedSearchCV
-from sklearn.metrics import ConfusionMatrixDisplay
-from deepchecks.tabular import Dataset
-from deepchecks.tabular.checks import FeatureLabelCorrelation, FeatureFeatureCorrelation
 import warnings
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.feature_correlation import feature_corr
-from src.random_search_svc import search_svc
 
 warnings.filterwarnings("ignore", category=FutureWarning)
 warnings.filterwarnings("ignore", category=UserWarning)
 
 
 @click.command()
-@click.option('--processed-train-data', type=str, help="Path to processed training data CSV")
+@click.option('--processed-train-data', type=str, help="Path to processed training data (CSV, Parquet or Arrow)")
 @click.option('--preprocessor', type=str, help="Path to preprocessor pickle object")
 @click.option('--pipeline-to', type=str, help="Directory to save the pipeline")
 @click.option('--plot-to', type=str, help="Directory to save the plots")
 @click.option('--table-to', type=str, help="Directory to save the score table")
 @click.option('--target-col', type=str, default='target', help="Name of the target/label column")
 @click.option('--seed', type=int, default=522, help="Random seed")
-def main(processed_train_data, preprocessor, pipeline_to, plot_to, table_to, target_col, seed):
+@click.option('--model', type=click.Choice(['svc', 'logistic_regression', 'hist_gradient_boosting']),
+              default='svc', help="Model family to tune; its outputs are prefixed with its name")
+@click.option('--svc-mode', type=click.Choice(['exact', 'approx']), default='exact',
+              help="'exact' kernel SVC, or 'approx' Nystroem + linear SVM for full-size data")
+@click.option('--search', type=click.Choice(['random', 'halving', 'precomputed', 'distributed']), default='random',
+              help="Hyperparameter search: 'random' search, successive 'halving', "
+                   "'precomputed' random search on precomputed kernels, or 'distributed' random search "
+                   "through a shared trial store")
+@click.option('--search-store', type=str, default='results/models/search_trials.sqlite',
+              help="Trial store of the 'distributed' search; an interrupted search resumes from it")
+@click.option('--validation-cache', type=str, default=None,
+              help="Directory of the validation cache; correlation checks that passed on identical data are skipped")
+@click.option('--correlation-engine', type=click.Choice(['native', 'deepchecks']), default='native',
+              help="Engine of the correlation checks: the 'native' NumPy engine or 'deepchecks'")
+def main(processed_train_data, preprocessor, pipeline_to, plot_to, table_to, target_col, seed, model, svc_mode,
+         search, search_store, validation_cache, correlation_engine):
     '''
-    Validates data, fits an SVC classifier, saves the pipeline, and saves artifacts.
+    Validates data, fits a classifier, saves the pipeline, and saves artifacts.
 
     This function performs the following steps in the training pipeline:
     1. Loads the processed training data and preprocessor object.
     2. Executes custom feature correlation checks using Deepchecks.
-    3. Performs hyperparameter tuning for an SVC model via RandomizedSearchCV.
-    4. Serializes and saves the best model pipeline.
+    3. Performs hyperparameter tuning for the model via a randomized or
+       successive halving search.
+    4. Serializes and saves the best model pipeline, and exports SVC
+       pipelines as a compact model artifact.
     5. Saves training accuracy scores and a confusion matrix plot to disk.
 
     Parameters
     ----------
     processed_train_data : str
-        Path to the CSV file containing the processed training data.
+        Path to the CSV, Parquet or Arrow file containing the processed
+        training data.
     preprocessor : str
         Path to the pickle file containing the preprocessor object.
     pipeline_to : str
-        Directory path where the trained pipeline pickle file will be saved.
+        Directory path where the trained pipeline pickle file and the model
+        artifact directory will be saved.
     plot_to : str
         Directory path where the confusion matrix plot will be saved.
     table_to : str
@@ -69,20 +79,55 @@ def main(processed_train_data, preprocessor, pipeline_to, plot_to, table_to, tar
         The name of the target class column. Default is 'target'.
     seed : int, optional
         Random seed for reproducibility. Default is 522.
+    model : str, optional
+        Model family of src/model_registry.py: 'svc', 'logistic_regression'
+        or 'hist_gradient_boosting'. The pipeline, score table and plot
+        file names start with it. Default is 'svc'.
+    svc_mode : str, optional
+        'exact' to tune a kernel SVC, or 'approx' to tune a Nystroem kernel
+        approximation with a linear SVM, which scales to the full dataset.
+        Default is 'exact'.
+    search : str, optional
+        'random' to cross-validate all candidates on all rows, or 'halving'
+        to screen candidates on small row budgets with successive halving,
+        or 'precomputed' to run the random search on precomputed RBF kernels
+        ('svc' model only), or 'distributed' to run the random search in
+        worker processes through a shared trial store; workers on other
+        hosts join with scripts/search_worker.py. Default is 'random'.
+    search_store : str, optional
+        Path of the SQLite trial store of the 'distributed' search. Default
+        is 'results/models/search_trials.sqlite'.
+    validation_cache : str or None, optional
+        Directory of the validation cache, or None to run the correlation
+        checks without caching. Default is None.
+    correlation_engine : str, optional
+        Engine of the correlation checks: 'native' or 'deepchecks'. Default is
+        'native'.
     
     Returns
     -------
     None
         This function does not return a value; it saves output files to disk.
     '''
+    # imported here rather than at module level, so that --help starts fast
+    import pandas as pd
+    from src.feature_correlation import feature_corr
+    from src.model_registry import search_model
+    from src.evaluation_metrics import evaluate_classifier, save_evaluation_plots
+    from src.model_artifact import export_artifact
+    from src.read_data import read_data
+    from src.validation_cache import ValidationCache
+
     # Read Data
-    train_df = pd.read_csv(processed_train_data)
+    train_df = read_data(processed_train_data, typed=True)
 
     with open(preprocessor, "rb") as f:
         data_preprocessor = pickle.load(f)
         
     # 1. Run Data Validation
-    feature_corr(train_df, target_col)
+    feature_corr(train_df, target_col,
+                 cache=ValidationCache(validation_cache) if validation_cache else None,
+                 engine=correlation_engine)
 
     # Prepare X and y
     X_train = train_df.drop(columns=target_col, axis=1)
@@ -90,38 +135,39 @@ def main(processed_train_data, preprocessor, pipeline_to, plot_to, table_to, tar
 
 
     # 2. Fit and Get the Best Parameters of the  Model
-    print("Tuning SVC model")
-    best_model = search_svc(X_train, y_train, data_preprocessor, seed)
+    print(f"Tuning {model} model ({svc_mode + ', ' if model == 'svc' else ''}{search} search)")
+    best_model = search_model(model, X_train, y_train, data_preprocessor, seed, mode=svc_mode, search=search,
+                              store=search_store)
     
     train_score = round(best_model.best_score_,4)
     train_score_df = pd.DataFrame({'metric':['accuracy'], 'score': [train_score]})
     
     # Check if table_to directory exists, if not create it
     os.makedirs(table_to, exist_ok=True)
-    score_path = os.path.join(table_to, "svc_train_score.csv")
+    score_path = os.path.join(table_to, f"{model}_train_score.csv")
     train_score_df.to_csv(score_path, index=False)
     print(f"Train score saved to {score_path}")
 
 
     # 3. Save the Model
     os.makedirs(pipeline_to, exist_ok=True)
-    model_path = os.path.join(pipeline_to, "svc_pipeline.pickle")
+    model_path = os.path.join(pipeline_to, f"{model}_pipeline.pickle")
     with open(model_path, 'wb') as f:
         pickle.dump(best_model, f)
     print(f"Model saved to {model_path}")
 
-    # 4. Generate and Save Confusion Matrix
-    ConfusionMatrixDisplay.from_estimator(
-        best_model,
-        X_train,
-        y_train,
-        values_format="d"
-    )
-    plt.title("Train Data: Confusion Matrix for SVC model")
-    
-    plot_path = os.path.join(plot_to, "train_svc_confusion_matrix.png")
-    plt.savefig(plot_path)
-    print(f"Confusion matrix saved to {plot_path}")
+    # compact deployable copy of the best pipeline, without the search results;
+    # the artifact format holds SVC pipelines only
+    if model == "svc":
+        artifact_path = os.path.join(pipeline_to, "svc_artifact")
+        export_artifact(best_model, artifact_path)
+        print(f"Model artifact saved to {artifact_path}")
+
+    # 4. Generate and Save Confusion Matrix from a single prediction pass
+    evaluation = evaluate_classifier(best_model.best_estimator_, X_train, y_train)
+    for plot_path in save_evaluation_plots(evaluation, plot_to, f"train_{model}", "Train Data", model,
+                                           curves=False):
+        print(f"Confusion matrix saved to {plot_path}")
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,105 @@
+"""
+Incremental training script for the term deposit classifier.
+
+This script trains a linear SVM on Nystroem RBF features with stochastic
+gradient descent, streaming the processed training file in chunks, so the
+training data never has to fit in memory. The training state is saved to a
+checkpoint after every chunk. Running the script again with the same
+checkpoint and a new file (e.g. a new week of campaign data) updates the
+model instead of refitting it, and an interrupted run resumes where it
+stopped.
+
+Usage:
+    python scripts/train_incremental.py \
+        --train-data data/processed_data/preprocess_train.csv \
+        --preprocessor results/models/data_preprocessor.pickle \
+        --checkpoint results/models/incremental_checkpoint.pickle \
+        --pipeline-to results/models
+"""
+
+import click
+import os
+import sys
+import pickle
+import time
+import warnings
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+warnings.filterwarnings("ignore", category=FutureWarning)
+warnings.filterwarnings("ignore", category=UserWarning)
+
+
+@click.command()
+@click.option('--train-data', type=str, required=True,
+              help="Path to processed training data (CSV, Parquet or Arrow)")
+@click.option('--preprocessor', type=str, default=None,
+              help="Path to preprocessor pickle object; only needed when there is no checkpoint yet")
+@click.option('--checkpoint', type=str, required=True, help="Path of the checkpoint to resume from and update")
+@click.option('--pipeline-to', type=str, required=True, help="Directory to save the pipeline")
+@click.option('--chunk-size', type=int, default=50000, show_default=True, help="Rows trained on at a time")
+@click.option('--target-col', type=str, default='target', help="Name of the target/label column")
+@click.option('--seed', type=int, default=522, help="Random seed")
+@click.option('--gamma', type=float, default=None, help="RBF kernel coefficient of a new model")
+@click.option('--alpha', type=float, default=1e-4, show_default=True, help="Regularization strength of a new model")
+def main(train_data, preprocessor, checkpoint, pipeline_to, chunk_size, target_col, seed, gamma, alpha):
+    """
+    Trains or updates the incremental model on a data file, chunk by chunk.
+
+    Parameters
+    ----------
+    train_data : str
+        Path to the CSV, Parquet or Arrow file containing the processed
+        training data.
+    preprocessor : str or None
+        Path to the pickle file containing the preprocessor object. It is
+        only used to start a new model when the checkpoint does not exist.
+    checkpoint : str
+        Path of the checkpoint file to resume from and to update.
+    pipeline_to : str
+        Directory path where the trained pipeline pickle file and the model
+        artifact directory will be saved.
+    chunk_size : int
+        Number of rows read and trained on at a time.
+    target_col : str
+        The name of the target class column.
+    seed : int
+        Random seed of a new model.
+    gamma : float or None
+        RBF kernel coefficient of a new model; None uses 1 / n_features.
+    alpha : float
+        Regularization strength of a new model.
+
+    Returns
+    -------
+    None
+        This function does not return a value; it saves output files to disk.
+    """
+    # imported here rather than at module level, so that --help starts fast
+    from src.incremental_training import train_incremental
+    from src.model_artifact import export_artifact
+
+    data_preprocessor = None
+    if preprocessor is not None:
+        with open(preprocessor, "rb") as f:
+            data_preprocessor = pickle.load(f)
+
+    resumed = os.path.isfile(checkpoint)
+    start = time.perf_counter()
+    state = train_incremental(train_data, checkpoint, data_preprocessor, seed, chunk_size, target_col, gamma, alpha)
+    seconds = time.perf_counter() - start
+    print(f"{'Updated' if resumed else 'Trained'} the incremental model in {seconds:.2f} s; "
+          f"{state['n_rows']} rows trained on in total, checkpoint saved to {checkpoint}")
+
+    os.makedirs(pipeline_to, exist_ok=True)
+    model_path = os.path.join(pipeline_to, "incremental_pipeline.pickle")
+    with open(model_path, 'wb') as f:
+        pickle.dump(state["pipeline"], f)
+    print(f"Model saved to {model_path}")
+
+    artifact_path = os.path.join(pipeline_to, "incremental_artifact")
+    export_artifact(state["pipeline"], artifact_path)
+    print(f"Model artifact saved to {artifact_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+Batch and streaming prediction module for the term deposit classifier.
+
+This module contains functionality to score customer files of any size with
+a trained pipeline. Files are read in fixed-size chunks and the predictions
+are written incrementally, so memory stays bounded by the chunk size. The
+model's decision function is evaluated once per row, and the predicted
+class is derived from the decision score instead of a second prediction
+pass.
+"""
+
+import os
+import pickle
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.model_artifact import load_artifact
+from src.read_data import iter_data_chunks
+
+
+def load_pipeline(pipeline_from):
+    """
+    Loads a trained pipeline from a pickle file or a model artifact.
+
+    If the pickle holds a fitted hyperparameter search (as saved by
+    scripts/term_deposit_classifier.py), its `best_estimator_` is returned so
+    that prediction does not go through the search object. A directory is
+    loaded as a model artifact written by `src.model_artifact.export_artifact`,
+    which does not need scikit-learn.
+
+    Parameters
+    ----------
+    pipeline_from : str
+        Path to the pickle file or artifact directory of the trained model.
+
+    Returns
+    -------
+    sklearn estimator or ArtifactPredictor
+        The fitted pipeline.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the pickle file does not exist.
+    """
+    if os.path.isdir(pipeline_from):
+        return load_artifact(pipeline_from)
+    if not os.path.isfile(pipeline_from):
+        raise FileNotFoundError(f"Pipeline file {pipeline_from} does not exist.")
+
+    with open(pipeline_from, "rb") as f:
+        model = pickle.load(f)
+
+    return getattr(model, "best_estimator_", model)
+
+
+def predict_with_scores(model, X):
+    """
+    Predicts classes and decision scores in a single pass over X.
+
+    Parameters
+    ----------
+    model : sklearn estimator
+        A fitted binary classifier with a `decision_function`.
+    X : pd.DataFrame
+        The feature matrix to score.
+
+    Returns
+    -------
+    tuple of (np.ndarray, np.ndarray)
+        The predicted classes and the decision scores. A positive score
+        predicts `model.classes_[1]`.
+
+    Raises
+    ------
+    ValueError
+        If the model is not a binary classifier.
+    """
+    classes = model.classes_
+    if len(classes) != 2:
+        raise ValueError(f"Expected a binary classifier, but the model has {len(classes)} classes.")
+
+    scores = np.asarray(model.decision_function(X))
+    predictions = classes[(scores > 0).astype(int)]
+    return predictions, scores
+
+
+def stream_predictions(model, input_path, output_path, chunk_size=10000, target_col="target", id_col=None):
+    """
+    Scores a data file chunk by chunk and writes the predictions incrementally.
+
+    The output CSV has a 'prediction' and a 'decision_score' column, preceded
+    by id_col if given. Rows are written in input order.
+
+    Parameters
+    ----------
+    model : sklearn estimator
+        A fitted binary classifier with a `decision_function`.
+    input_path : str
+        Path to the CSV, Parquet or Arrow file of processed features to score.
+    output_path : str
+        Path of the CSV file the predictions are written to.
+    chunk_size : int, optional
+        Number of rows read and scored at a time. Default is 10000.
+    target_col : str, optional
+        Name of a target column to ignore if present. Default is 'target'.
+    id_col : str or None, optional
+        Name of an identifier column copied to the output and excluded from
+        the features. Default is None.
+
+    Returns
+    -------
+    int
+        The number of rows scored.
+
+    Raises
+    ------
+    ValueError
+        If chunk_size is not positive.
+    KeyError
+        If id_col is given but missing from the input.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+
+    n_rows = 0
+    with open(output_path, "w", newline="") as out:
+        for chunk in iter_data_chunks(input_path, chunk_size):
+            drop_cols = [col for col in (target_col, id_col) if col is not None and col in chunk.columns]
+            predictions, scores = predict_with_scores(model, chunk.drop(columns=drop_cols))
+
+            scored = pd.DataFrame({"prediction": predictions, "decision_score": scores})
+            if id_col is not None:
+                scored.insert(0, id_col, chunk[id_col].to_numpy())
+
+            scored.to_csv(out, header=n_rows == 0, index=False)
+            n_rows += len(chunk)
+
+    return n_rows
@@ -0,0 +1,196 @@
+"""
+Aggregated chart data for the EDA distribution plots.
+
+`altair_ally.dist` embeds every row of the data in the Vega-Lite spec and
+lets the renderer estimate the densities and count the categories, so the
+spec, the render time and the memory grow with the number of rows. The
+functions in this module compute what the charts draw with NumPy instead:
+
+- `density_curves`: the per-class kernel density curve of every numeric
+  column, computed the way the Vega-Lite density transform computes it
+  (Gaussian kernel, per-class normal-reference bandwidth, 200 steps over
+  the column's extent), so the curves are the same.
+- `rug_ticks`: the rug plot ticks, with the observations within a
+  thousandth of the column's extent merged into at most 16 ticks whose
+  combined opacity is that of all their ticks drawn on top of each other.
+- `category_counts`: the per-class count of every category.
+
+The size of the results does not depend on the number of rows.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Points of every density curve, as in the Vega-Lite density transform
+# with groups ('resolve': 'shared')
+DENSITY_STEPS = 200
+
+# Opacity of one rug tick, as drawn by altair_ally.dist
+RUG_OPACITY = 0.3
+
+# Rows of a column evaluated at a time by the kernel density
+_BLOCK_ROWS = 4096
+
+
+def bandwidth_nrd(values, n_rows=None):
+    """
+    Estimates the bandwidth of a Gaussian kernel density.
+
+    This is the normal reference distribution rule of Vega's density
+    transform (Scott's rule with the interquartile range as a robust
+    scale).
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        The observed values, without missing values.
+    n_rows : int, optional
+        Number of observations the rule uses; Vega counts missing values.
+        Defaults to the number of values.
+
+    Returns
+    -------
+    float
+        The bandwidth.
+    """
+    n_rows = len(values) if n_rows is None else n_rows
+    deviation = np.std(values, ddof=1) if len(values) > 1 else np.nan
+    q1, q3 = np.quantile(values, [0.25, 0.75])
+    # zero or undefined scales fall back as in JavaScript's `||`
+    for scale in (np.minimum(deviation, (q3 - q1) / 1.34), deviation, abs(q1), 1.0):
+        if scale and not np.isnan(scale):
+            break
+    return 1.06 * scale * n_rows ** -0.2
+
+
+def _kernel_density(values, grid, bandwidth):
+    """Gaussian kernel density of values at the grid points."""
+    density = np.zeros(len(grid))
+    for start in range(0, len(values), _BLOCK_ROWS):
+        block = values[start:start + _BLOCK_ROWS]
+        z = (grid[:, None] - block[None, :]) / bandwidth
+        density += np.exp(-0.5 * z * z).sum(axis=1)
+    return density / (np.sqrt(2 * np.pi) * bandwidth * len(values))
+
+
+def density_curves(df, columns, label, steps=DENSITY_STEPS):
+    """
+    Computes the per-class kernel density curve of numeric columns.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The data.
+    columns : list of str
+        Numeric columns of df.
+    label : str
+        Column of df whose classes get a curve each.
+    steps : int
+        Number of steps between the grid points of a curve.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The 'column', 'label', grid point 'value' and 'density' of every
+        point of every curve. The classes are in order of first
+        appearance, as the renderer orders them.
+    """
+    # object labels keep missing labels as a group, which categoricals drop
+    classes = df.groupby(df[label].astype(object), sort=False, dropna=False).indices
+    frames = []
+    for column in columns:
+        values = df[column].to_numpy(dtype=float)
+        present = ~np.isnan(values)
+        if not present.any():
+            continue
+        low, high = values[present].min(), values[present].max()
+        grid = np.append(low + np.arange(steps) / steps * (high - low), high)
+        for cls, rows in classes.items():
+            group = values[rows]
+            observed = group[~np.isnan(group)]
+            if not len(observed):
+                continue
+            density = _kernel_density(observed, grid, bandwidth_nrd(observed, len(group)))
+            frames.append(pd.DataFrame({'column': column, 'label': cls, 'value': grid, 'density': density}))
+    if not frames:
+        return pd.DataFrame(columns=['column', 'label', 'value', 'density'])
+    return pd.concat(frames, ignore_index=True)
+
+
+def rug_ticks(df, columns, resolution=1000, opacity=RUG_OPACITY, max_copies=16):
+    """
+    Computes the rug plot ticks of numeric columns.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The data.
+    columns : list of str
+        Numeric columns of df.
+    resolution : int
+        Number of tick positions across the extent of a column; values
+        closer than that are drawn as one tick.
+    opacity : float
+        Opacity of a single tick.
+    max_copies : int
+        Maximum number of ticks drawn at one position.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The 'column', tick 'value' and 'opacity' of every tick; the ticks
+        at a position standing for n observations have together the
+        opacity of n ticks drawn on top of each other.
+    """
+    frames = []
+    for column in columns:
+        values = df[column].dropna().to_numpy(dtype=float)
+        if not len(values):
+            continue
+        low, span = values.min(), values.max() - values.min()
+        step = span / resolution if span else 1.0
+        positions, counts = np.unique(np.round((values - low) / step), return_counts=True)
+        exact = np.unique(values)
+        # keep the observed values when no two of them are merged
+        if len(exact) == len(positions):
+            positions, counts = np.unique(values, return_counts=True)
+        else:
+            positions = low + positions * step
+        # several copies keep the darker anti-aliased edges of many overlapping ticks
+        copies = np.minimum(counts, max_copies)
+        frames.append(pd.DataFrame({'column': column, 'value': np.repeat(positions, copies),
+                                    'opacity': np.repeat(1 - (1 - opacity) ** (counts / copies), copies)}))
+    if not frames:
+        return pd.DataFrame(columns=['column', 'value', 'opacity'])
+    return pd.concat(frames, ignore_index=True)
+
+
+def category_counts(df, columns, label):
+    """
+    Counts the categories of categorical columns per class.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The data.
+    columns : list of str
+        Categorical columns of df.
+    label : str
+        Column of df with the classes.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The 'column', 'category', 'label' and 'count' of every observed
+        combination, with missing categories as NaN. The columns are in
+        order of their number of distinct values, as altair_ally.dist
+        orders them.
+    """
+    frames = []
+    for column in df[columns].nunique().sort_values().index:
+        keys = [df[column].astype(object).rename('category'), df[label].astype(object).rename('label')]
+        counts = df.groupby(keys, dropna=False, observed=True).size().rename('count').reset_index()
+        frames.append(counts.assign(column=column))
+    if not frames:
+        return pd.DataFrame(columns=['column', 'category', 'label', 'count'])
+    return pd.concat(frames, ignore_index=True)[['column', 'category', 'label', 'count']]
@@ -0,0 +1,360 @@
+"""
+Native correlation engine for the feature correlation checks.
+
+This module computes the statistics behind the Deepchecks
+`FeatureFeatureCorrelation` and `FeatureLabelCorrelation` checks run by
+`src.feature_correlation.feature_corr`, with vectorized NumPy on encoded
+arrays instead of a Python function call per column pair and a decision
+tree per feature:
+
+- `feature_feature_correlation`: Spearman (or Pearson) correlation between
+  numeric features, symmetric Theil's U (or Cramér's V) between categorical
+  features and the correlation ratio between numeric and categorical
+  features. The categorical statistics of all pairs come from one sparse
+  product of the category indicator matrix, which holds the contingency
+  table of every pair of categorical columns.
+- `predictive_power_scores`: the predictive power score (PPS) of every
+  feature for the label. A fully grown decision tree on a single feature
+  predicts the majority class of the nearest distinct training value, so
+  the cross-validated tree is replaced by that lookup.
+
+The defaults reproduce the Deepchecks statistics: the same sample sizes,
+the same per-pair handling of missing values and the same PPS folds and
+normalization, so the pass/fail conditions are unchanged.
+"""
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from joblib import Parallel, delayed
+from pandas.api.types import is_bool_dtype, is_numeric_dtype, is_object_dtype, is_string_dtype
+from scipy.stats import rankdata
+
+NUMERIC_METHODS = ['spearman', 'pearson']
+CATEGORICAL_METHODS = ['theil_u', 'cramers_v']
+
+
+def _is_categorical(series):
+    """Whether the PPS treats a column as categorical, as ppscore does."""
+    return (is_bool_dtype(series) or is_object_dtype(series) or is_string_dtype(series)
+            or isinstance(series.dtype, pd.CategoricalDtype))
+
+
+def _indicator_matrix(df, columns):
+    """Returns the sparse category indicator matrix of columns and the first indicator column of each."""
+    codes = [pd.factorize(df[col])[0] for col in columns]
+    sizes = [int(code.max()) + 1 if len(code) and code.max() >= 0 else 0 for code in codes]
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(int)
+    rows = np.concatenate([np.flatnonzero(code >= 0) for code in codes])
+    cols = np.concatenate([start + code[code >= 0] for start, code in zip(starts, codes)])
+    indicators = sp.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(len(df), int(sum(sizes))))
+    return indicators, starts, np.array(sizes)
+
+
+def _block_sums(matrix, starts, axis):
+    """Sums the rows (axis 0) or columns (axis 1) of matrix within each block starting at starts."""
+    return np.add.reduceat(matrix, starts, axis=axis)
+
+
+def _xlogx(counts):
+    """Returns counts * log(counts), with 0 for zero counts."""
+    return np.where(counts > 0, counts * np.log(np.where(counts > 0, counts, 1)), 0.0)
+
+
+def _categorical_association(df, columns, method):
+    """Symmetric Theil's U or Cramér's V of every pair of categorical columns."""
+    indicators, starts, sizes = _indicator_matrix(df, columns)
+    if sizes.min() == 0:
+        raise ValueError(f"Categorical columns {[c for c, s in zip(columns, sizes) if s == 0]} have no values.")
+    # joint category counts of every pair of columns, over the rows where both are present
+    joint = (indicators.T @ indicators).toarray()
+    # counts of each category over the rows where the other column of the pair is present
+    marginal = _block_sums(joint, starts, axis=1)
+    n_rows = _block_sums(marginal, starts, axis=0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if method == 'theil_u':
+            log_n = np.log(np.where(n_rows > 0, n_rows, 1))
+            entropy = log_n - _block_sums(_xlogx(marginal), starts, axis=0) / n_rows
+            joint_entropy = log_n - _block_sums(_block_sums(_xlogx(joint), starts, axis=0), starts, axis=1) / n_rows
+            mutual_information = entropy + entropy.T - joint_entropy
+            # (H_x U(x|y) + H_y U(y|x)) / (H_x + H_y) with U(x|y) = I / H_x
+            association = 2 * mutual_information / (entropy + entropy.T)
+        else:
+            block_of = np.repeat(np.arange(len(columns)), sizes)
+            expected = marginal[:, block_of]
+            terms = np.where(joint > 0, joint ** 2 / (expected * expected.T), 0.0)
+            phi2 = _block_sums(_block_sums(terms, starts, axis=0), starts, axis=1) - 1
+            n_present = _block_sums((marginal > 0).astype(float), starts, axis=0)
+            association = np.sqrt(np.clip(phi2, 0, None) / np.minimum(n_present - 1, n_present.T - 1))
+            association[np.minimum(n_present - 1, n_present.T - 1) <= 0] = np.nan
+    association[n_rows == 0] = np.nan
+    np.fill_diagonal(association, np.where(np.diag(n_rows) > 0, 1.0, np.nan))
+    return association
+
+
+def _correlation_ratio(df, numeric_cols, categorical_cols):
+    """Correlation ratio of every numeric column with every categorical column."""
+    indicators, starts, sizes = _indicator_matrix(df, categorical_cols)
+    values = df[numeric_cols].to_numpy(dtype=float)
+    present = ~np.isnan(values)
+    centered = np.where(present, values - np.nanmean(values, axis=0), 0.0)
+
+    # per-category counts, sums and sums of squares of each numeric column
+    counts = indicators.T @ present.astype(float)
+    sums = indicators.T @ centered
+    squares = indicators.T @ centered ** 2
+
+    n_rows = _block_sums(counts, starts, axis=0)
+    total_sum = _block_sums(sums, starts, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        between = _block_sums(np.where(counts > 0, sums ** 2 / counts, 0.0), starts, axis=0) - total_sum ** 2 / n_rows
+        total = _block_sums(squares, starts, axis=0) - total_sum ** 2 / n_rows
+        ratio = np.where(total > 0, np.sqrt(np.clip(between, 0, None) / total), 0.0)
+    ratio[n_rows == 0] = np.nan
+
+    # Deepchecks averages every category code up to the largest present one,
+    # so a category with no rows left beside a numeric value gives NaN
+    for c, (start, size) in enumerate(zip(starts, sizes)):
+        nonzero = counts[start:start + size] > 0
+        if nonzero.all():
+            continue
+        last = size - 1 - np.argmax(nonzero[::-1], axis=0)
+        gaps = np.cumsum(~nonzero, axis=0)[last, np.arange(len(numeric_cols))]
+        ratio[c, gaps > 0] = np.nan
+    return ratio.T
+
+
+def _rank_correlation(df, columns, method):
+    """Spearman or Pearson correlation of every pair of numeric columns, over rows where both are present."""
+    values = df[columns].to_numpy(dtype=float)
+    present = ~np.isnan(values)
+    complete = present.all(axis=0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        transformed = rankdata(values[:, complete], axis=0) if method == 'spearman' else values[:, complete]
+        correlation = np.full((len(columns), len(columns)), np.nan)
+        if len(transformed):
+            correlation[np.ix_(complete, complete)] = np.corrcoef(transformed, rowvar=False)
+
+        # pairs with missing values use the rows where both are present
+        for i in np.flatnonzero(~complete):
+            for j in range(len(columns)):
+                valid = present[:, i] & present[:, j]
+                if valid.any():
+                    pair = values[valid][:, [i, j]]
+                    if method == 'spearman':
+                        pair = rankdata(pair, axis=0)
+                    correlation[i, j] = correlation[j, i] = np.corrcoef(pair, rowvar=False)[0, 1]
+    return correlation
+
+
+def feature_feature_correlation(df, label, cat_features, n_samples=10_000, random_state=42,
+                                numeric_method='spearman', categorical_method='theil_u'):
+    """
+    Computes the pairwise correlation matrix of the features.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Features and label.
+    label : str
+        The label column, which is excluded.
+    cat_features : list of str
+        The categorical features. The other numeric columns are numeric
+        features; remaining columns are ignored.
+    n_samples : int, optional
+        Number of rows sampled (with random_state) for the statistics.
+        Default is 10,000, as in Deepchecks.
+    random_state : int, optional
+        Random seed of the sample. Default is 42, as in Deepchecks.
+    numeric_method : str, optional
+        'spearman' or 'pearson' correlation between numeric features.
+        Default is 'spearman'.
+    categorical_method : str, optional
+        'theil_u' (symmetric Theil's U) or 'cramers_v' association between
+        categorical features. Default is 'theil_u'.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Symmetric matrix over the numeric then the categorical features.
+        Numeric-categorical entries are correlation ratios. Pairs without
+        common non-missing rows are NaN.
+
+    Raises
+    ------
+    ValueError
+        If a method is unknown or a categorical feature is missing.
+    """
+    if numeric_method not in NUMERIC_METHODS:
+        raise ValueError(f"Unknown numeric method {numeric_method!r}; expected one of {NUMERIC_METHODS}.")
+    if categorical_method not in CATEGORICAL_METHODS:
+        raise ValueError(f"Unknown categorical method {categorical_method!r}; expected one of {CATEGORICAL_METHODS}.")
+    missing_cols = [col for col in cat_features if col not in df.columns]
+    if missing_cols:
+        raise ValueError(f"Categorical features {missing_cols} are not columns of the data.")
+
+    if len(df) > n_samples:
+        df = df.sample(n_samples, random_state=random_state)
+    cat_cols = [col for col in df.columns if col in cat_features and col != label]
+    num_cols = [col for col in df.columns
+                if col not in cat_features and col != label and is_numeric_dtype(df[col])]
+
+    features = num_cols + cat_cols
+    matrix = np.full((len(features), len(features)), np.nan)
+    n_num = len(num_cols)
+    if num_cols:
+        matrix[:n_num, :n_num] = _rank_correlation(df, num_cols, numeric_method)
+    if cat_cols:
+        matrix[n_num:, n_num:] = _categorical_association(df, cat_cols, categorical_method)
+    if num_cols and cat_cols:
+        ratio = _correlation_ratio(df, num_cols, cat_cols)
+        matrix[:n_num, n_num:] = ratio
+        matrix[n_num:, :n_num] = ratio.T
+    return pd.DataFrame(matrix, index=features, columns=features)
+
+
+def pairs_above_threshold(matrix, threshold):
+    """
+    Lists the feature pairs correlated above a threshold.
+
+    Parameters
+    ----------
+    matrix : pandas.DataFrame
+        Correlation matrix from `feature_feature_correlation`.
+    threshold : float
+        The correlation threshold.
+
+    Returns
+    -------
+    list of tuple
+        The (feature, feature) pairs with a correlation greater than
+        threshold, each pair once, as in the Deepchecks condition.
+    """
+    rows, cols = np.nonzero(matrix.to_numpy() > threshold)
+    return [(matrix.index[i], matrix.columns[j]) for i, j in zip(rows, cols)
+            if matrix.index[i] < matrix.columns[j]]
+
+
+def _weighted_f1(truth, predicted, n_classes):
+    """Support-weighted F1 score, as sklearn's f1_score(average='weighted')."""
+    confusion = np.bincount(truth * n_classes + predicted, minlength=n_classes ** 2).reshape(n_classes, n_classes)
+    true_positives = np.diag(confusion)
+    support = confusion.sum(axis=1)
+    denominator = support + confusion.sum(axis=0)
+    f1 = np.divide(2 * true_positives, denominator, out=np.zeros(n_classes), where=denominator > 0)
+    return float(np.sum(f1 * support) / np.sum(support))
+
+
+def _majority_classes(codes, truth, n_codes, n_classes):
+    """Returns the most frequent class of each code (lowest class on ties) and the code counts."""
+    counts = np.bincount(codes * n_classes + truth, minlength=n_codes * n_classes).reshape(n_codes, n_classes)
+    return counts.argmax(axis=1), counts.sum(axis=1)
+
+
+def _tree_fold_predictions(x, categorical, truth, train, test, n_classes):
+    """Predictions of a fully grown decision tree fitted on one feature of the training rows."""
+    if categorical:
+        codes, uniques = pd.factorize(x)
+        majority, counts = _majority_classes(codes[train], truth[train], len(uniques), n_classes)
+        if (counts[codes[test]] == 0).any():
+            # a category missing from the training rows follows the tree's
+            # all-zero indicator path, which only the tree itself knows
+            from sklearn.preprocessing import OneHotEncoder
+            from sklearn.tree import DecisionTreeClassifier
+            encoded = OneHotEncoder().fit_transform(np.asarray(x, dtype=object).reshape(-1, 1))
+            return DecisionTreeClassifier().fit(encoded[train], truth[train]).predict(encoded[test])
+        return majority[codes[test]]
+
+    # trees split float32 features at midpoints between distinct training values
+    values = np.asarray(x, dtype=np.float32)
+    distinct, inverse = np.unique(values[train], return_inverse=True)
+    majority, _ = _majority_classes(inverse, truth[train], len(distinct), n_classes)
+    test_values = values[test].astype(np.float64)
+    right = np.clip(np.searchsorted(distinct, test_values), 0, len(distinct) - 1)
+    left = np.clip(right - 1, 0, None)
+    midpoint = distinct[left].astype(np.float64) / 2.0 + distinct[right].astype(np.float64) / 2.0
+    nearest = np.where((distinct[right] != test_values) & (test_values <= midpoint), left, right)
+    return majority[nearest]
+
+
+def _feature_pps(x, y, sample, cross_validation, random_state):
+    """Predictive power score of one feature for a categorical label, as computed by ppscore."""
+    from sklearn.model_selection import StratifiedKFold
+
+    data = pd.DataFrame({'x': x, 'y': y}).dropna()
+    if len(data) == 0:
+        return 0.0
+    if sample and len(data) > sample:
+        data = data.sample(sample, random_state=random_state, replace=False)
+    categorical = _is_categorical(data['x'])
+    if categorical and data['x'].value_counts().count() == len(data):
+        return 0.0  # feature is an id
+    n_classes = data['y'].value_counts().count()
+    if n_classes == 1 or n_classes == len(data):
+        return 0.0  # label is constant or an id
+
+    # cross-validated weighted F1 of the tree on the shuffled rows
+    shuffled = data.sample(frac=1, random_state=random_state, replace=False)
+    _, truth = np.unique(shuffled['y'].to_numpy(), return_inverse=True)
+    folds = StratifiedKFold(n_splits=cross_validation).split(np.zeros(len(truth)), truth)
+    model_score = np.mean([
+        _weighted_f1(truth[test], _tree_fold_predictions(shuffled['x'], categorical, truth, train, test, n_classes),
+                     n_classes)
+        for train, test in folds
+    ])
+
+    # baseline: the better of predicting the most common class and a random permutation
+    _, truth = np.unique(data['y'].to_numpy(), return_inverse=True)
+    truth = pd.Series(truth)
+    most_common = truth.value_counts().index[0]
+    permuted = truth.sample(frac=1, random_state=random_state).to_numpy()
+    baseline_score = max(_weighted_f1(truth.to_numpy(), np.full(len(truth), most_common), n_classes),
+                         _weighted_f1(truth.to_numpy(), permuted, n_classes))
+    if model_score < baseline_score:
+        return 0.0
+    return float((model_score - baseline_score) / (1.0 - baseline_score))
+
+
+def predictive_power_scores(df, label, n_samples=100_000, sample=5_000, cross_validation=4,
+                            random_state=123, n_jobs=1):
+    """
+    Computes the predictive power score of every feature for the label.
+
+    The PPS is the cross-validated weighted F1 score of a decision tree
+    predicting the label from the feature alone, normalized so that 0 is
+    no better than the best naive prediction and 1 is perfect.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Features and label.
+    label : str
+        The label column. It is treated as categorical.
+    n_samples : int, optional
+        Number of rows sampled from df. Default is 100,000, as in Deepchecks.
+    sample : int, optional
+        Number of rows, after dropping missing values, used per feature.
+        Default is 5,000, as in ppscore.
+    cross_validation : int, optional
+        Number of stratified folds. Default is 4, as in ppscore.
+    random_state : int, optional
+        Random seed of the samples and row shuffles. Default is 123, the
+        ppscore default.
+    n_jobs : int, optional
+        Number of parallel workers scoring the features. Default is 1.
+
+    Returns
+    -------
+    pandas.Series
+        PPS of each feature, highest first.
+    """
+    if len(df) > n_samples:
+        df = df.sample(n_samples, random_state=random_state)
+    y = df[label].astype(object)
+    features = [col for col in df.columns if col != label]
+    scores = Parallel(n_jobs=n_jobs)(
+        delayed(_feature_pps)(df[col], y, sample, cross_validation, random_state) for col in features
+    )
+    return pd.Series(scores, index=features, name='ppscore').sort_values(ascending=False, kind='stable')
@@ -1,11 +1,298 @@
 """
 This script contains a function to generate and save EDA visualizations.
+
+The figures are independent jobs: the data of each figure is aggregated
+first (density curves and category counts from `src.chart_data`, and the
+precomputed correlation matrices) so that no data rows are embedded in
+the chart specs, and the figures are rendered to PNG in parallel worker
+processes. The charts look like the `altair_ally` plots they replace. A
+figure is skipped when its Vega-Lite spec (which holds the aggregated data,
+its encoded types and everything the chart-building code sets) and the
+Altair and vl-convert versions hash to the same value as when its PNG was
+last saved; the hashes are kept in `.figure_hashes.json` in the output
+directory.
 """
+import hashlib
+import json
 import os
+import sys
+import time
+import numpy as np
 import pandas as pd
-import altair_ally as aly
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.chart_data import category_counts, density_curves, rug_ticks
+
+# File of the input hash of every saved figure, in the output directory
+FIGURE_HASHES = ".figure_hashes.json"
+
+CORRELATION_TYPES = ['pearson', 'spearman']
+
+
+def correlation_data(df, corr_types=CORRELATION_TYPES):
+    """
+    Computes the pairwise correlations shown in the correlation plot.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The data; its numeric and boolean columns are correlated.
+    corr_types : list of str
+        Correlation methods accepted by `DataFrame.corr`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per pair below the diagonal of each correlation matrix,
+        with the 'corr_type', the 'index' and 'variable' columns of the
+        pair and its correlation 'value', in the order `altair_ally.corr`
+        plots them.
+    """
+    numeric = df.select_dtypes(['number', 'boolean'])
+    frames = []
+    for corr_type in corr_types:
+        corr_df = numeric.corr(corr_type)
+        corr_df[np.triu(np.ones(corr_df.shape, dtype=bool))] = np.nan
+        long = (corr_df.reset_index().melt(id_vars='index').dropna()
+                .sort_values('variable', ascending=False))
+        frames.append(long.assign(corr_type=corr_type))
+    columns = ['corr_type', 'index', 'variable', 'value']
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)[columns]
+
+
+def correlation_chart(corr_data, mark='circle'):
+    """
+    Plots precomputed correlations the way `altair_ally.corr` plots them.
+
+    Parameters
+    ----------
+    corr_data : pandas.DataFrame
+        Output of `correlation_data`.
+    mark : str
+        Shape of the points.
+
+    Returns
+    -------
+    altair.ConcatChart
+        One correlation plot per correlation type, in a single row.
+    """
+    import altair as alt
+
+    subplot_row = []
+    for num, (corr_type, corr2) in enumerate(corr_data.groupby('corr_type', sort=False)):
+        yaxis = alt.Axis(labels=False) if num > 0 else alt.Axis()
+        var_sort = corr2['variable'].value_counts().index.tolist()
+        ind_sort = corr2['index'].value_counts().index.tolist()
+        subplot_row.append(
+            alt.Chart(corr2.drop(columns='corr_type'), mark=mark, title=f'{corr_type.capitalize()} correlations')
+            .transform_calculate(abs_value='abs(datum.value)')
+            .encode(
+                alt.X('index', sort=ind_sort, title=''),
+                alt.Y('variable', sort=var_sort[::-1], title='', axis=yaxis),
+                alt.Color('value', title='', scale=alt.Scale(domain=[-1, 1], scheme='blueorange')),
+                alt.Size('abs_value:Q', scale=alt.Scale(domain=[0, 1]), legend=None),
+                [alt.Tooltip('value', format='.2f').title('corr'), alt.Tooltip('index').title('x'),
+                 alt.Tooltip('variable').title('y')]
+            )
+        )
+    return alt.concat(*subplot_row).resolve_axis(y='shared').configure_view(strokeWidth=0)
+
 
-def create_visualizations(train_df, full_df, plot_to):
+def _grid_columns(n_charts):
+    """Number of grid columns of altair_ally.dist: one row up to 3 charts, then a squareish grid."""
+    return n_charts if n_charts <= 3 else int(np.ceil(np.sqrt(n_charts)))
+
+
+def numeric_dist_chart(curves, ticks, label='y'):
+    """
+    Plots precomputed densities the way `altair_ally.dist` plots numeric columns.
+
+    Parameters
+    ----------
+    curves : pandas.DataFrame
+        Output of `src.chart_data.density_curves`.
+    ticks : pandas.DataFrame
+        Output of `src.chart_data.rug_ticks`.
+    label : str
+        Name of the class column, used for the colour.
+
+    Returns
+    -------
+    altair.ConcatChart
+        A density plot with a rug plot for every column, in a grid.
+    """
+    import altair as alt
+
+    columns = pd.unique(curves['column']).tolist()[::-1]
+    subplot_row = []
+    for col in columns:
+        density = curves.loc[curves['column'] == col, ['label', 'value', 'density']]
+        subplot = (
+            alt.Chart(density.rename(columns={'label': label, 'value': col}), mark=alt.MarkDef('area', opacity=0.1))
+            .encode(
+                alt.X(col, axis=alt.Axis(grid=False)),
+                alt.Y('density:Q', title=None).stack(False),
+                alt.Color(label, title=None))
+            .properties(width=185, height=120)
+        )
+        subplot += subplot.mark_line()
+        rug = ticks.loc[ticks['column'] == col, ['value', 'opacity']].rename(columns={'value': col})
+        subplot += alt.Chart(rug).mark_tick(color='black', yOffset=68 - 3, height=5).encode(
+            alt.X(col).axis(offset=8),
+            alt.Opacity('opacity:Q', scale=None, legend=None),
+            tooltip=alt.value('Individual observations')
+        )
+        subplot_row.append(subplot)
+    return alt.concat(*subplot_row, columns=_grid_columns(len(columns)))
+
+
+def categorical_dist_chart(counts, label='y'):
+    """
+    Plots precomputed counts the way `altair_ally.dist` plots categorical columns.
+
+    Parameters
+    ----------
+    counts : pandas.DataFrame
+        Output of `src.chart_data.category_counts`.
+    label : str
+        Name of the class column, used for the colour.
+
+    Returns
+    -------
+    altair.ConcatChart
+        A bar plot of the per-class counts of every column, in a grid.
+    """
+    import altair as alt
+
+    columns = pd.unique(counts['column']).tolist()
+    charts = []
+    for col in columns:
+        data = counts.loc[counts['column'] == col, ['category', 'label', 'count']]
+        data = data.drop(columns='label') if col == label else data
+        charts.append(
+            alt.vconcat(
+                alt.Chart(data.rename(columns={'category': col, 'label': label}), width=120).mark_bar().encode(
+                    x=alt.X('count:Q', title='Count of Records'),
+                    y=alt.Y(label, title=None, axis=alt.Axis(domain=True, title='', labels=False, ticks=False)),
+                    color=alt.Color(label, title=None),
+                    row=alt.Row(col, title=None,
+                                header=alt.Header(labelAngle=0, labelAlign='left', labelPadding=5))),
+                title=alt.TitleParams(col, anchor='middle')))
+    return (
+        alt.concat(*charts, columns=_grid_columns(len(columns)))
+        .configure_facet(spacing=0)
+        .configure_view(stroke=None)
+        .configure_scale(bandPaddingInner=0.06, bandPaddingOuter=0.4))
+
+
+def figure_jobs(train_df, full_df):
+    """
+    Prepares the data of every figure.
+
+    The figures get aggregates only: density curves, rug ticks, category
+    counts and correlations, whose size does not depend on the number of
+    rows.
+
+    Parameters
+    ----------
+    train_df : pandas.DataFrame
+        The training data subset.
+    full_df : pandas.DataFrame
+        The complete dataset for the correlation plot.
+
+    Returns
+    -------
+    dict
+        The figure kind, title and input data (a DataFrame or a tuple of
+        DataFrames) of each figure, keyed by its file name.
+    """
+    numeric = train_df.select_dtypes('number').columns.tolist()
+    categorical = train_df.select_dtypes(['object', 'category']).columns.tolist()
+    return {
+        "numeric_univariate.png": (
+            "numeric_dist", "Figure 1: Univariate distributions of numeric variables",
+            (density_curves(train_df, numeric, 'y'), rug_ticks(train_df, numeric))),
+        "categorical_univariate.png": (
+            "categorical_dist", "Figure 2: Univariate distributions of categorical variables",
+            category_counts(train_df, categorical, 'y')),
+        "correlation_plot.png": (
+            "correlation", "Figure 3: Correlation plot for numeric variables",
+            correlation_data(full_df)),
+    }
+
+
+def build_chart(kind, title, data):
+    """
+    Builds one titled figure from its input data.
+
+    Parameters
+    ----------
+    kind : str
+        'numeric_dist', 'categorical_dist' or 'correlation'.
+    title : str
+        Title of the figure.
+    data : pandas.DataFrame or tuple of pandas.DataFrame
+        Input data of the figure, from `figure_jobs`.
+
+    Returns
+    -------
+    altair.TopLevelMixin
+        The chart.
+    """
+    if kind == "numeric_dist":
+        chart = numeric_dist_chart(*data)
+    elif kind == "categorical_dist":
+        chart = categorical_dist_chart(data)
+    else:
+        chart = correlation_chart(data)
+    return chart.properties(title=title)
+
+
+def figure_hash(kind, title, data):
+    """Returns the hash of a figure's Vega-Lite spec and of the Altair and vl-convert versions."""
+    import altair as alt
+    import vl_convert
+
+    spec = build_chart(kind, title, data).to_json(indent=None, sort_keys=True)
+    key = json.dumps([alt.__version__, vl_convert.__version__, spec])
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def render_figure(kind, title, data, path):
+    """
+    Builds one figure from its input data and saves it.
+
+    Parameters
+    ----------
+    kind : str
+        'numeric_dist', 'categorical_dist' or 'correlation'.
+    title : str
+        Title of the figure.
+    data : pandas.DataFrame or tuple of pandas.DataFrame
+        Input data of the figure, from `figure_jobs`.
+    path : str
+        Path of the PNG file.
+
+    Returns
+    -------
+    float
+        Seconds spent building and saving the figure.
+    """
+    start = time.perf_counter()
+    build_chart(kind, title, data).save(path)
+    return time.perf_counter() - start
+
+
+def _read_hashes(plot_to):
+    path = os.path.join(plot_to, FIGURE_HASHES)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def create_visualizations(train_df, full_df, plot_to, n_jobs=1, force=False):
     """
     Generates and saves all EDA visualizations.
 
@@ -22,7 +309,19 @@ def create_visualizations(train_df, full_df, plot_to):
         The complete dataset for the correlation plot.
     plot_to : str
         The directory path to save the plots.
-    
+    n_jobs : int, optional
+        Number of worker processes rendering the figures (default is 1,
+        rendering in this process).
+    force : bool, optional
+        Whether to render the figures even if their spec is unchanged
+        (default is False).
+
+    Returns
+    -------
+    pandas.DataFrame
+        The 'figure', its 'status' ('rendered' or 'unchanged') and the
+        'seconds' spent rendering it.
+
     Raises
     ------
     TypeError
@@ -40,44 +339,46 @@ def create_visualizations(train_df, full_df, plot_to):
             raise TypeError(f"train_df must be a pandas DataFrame, got {type(train_df).__name__}")
         if not isinstance(full_df, pd.DataFrame):
             raise TypeError(f"full_df must be a pandas DataFrame, got {type(full_df).__name__}")
-        
+
         # Validate DataFrames are not empty
         if train_df.empty:
             raise ValueError("train_df cannot be empty")
         if full_df.empty:
             raise ValueError("full_df cannot be empty")
-        
+
         # Validate required column exists
         if 'y' not in train_df.columns:
             raise KeyError("Column 'y' is required in train_df but was not found")
-        
+
         # Validate output directory
         if not isinstance(plot_to, str):
             raise TypeError(f"plot_to must be a string, got {type(plot_to).__name__}")
-        
+
         # Create output directory if it doesn't exist
         os.makedirs(plot_to, exist_ok=True)
-        
-        # Generate and save numeric variable distributions
-        numeric_plot = aly.dist(train_df, color="y")
-        numeric_plot.properties(
-            title="Figure 1: Univariate distributions of numeric variables"
-        ).save(os.path.join(plot_to, "numeric_univariate.png"))
-        
-        # Generate and save categorical variable distributions
-        categorical_plot = aly.dist(
-            train_df, dtype="object", color="y"
-        ).properties(
-            title="Figure 2: Univariate distributions of categorical variables"
-        ).save(os.path.join(plot_to, "categorical_univariate.png"))
-        
-        # Generate and save correlation plot
-        correlation_plot = aly.corr(full_df).properties(
-            title="Figure 3: Correlation plot for numeric variables"
-        ).save(os.path.join(plot_to, "correlation_plot.png"))
-        
+
+        # Render only the figures whose spec changed since they were saved
+        jobs = figure_jobs(train_df, full_df)
+        saved = _read_hashes(plot_to)
+        hashes = {name: figure_hash(*job) for name, job in jobs.items()}
+        stale = [name for name in jobs
+                 if force or saved.get(name) != hashes[name] or not os.path.exists(os.path.join(plot_to, name))]
+
+        from joblib import Parallel, delayed
+        seconds = Parallel(n_jobs=min(n_jobs, max(len(stale), 1)))(
+            delayed(render_figure)(*jobs[name], os.path.join(plot_to, name)) for name in stale
+        )
+        saved.update({name: hashes[name] for name in stale})
+        with open(os.path.join(plot_to, FIGURE_HASHES), "w") as f:
+            json.dump(saved, f, indent=2)
+
+        rendered = dict(zip(stale, seconds))
+        summary = pd.DataFrame([(name, "rendered" if name in rendered else "unchanged", round(rendered.get(name, 0.0), 3))
+                                for name in jobs], columns=["figure", "status", "seconds"])
+        print(summary.to_string(index=False))
         print("Saved all plots successfully.")
-        
+        return summary
+
     except (TypeError, ValueError, KeyError, OSError):
         print(f"Error in create_visualizations")
         raise
@@ -0,0 +1,520 @@
+"""
+Randomized search distributed over worker processes through a shared trial store.
+
+This module contains the `DistributedSearchCV` class, which samples the same
+candidates as RandomizedSearchCV and writes them as trials to an SQLite
+file, the trial store. Any number of workers pull pending trials from the
+store, cross-validate them and write back their scores: the local worker
+processes started by the search, and workers on other hosts that share the
+file system (`scripts/search_worker.py`). The search refits the best
+pipeline once every trial is finished.
+
+A search is identified in the store by a hash of its data, the parameters
+of its pipeline, the indices of its folds and its candidates, which do not
+depend on the library versions or the host. Running a search again resumes
+it: finished trials are kept and only the others are run, so an
+interrupted search does not start over. A worker renews the lease of its
+trial while it runs, for at most `max_trial_seconds`; a trial whose lease
+ran out (its worker died or hung) is pulled again by another worker.
+
+The store only holds JSON: the hash of the pipeline parameters, the fold
+indices, the candidates and the scores. Every worker is given the unfitted
+pipeline by its caller (the search, or `scripts/search_worker.py`, which
+builds it with the model registry) and only runs the searches of the same
+pipeline, so a worker never loads code from the shared file.
+
+As in the cached randomized search of `src.model_registry.search_pipeline`,
+every worker caches the preprocessor fitted on each fold in a temporary
+directory of its own (`Pipeline(memory=...)`), so the candidates after the
+first reuse it instead of refitting it, and only the fold being scored is
+held in memory. The scores match those of the 'random' search. SQLite
+relies on file locks; the shared file system must support them (NFS
+with lockd does).
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import socket
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from scipy.stats import rankdata
+from sklearn.base import BaseEstimator, ClassifierMixin, clone
+from sklearn.model_selection import ParameterSampler, check_cv, cross_validate
+from sklearn.utils.validation import check_array, check_consistent_length, check_is_fitted
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.validation_cache import dataset_fingerprint
+
+# Default trial store, relative to the project root
+DEFAULT_STORE = "results/models/search_trials.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS searches (
+    key TEXT PRIMARY KEY, data TEXT NOT NULL, estimator TEXT NOT NULL, cv TEXT NOT NULL, created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS trials (
+    search TEXT NOT NULL, id INTEGER NOT NULL, params TEXT NOT NULL, status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT, heartbeat REAL, test_scores TEXT, fit_times TEXT, score_times TEXT, train_scores TEXT,
+    PRIMARY KEY (search, id)
+);
+"""
+
+# Longest time a worker keeps the lease of one trial, see `run_worker`
+MAX_TRIAL_SECONDS = 3600
+
+
+def data_fingerprint(X, y):
+    """
+    Computes a content hash of a feature matrix and target vector.
+
+    Parameters
+    ----------
+    X : pd.DataFrame or np.ndarray
+        The feature matrix.
+    y : pd.Series or np.ndarray
+        The target vector.
+
+    Returns
+    -------
+    str
+        Hex SHA-256 digest of the dataset fingerprints of X and y.
+    """
+    fingerprints = [dataset_fingerprint(pd.DataFrame(X)), dataset_fingerprint(pd.DataFrame({"y": np.asarray(y)}))]
+    return hashlib.sha256("".join(fingerprints).encode()).hexdigest()
+
+
+def _json_params(params):
+    """Converts sampled parameters (NumPy scalars) to JSON-serializable values."""
+    return {key: value.item() if isinstance(value, np.generic) else value for key, value in params.items()}
+
+
+def estimator_fingerprint(estimator):
+    """
+    Computes a hash of the parameters of an unfitted estimator.
+
+    Parameters
+    ----------
+    estimator : sklearn.pipeline.Pipeline
+        The unfitted pipeline.
+
+    Returns
+    -------
+    str
+        Hex SHA-256 digest of its deep parameters, with the objects among
+        them hashed by their repr.
+    """
+    params = json.dumps(estimator.get_params(deep=True), sort_keys=True, default=repr)
+    return hashlib.sha256(params.encode()).hexdigest()
+
+
+def search_key(data, estimator, splits, candidates):
+    """
+    Computes the key of a search in the trial store.
+
+    Parameters
+    ----------
+    data : str
+        Fingerprint of the training data, from `data_fingerprint`.
+    estimator : sklearn.pipeline.Pipeline
+        The unfitted pipeline; its parameters are hashed.
+    splits : list of tuple of np.ndarray
+        The (train, test) indices of every fold.
+    candidates : list of dict
+        The JSON-serializable parameter candidates.
+
+    Returns
+    -------
+    str
+        Hex SHA-256 digest.
+    """
+    digest = hashlib.sha256(data.encode())
+    digest.update(estimator_fingerprint(estimator).encode())
+    for train, test in splits:
+        for indices in (train, test):
+            digest.update(np.asarray(indices, dtype="<i8").tobytes() + b";")
+    digest.update(json.dumps(candidates, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+class TrialStore:
+    """
+    SQLite file holding the searches and their trials.
+
+    Parameters
+    ----------
+    path : str
+        Path of the SQLite file; it is created if it does not exist.
+    timeout : float, optional
+        Seconds to wait for a lock held by another worker. Default is 60.
+    """
+
+    def __init__(self, path=DEFAULT_STORE, timeout=60):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # autocommit mode; transactions that must be atomic are opened explicitly
+        self._connection = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._connection.executescript(_SCHEMA)
+        # stores created before train scores were recorded
+        if "train_scores" not in {row[1] for row in self._connection.execute("PRAGMA table_info(trials)")}:
+            self._connection.execute("ALTER TABLE trials ADD COLUMN train_scores TEXT")
+        # stores created when the pipeline and the folds were pickled: the
+        # pickles are never loaded, and the search is written again as JSON
+        # when it is next run (see `add_search`)
+        self._connection.execute("UPDATE searches SET estimator = '' WHERE typeof(estimator) = 'blob'")
+        self._lock = threading.Lock()
+
+    def close(self):
+        self._connection.close()
+
+    def _execute(self, sql, args=()):
+        with self._lock:
+            return self._connection.execute(sql, args).fetchall()
+
+    def add_search(self, key, data, estimator, splits, candidates):
+        """
+        Adds a search and its pending trials, unless the store already holds it.
+
+        The store keeps the fingerprint of the pipeline, which workers match
+        against their own pipeline, and the fold indices as JSON.
+
+        Returns
+        -------
+        bool
+            Whether the search was added; False if it is resumed.
+        """
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                folds = json.dumps([[np.asarray(train).tolist(), np.asarray(test).tolist()]
+                                    for train, test in splits])
+                if self._connection.execute("SELECT 1 FROM searches WHERE key = ?", (key,)).fetchall():
+                    self._connection.execute(
+                        "UPDATE searches SET estimator = ?, cv = ? WHERE key = ? AND estimator = ''",
+                        (estimator_fingerprint(estimator), folds, key))
+                    self._connection.execute("COMMIT")
+                    return False
+                self._connection.execute("INSERT INTO searches VALUES (?, ?, ?, ?, ?)",
+                                         (key, data, estimator_fingerprint(estimator), folds, time.time()))
+                self._connection.executemany(
+                    "INSERT INTO trials (search, id, params) VALUES (?, ?, ?)",
+                    [(key, i, json.dumps(params)) for i, params in enumerate(candidates)])
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        return True
+
+    def splits(self, key):
+        """Returns the (train, test) indices of the folds of a search."""
+        (cv,), = self._execute("SELECT cv FROM searches WHERE key = ?", (key,))
+        return [(np.array(train, dtype=np.intp), np.array(test, dtype=np.intp)) for train, test in json.loads(cv)]
+
+    def unfinished_searches(self, data, estimator, key=None):
+        """Returns the keys of the searches of the estimator on the data (or of search key) with trials left to run."""
+        rows = self._execute(
+            "SELECT DISTINCT s.key FROM searches s JOIN trials t ON t.search = s.key "
+            "WHERE s.data = ? AND s.estimator = ? AND t.status != 'done' AND (? IS NULL OR s.key = ?) "
+            "ORDER BY s.created",
+            (data, estimator_fingerprint(estimator), key, key))
+        return [row[0] for row in rows]
+
+    def claim(self, key, worker, lease_seconds):
+        """
+        Marks the next pending trial of a search, or a trial whose lease ran out, as running.
+
+        Returns
+        -------
+        tuple of (int, dict) or None
+            The trial id and parameters, or None if no trial can be claimed.
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._connection.execute(
+                    "SELECT id, params FROM trials WHERE search = ? AND "
+                    "(status = 'pending' OR (status = 'running' AND heartbeat < ?)) ORDER BY id LIMIT 1",
+                    (key, now - lease_seconds)).fetchall()
+                if rows:
+                    self._connection.execute(
+                        "UPDATE trials SET status = 'running', worker = ?, heartbeat = ? WHERE search = ? AND id = ?",
+                        (worker, now, key, rows[0][0]))
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        if not rows:
+            return None
+        trial_id, params = rows[0]
+        return trial_id, json.loads(params)
+
+    def renew(self, key, trial_id, worker):
+        """Renews the lease of a running trial."""
+        self._execute("UPDATE trials SET heartbeat = ? WHERE search = ? AND id = ? AND worker = ? "
+                      "AND status = 'running'", (time.time(), key, trial_id, worker))
+
+    def finish(self, key, trial_id, test_scores, train_scores, fit_times, score_times):
+        """Records the fold scores and times of a trial."""
+        self._execute(
+            "UPDATE trials SET status = 'done', test_scores = ?, train_scores = ?, fit_times = ?, score_times = ? "
+            "WHERE search = ? AND id = ? AND status != 'done'",
+            (json.dumps([None if np.isnan(s) else float(s) for s in test_scores]),
+             json.dumps([None if np.isnan(s) else float(s) for s in train_scores]),
+             json.dumps(list(map(float, fit_times))), json.dumps(list(map(float, score_times))), key, trial_id))
+
+    def status(self, key):
+        """Returns the number of trials of a search per status."""
+        return dict(self._execute("SELECT status, COUNT(*) FROM trials WHERE search = ? GROUP BY status", (key,)))
+
+    def results(self, key):
+        """Returns the parameters, fold test and train scores, fit times and score times of the trials of a search."""
+        rows = self._execute("SELECT params, test_scores, train_scores, fit_times, score_times FROM trials "
+                             "WHERE search = ? ORDER BY id", (key,))
+        params = [json.loads(row[0]) for row in rows]
+        scores, train_scores, fit_times, score_times = (
+            np.array([json.loads(row[i]) if row[i] is not None else [] for row in rows], dtype=float)
+            for i in (1, 2, 3, 4))
+        return params, scores, train_scores, fit_times, score_times
+
+
+class _Lease:
+    """Renews the lease of a trial in a background thread while the trial runs, for at most max_seconds."""
+
+    def __init__(self, store, key, trial_id, worker, lease_seconds, max_seconds):
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._renew,
+                                        args=(store, key, trial_id, worker, lease_seconds / 3, max_seconds),
+                                        daemon=True)
+
+    def _renew(self, store, key, trial_id, worker, interval, max_seconds):
+        deadline = time.monotonic() + max_seconds
+        while not self._stop.wait(interval) and time.monotonic() < deadline:
+            store.renew(key, trial_id, worker)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_worker(store_path, estimator, X, y, key=None, lease_seconds=60, poll_seconds=2,
+               max_trial_seconds=MAX_TRIAL_SECONDS):
+    """
+    Runs the trials of the searches of a pipeline on (X, y) in a trial store until none is left.
+
+    While the remaining trials are running in other workers, the worker
+    waits for them, and takes over the trials whose lease runs out. A
+    worker stops renewing a lease after max_trial_seconds, so a trial whose
+    worker hangs is taken over instead of being waited for forever. The
+    preprocessors fitted on each fold are cached in a temporary directory,
+    which is removed when the worker stops.
+
+    Parameters
+    ----------
+    store_path : str
+        Path of the trial store.
+    estimator : sklearn.pipeline.Pipeline
+        The unfitted pipeline the searches were started with; only the
+        searches whose pipeline has the same parameters are run.
+    X : pd.DataFrame or np.ndarray
+        The feature matrix the searches were started on.
+    y : pd.Series or np.ndarray
+        The target vector the searches were started on.
+    key : str or None, optional
+        Only run the trials of this search. None runs the trials of every
+        search of the pipeline on (X, y). Default is None.
+    lease_seconds : float, optional
+        Seconds without a lease renewal after which a running trial is
+        considered abandoned. Default is 60.
+    poll_seconds : float, optional
+        Seconds to wait before looking for trials again while the remaining
+        trials run in other workers. Default is 2.
+    max_trial_seconds : float, optional
+        Seconds after which this worker stops renewing the lease of its
+        trial; another worker may then run the trial again. Default is
+        MAX_TRIAL_SECONDS.
+
+    Returns
+    -------
+    int
+        The number of trials this worker ran.
+    """
+    worker = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    store = TrialStore(store_path)
+    data = data_fingerprint(X, y)
+    folds = {}
+    n_trials = 0
+    cache_dir = tempfile.mkdtemp(prefix="search_worker_")
+    try:
+        while True:
+            keys = store.unfinished_searches(data, estimator, key)
+            if not keys:
+                return n_trials
+            claimed = next(((search, trial) for search in keys
+                            if (trial := store.claim(search, worker, lease_seconds)) is not None), None)
+            if claimed is None:
+                time.sleep(poll_seconds)
+                continue
+
+            search, (trial_id, params) = claimed
+            if search not in folds:
+                folds[search] = store.splits(search)
+
+            with _Lease(store, search, trial_id, worker, lease_seconds, max_trial_seconds):
+                result = cross_validate(clone(estimator).set_params(memory=cache_dir, **params), X, y,
+                                        cv=folds[search], return_train_score=True, error_score=np.nan)
+            store.finish(search, trial_id, result["test_score"], result["train_score"], result["fit_time"],
+                         result["score_time"])
+            n_trials += 1
+    finally:
+        store.close()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+class DistributedSearchCV(ClassifierMixin, BaseEstimator):
+    """
+    Randomized search whose candidates are run by workers through a trial store.
+
+    Samples the same candidates as RandomizedSearchCV, adds them to the trial
+    store (or resumes them if the store already holds this search), runs
+    them in local worker processes alongside any remote workers, and refits
+    the original pipeline with the best parameters on all rows. The fitted
+    object exposes the usual search attributes (`cv_results_`,
+    `best_params_`, `best_score_`, `best_estimator_`) and predicts with the
+    refitted pipeline. `cv_results_` holds the train scores too, as with
+    RandomizedSearchCV(return_train_score=True).
+
+    Parameters
+    ----------
+    estimator : sklearn.pipeline.Pipeline
+        Preprocessor followed by the model steps.
+    param_distributions : dict
+        Distributions of the model steps' parameters.
+    store : str, optional
+        Path of the trial store. Default is DEFAULT_STORE.
+    n_iter : int, optional
+        Number of parameter candidates sampled. Default is 100.
+    cv : int or cross-validation splitter, optional
+        Folds, as in RandomizedSearchCV; they must not depend on a random
+        state that changes between runs. Default is 5.
+    random_state : int or None, optional
+        Seed of the parameter sampler. Default is None.
+    n_workers : int or None, optional
+        Number of local worker processes, as joblib's n_jobs. Default is
+        None (one).
+    lease_seconds : float, optional
+        See `run_worker`. Default is 60.
+    max_trial_seconds : float, optional
+        See `run_worker`. Default is MAX_TRIAL_SECONDS.
+    """
+
+    def __init__(self, estimator, param_distributions, store=DEFAULT_STORE, n_iter=100, cv=5,
+                 random_state=None, n_workers=None, lease_seconds=60, max_trial_seconds=MAX_TRIAL_SECONDS):
+        self.estimator = estimator
+        self.param_distributions = param_distributions
+        self.store = store
+        self.n_iter = n_iter
+        self.cv = cv
+        self.random_state = random_state
+        self.n_workers = n_workers
+        self.lease_seconds = lease_seconds
+        self.max_trial_seconds = max_trial_seconds
+
+    def fit(self, X, y):
+        """
+        Runs or resumes the search and refits the best pipeline on all rows.
+
+        Parameters
+        ----------
+        X : pd.DataFrame or np.ndarray
+            The feature matrix for training.
+        y : pd.Series or np.ndarray
+            The target vector for training.
+
+        Returns
+        -------
+        DistributedSearchCV
+            The fitted search.
+        """
+        check_array(X, dtype=None, ensure_all_finite=False)
+        check_consistent_length(X, y)
+        cv = check_cv(self.cv, np.asarray(y), classifier=True)
+        splits = list(cv.split(X, y))
+        candidates = [_json_params(params) for params in
+                      ParameterSampler(self.param_distributions, self.n_iter, random_state=self.random_state)]
+
+        data = data_fingerprint(X, y)
+        estimator = clone(self.estimator)
+        key = search_key(data, estimator, splits, candidates)
+
+        store = TrialStore(self.store)
+        try:
+            self.resumed_ = not store.add_search(key, data, estimator, splits, candidates)
+            n_workers = effective_n_jobs(self.n_workers)
+            self.worker_trials_ = Parallel(n_jobs=n_workers)(
+                delayed(run_worker)(self.store, estimator, X, y, key, self.lease_seconds,
+                                    max_trial_seconds=self.max_trial_seconds)
+                for _ in range(n_workers))
+            params, scores, train_scores, fit_times, score_times = store.results(key)
+        finally:
+            store.close()
+
+        mean_scores = scores.mean(axis=1)
+        results = {
+            "mean_fit_time": fit_times.mean(axis=1),
+            "std_fit_time": fit_times.std(axis=1),
+            "mean_score_time": score_times.mean(axis=1),
+            "std_score_time": score_times.std(axis=1),
+            "params": params,
+        }
+        for name in params[0]:
+            results[f"param_{name}"] = np.ma.MaskedArray([candidate[name] for candidate in params])
+        for split in range(scores.shape[1]):
+            results[f"split{split}_test_score"] = scores[:, split]
+        results["mean_test_score"] = mean_scores
+        results["std_test_score"] = scores.std(axis=1)
+        # failed candidates (NaN scores) rank last, as in RandomizedSearchCV
+        results["rank_test_score"] = rankdata(-np.nan_to_num(mean_scores, nan=-np.inf), method="min").astype(np.int32)
+        for split in range(train_scores.shape[1]):
+            results[f"split{split}_train_score"] = train_scores[:, split]
+        results["mean_train_score"] = train_scores.mean(axis=1)
+        results["std_train_score"] = train_scores.std(axis=1)
+
+        self.search_key_ = key
+        self.cv_results_ = results
+        self.n_splits_ = scores.shape[1]
+        self.best_index_ = int(results["rank_test_score"].argmin())
+        self.best_params_ = params[self.best_index_]
+        self.best_score_ = mean_scores[self.best_index_]
+
+        start = time.perf_counter()
+        self.best_estimator_ = clone(self.estimator).set_params(**self.best_params_).fit(X, y)
+        self.refit_time_ = time.perf_counter() - start
+        return self
+
+    @property
+    def classes_(self):
+        check_is_fitted(self, "best_estimator_")
+        return self.best_estimator_.classes_
+
+    def predict(self, X):
+        """Predicts with the refitted best pipeline."""
+        check_is_fitted(self, "best_estimator_")
+        return self.best_estimator_.predict(X)
+
+    def decision_function(self, X):
+        """Returns decision values of the refitted best pipeline."""
+        check_is_fitted(self, "best_estimator_")
+        return self.best_estimator_.decision_function(X)
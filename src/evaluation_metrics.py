@@ -0,0 +1,153 @@
+"""
+Model evaluation metrics module.
+
+This module contains functionality to evaluate a trained classifier from a
+single prediction pass. The predicted classes and decision scores of every
+row are computed once, and all score tables and plots (accuracy,
+classification report, confusion matrix, ROC and precision-recall curves)
+are derived from those cached arrays instead of re-running the model.
+"""
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from sklearn.metrics import (
+    ConfusionMatrixDisplay, PrecisionRecallDisplay, RocCurveDisplay,
+    accuracy_score, average_precision_score, classification_report, roc_auc_score
+)
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.batch_predict import predict_with_scores
+
+# Plot labels of the model families of src/model_registry.py
+MODEL_LABELS = {
+    "svc": "SVC",
+    "logistic_regression": "Logistic Regression",
+    "hist_gradient_boosting": "Histogram Gradient Boosting",
+}
+
+
+def evaluate_classifier(model, X, y):
+    """
+    Runs the model once over X and caches the arrays needed for evaluation.
+
+    Parameters
+    ----------
+    model : sklearn estimator
+        A fitted binary classifier with a `decision_function`.
+    X : pd.DataFrame
+        The feature matrix.
+    y : pd.Series or np.ndarray
+        The true labels.
+
+    Returns
+    -------
+    dict
+        'y_true', 'y_pred' and 'scores' arrays, and the 'pos_label' that
+        positive scores predict.
+    """
+    y_pred, scores = predict_with_scores(model, X)
+    return {
+        "y_true": np.asarray(y),
+        "y_pred": y_pred,
+        "scores": scores,
+        "pos_label": model.classes_[1],
+    }
+
+
+def score_table(evaluation):
+    """
+    Builds the score table from a cached evaluation.
+
+    Parameters
+    ----------
+    evaluation : dict
+        The output of `evaluate_classifier`.
+
+    Returns
+    -------
+    pd.DataFrame
+        'metric' and 'score' columns with accuracy, ROC AUC and average
+        precision, rounded to 4 decimals.
+    """
+    y_true, scores = evaluation["y_true"], evaluation["scores"]
+    y_binary = y_true == evaluation["pos_label"]
+    metrics = {"accuracy": accuracy_score(y_true, evaluation["y_pred"])}
+    # Ranking metrics are undefined when only one class is present
+    if 0 < y_binary.sum() < len(y_binary):
+        metrics["roc_auc"] = roc_auc_score(y_binary, scores)
+        metrics["average_precision"] = average_precision_score(y_binary, scores)
+
+    return pd.DataFrame({"metric": list(metrics), "score": [round(v, 4) for v in metrics.values()]})
+
+
+def classification_report_table(evaluation):
+    """
+    Builds the classification report table from a cached evaluation.
+
+    Parameters
+    ----------
+    evaluation : dict
+        The output of `evaluate_classifier`.
+
+    Returns
+    -------
+    pd.DataFrame
+        Per-class precision, recall, f1-score and support, rounded to 2
+        decimals.
+    """
+    report = classification_report(evaluation["y_true"], evaluation["y_pred"], output_dict=True)
+    return pd.DataFrame(report).T.round(2)
+
+
+def save_evaluation_plots(evaluation, plot_to, prefix, title, model="svc", curves=True):
+    """
+    Saves the confusion matrix and, optionally, ROC and precision-recall curves.
+
+    Parameters
+    ----------
+    evaluation : dict
+        The output of `evaluate_classifier`.
+    plot_to : str
+        Directory where the plots are saved.
+    prefix : str
+        File name prefix, e.g. 'test_svc' gives 'test_svc_confusion_matrix.png'.
+    title : str
+        Title prefix of the plots, e.g. 'Test Data'.
+    model : str, optional
+        Model family of the classifier, named in the titles and legends by
+        its MODEL_LABELS entry (or by the name itself). Default is 'svc'.
+    curves : bool, optional
+        Whether to also save the ROC and precision-recall curves. Default is True.
+
+    Returns
+    -------
+    list of str
+        Paths of the saved plots.
+    """
+    y_true, y_pred, scores = evaluation["y_true"], evaluation["y_pred"], evaluation["scores"]
+    label = MODEL_LABELS.get(model, model)
+    paths = []
+
+    ConfusionMatrixDisplay.from_predictions(y_true, y_pred, values_format="d")
+    plt.title(f"{title}: Confusion Matrix for {label} model")
+    paths.append(os.path.join(plot_to, f"{prefix}_confusion_matrix.png"))
+    plt.savefig(paths[-1])
+    plt.close()
+
+    if curves:
+        pos_label = evaluation["pos_label"]
+        RocCurveDisplay.from_predictions(y_true, scores, pos_label=pos_label, name=label)
+        plt.title(f"{title}: ROC Curve for {label} model")
+        paths.append(os.path.join(plot_to, f"{prefix}_roc_curve.png"))
+        plt.savefig(paths[-1])
+        plt.close()
+
+        PrecisionRecallDisplay.from_predictions(y_true, scores, pos_label=pos_label, name=label)
+        plt.title(f"{title}: Precision-Recall Curve for {label} model")
+        paths.append(os.path.join(plot_to, f"{prefix}_pr_curve.png"))
+        plt.savefig(paths[-1])
+        plt.close()
+
+    return paths
@@ -0,0 +1,463 @@
+"""
+Compiled NumPy predictor for the fitted preprocessor + SVC pipeline.
+
+This module contains functionality to compile a fitted pipeline (as built
+by scripts/preprocess.py and src/svc_models.py) into a predictor
+that evaluates the RBF decision function directly from raw feature
+columns, without dispatching through the ColumnTransformer, imputers,
+encoders and scaler on every call.
+
+The squared distance between a row and a support vector splits into one
+term per input column. For an encoded categorical column the term only
+depends on the row's category, so it is precomputed for every category
+and support vector: one-hot column c with category k contributes
+||s_c||^2 + 1 - 2 s_c[k] (||s_c||^2 for unknown categories), and an
+ordinal column contributes (k - s)^2. Prediction then gathers one table
+row per categorical column and adds the scaled numeric columns' distance
+from a small matrix product. Imputation is folded into the category
+lookup, and -gamma into the tables.
+
+The tables are compiled once per process from the described pipeline,
+unless the arrays already hold them: model artifacts store the compiled
+tables (see src/model_artifact.py), so worker processes that load the same
+artifact map the same table pages instead of each building a private copy.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Array keys of the compiled scoring table and weights (see `compile_tables`)
+TABLE_KEY = "fast_predictor.table"
+WEIGHTS_KEY = "fast_predictor.weights"
+
+
+def _fitted_imputer(step):
+    """Returns the fill values of a fitted SimpleImputer that imputes NaN."""
+    if not (isinstance(step.missing_values, float) and np.isnan(step.missing_values)):
+        raise ValueError("Only SimpleImputer with missing_values=np.nan is supported.")
+    return step.statistics_.tolist()
+
+
+def _column_spec(name, transformer, columns, arrays):
+    """Describes one fitted ColumnTransformer entry, adding its arrays."""
+    # sklearn is only needed to compile a pipeline, not to predict with it
+    from sklearn.impute import SimpleImputer
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+
+    columns = list(columns)
+    if transformer == "passthrough":
+        return {"kind": "passthrough", "columns": columns}
+
+    steps = list(transformer.named_steps.values()) if isinstance(transformer, Pipeline) else [transformer]
+    fill_values = None
+    if isinstance(steps[0], SimpleImputer) and len(steps) == 2:
+        fill_values = _fitted_imputer(steps[0])
+        steps = steps[1:]
+    if len(steps) != 1:
+        raise ValueError(f"Unsupported transformer '{name}': {transformer}")
+    encoder = steps[0]
+
+    if isinstance(encoder, OneHotEncoder):
+        if encoder.drop is not None or getattr(encoder, "infrequent_categories_", None) is not None:
+            raise ValueError(f"Unsupported OneHotEncoder in '{name}': drop and infrequent categories are not supported.")
+        return {"kind": "onehot", "columns": columns, "fill_values": fill_values,
+                "categories": [c.tolist() for c in encoder.categories_],
+                "handle_unknown": encoder.handle_unknown}
+    if isinstance(encoder, OrdinalEncoder):
+        return {"kind": "ordinal", "columns": columns, "fill_values": fill_values,
+                "categories": [c.tolist() for c in encoder.categories_],
+                "handle_unknown": encoder.handle_unknown,
+                "unknown_value": encoder.unknown_value}
+    if isinstance(encoder, StandardScaler) and fill_values is None:
+        n_columns = len(columns)
+        arrays[f"{name}.mean"] = np.zeros(n_columns) if encoder.mean_ is None else encoder.mean_
+        arrays[f"{name}.scale"] = np.ones(n_columns) if encoder.scale_ is None else encoder.scale_
+        return {"kind": "standard_scaler", "columns": columns,
+                "mean": f"{name}.mean", "scale": f"{name}.scale"}
+    raise ValueError(f"Unsupported transformer '{name}': {transformer}")
+
+
+def _dense(array):
+    """Returns a fitted array as a dense array; models fitted on sparse input store sparse ones."""
+    return array.toarray() if hasattr(array, "toarray") else np.asarray(array)
+
+
+def _model_spec(steps, arrays):
+    """Describes the fitted estimator steps after the preprocessor."""
+    from sklearn.kernel_approximation import Nystroem
+    from sklearn.linear_model import SGDClassifier
+    from sklearn.svm import SVC, LinearSVC
+
+    if len(steps) == 1 and isinstance(steps[0], SVC) and steps[0].kernel == "rbf":
+        svc = steps[0]
+        arrays["svc.support_vectors"] = _dense(svc.support_vectors_)
+        arrays["svc.dual_coef"] = _dense(svc.dual_coef_)[0]
+        return svc.classes_, {"kind": "rbf_svc", "gamma": float(svc._gamma),
+                              "intercept": float(svc.intercept_[0]),
+                              "support_vectors": "svc.support_vectors", "dual_coef": "svc.dual_coef"}
+    if (len(steps) == 2 and isinstance(steps[0], Nystroem) and steps[0].kernel == "rbf"
+            and (isinstance(steps[1], LinearSVC)
+                 or isinstance(steps[1], SGDClassifier) and steps[1].loss == "hinge")):
+        nystroem, linear_svc = steps
+        gamma = nystroem.gamma if nystroem.gamma is not None else 1.0 / nystroem.components_.shape[1]
+        arrays["nystroem.components"] = _dense(nystroem.components_)
+        arrays["nystroem.normalization"] = nystroem.normalization_
+        arrays["linearsvc.coef"] = linear_svc.coef_[0]
+        return linear_svc.classes_, {"kind": "nystroem_linear_svc", "gamma": float(gamma),
+                                     "intercept": float(linear_svc.intercept_[0]),
+                                     "components": "nystroem.components",
+                                     "normalization": "nystroem.normalization",
+                                     "coef": "linearsvc.coef"}
+    raise ValueError(f"Unsupported estimator steps: {steps}")
+
+
+def describe_pipeline(pipeline):
+    """
+    Extracts the fitted state of a pipeline as plain data and arrays.
+
+    Parameters
+    ----------
+    pipeline : sklearn.pipeline.Pipeline or fitted search object
+        A fitted ColumnTransformer + SVC (or Nystroem + LinearSVC) pipeline.
+        For a fitted hyperparameter search, its `best_estimator_` is used.
+
+    Returns
+    -------
+    spec : dict
+        JSON-serializable description: the classes, one entry per
+        preprocessor transformer and the model parameters. Arrays are
+        referenced by key.
+    arrays : dict of str to numpy.ndarray
+        The numeric arrays referenced by spec.
+
+    Raises
+    ------
+    ValueError
+        If the pipeline contains steps that cannot be represented, or is
+        not a binary classifier.
+    """
+    from sklearn.compose import ColumnTransformer
+
+    pipeline = getattr(pipeline, "best_estimator_", pipeline)
+    preprocessor, *model_steps = [step for _, step in pipeline.steps]
+    if not isinstance(preprocessor, ColumnTransformer):
+        raise ValueError("The first pipeline step must be a fitted ColumnTransformer.")
+
+    arrays = {}
+    columns = [_column_spec(name, transformer, cols, arrays)
+               for name, transformer, cols in preprocessor.transformers_
+               if transformer != "drop" and len(cols)]
+    classes, model = _model_spec(model_steps, arrays)
+    if len(classes) != 2:
+        raise ValueError(f"Only binary classifiers are supported, got classes {classes.tolist()}.")
+
+    spec = {"classes": classes.tolist(), "preprocessor": columns, "model": model}
+    return spec, {key: np.ascontiguousarray(array, dtype=np.float64) for key, array in arrays.items()}
+
+
+def compile_pipeline(pipeline):
+    """
+    Compiles a fitted pipeline into a `FastPredictor`.
+
+    Parameters
+    ----------
+    pipeline : sklearn.pipeline.Pipeline or fitted search object
+        See `describe_pipeline`.
+
+    Returns
+    -------
+    FastPredictor
+        The compiled predictor.
+    """
+    return FastPredictor(*describe_pipeline(pipeline))
+
+
+def _has_unknown_row(block):
+    """Whether an encoded block has a table row for unknown categories."""
+    if block["kind"] == "onehot":
+        return block["handle_unknown"] == "ignore"
+    return block["handle_unknown"] == "use_encoded_value" and not np.isnan(block["unknown_value"])
+
+
+def compile_tables(spec, arrays):
+    """
+    Precomputes the scoring table and weights of a `FastPredictor`.
+
+    Parameters
+    ----------
+    spec : dict
+        Pipeline description from `describe_pipeline`.
+    arrays : dict of str to numpy.ndarray
+        The arrays referenced by spec.
+
+    Returns
+    -------
+    table : numpy.ndarray
+        Float64 matrix with one column per support vector (or Nystroem
+        component), laid out as described in `FastPredictor`.
+    weights : numpy.ndarray
+        Float64 weight of each column's kernel value in the decision score.
+    """
+    model = spec["model"]
+    gamma = model["gamma"]
+    if model["kind"] == "rbf_svc":
+        landmarks = np.asarray(arrays[model["support_vectors"]])
+        weights = np.array(arrays[model["dual_coef"]], dtype=np.float64)
+    else:
+        # linear model on the Nystroem features: (K @ N.T) @ coef == K @ (N.T @ coef)
+        landmarks = np.asarray(arrays[model["components"]])
+        weights = arrays[model["normalization"]].T @ arrays[model["coef"]]
+
+    table_rows, numeric_landmarks = [], []
+    offset = 0
+    for block in spec["preprocessor"]:
+        if block["kind"] == "onehot":
+            for categories in block["categories"]:
+                landmark_block = landmarks[:, offset:offset + len(categories)]
+                norms = np.einsum("ij,ij->i", landmark_block, landmark_block)
+                table_rows.append(norms + 1 - 2 * landmark_block.T)
+                if _has_unknown_row(block):
+                    table_rows.append(norms[np.newaxis])
+                offset += len(categories)
+        elif block["kind"] == "ordinal":
+            for categories in block["categories"]:
+                landmark_col = landmarks[:, offset]
+                table_rows.append((np.arange(len(categories))[:, np.newaxis] - landmark_col) ** 2)
+                if _has_unknown_row(block):
+                    table_rows.append(((block["unknown_value"] - landmark_col) ** 2)[np.newaxis])
+                offset += 1
+        else:
+            width = len(block["columns"])
+            numeric_landmarks.append(landmarks[:, offset:offset + width])
+            offset += width
+    numeric_landmarks = np.hstack(numeric_landmarks) if numeric_landmarks else np.zeros((len(landmarks), 0))
+
+    # -gamma * ||z - s||^2 = (2 gamma s) . z - gamma * ||z||^2 - gamma * ||s||^2
+    table = -gamma * np.vstack(table_rows) if table_rows else np.zeros((0, len(landmarks)))
+    table = np.ascontiguousarray(np.vstack([
+        table,
+        2 * gamma * numeric_landmarks.T,
+        np.full((1, len(landmarks)), -gamma),
+        -gamma * np.einsum("ij,ij->i", numeric_landmarks, numeric_landmarks)[np.newaxis],
+    ]))
+    return table, np.ascontiguousarray(weights, dtype=np.float64)
+
+
+class _CategoricalColumn:
+    """Category lookup of one encoded column into the rows of the table."""
+
+    # above this many rows pandas' hash lookup beats a Python dict lookup
+    INDEXER_MIN_ROWS = 64
+
+    def __init__(self, name, categories, fill_value, offset, has_unknown_row):
+        self.name = name
+        self.index = pd.Index(categories)
+        self.lookup = {category: offset + code for code, category in enumerate(categories)}
+        self.offset = offset
+        self.fill_row = self.lookup.get(fill_value) if fill_value is not None else None
+        self.unknown_row = offset + len(categories) if has_unknown_row else None
+        self.n_rows = len(categories) + has_unknown_row
+
+    def rows(self, values):
+        """Maps an object array of raw values to table rows."""
+        if len(values) > self.INDEXER_MIN_ROWS:
+            rows = self.index.get_indexer(values)
+            rows[rows >= 0] += self.offset
+        else:
+            rows = np.fromiter((self.lookup.get(value, -1) for value in values), dtype=np.intp, count=len(values))
+        if self.fill_row is not None:
+            rows[pd.isna(values)] = self.fill_row
+        unknown = rows < 0
+        if unknown.any():
+            if self.unknown_row is None:
+                raise ValueError(f"Found unknown categories {sorted(set(values[unknown].tolist()), key=str)} "
+                                 f"in column '{self.name}' during transform")
+            rows[unknown] = self.unknown_row
+        return rows
+
+    def row(self, value):
+        """Maps one raw value to its table row."""
+        if self.fill_row is not None and pd.isna(value):
+            return self.fill_row
+        row = self.lookup.get(value)
+        if row is None:
+            if self.unknown_row is None:
+                raise ValueError(f"Found unknown categories [{value!r}] in column '{self.name}' during transform")
+            return self.unknown_row
+        return row
+
+
+class FastPredictor:
+    """
+    Compiled RBF SVM predictor working on raw feature columns.
+
+    Mirrors the prediction interface of the compiled pipeline:
+    `decision_function`, `predict` and `classes_`, taking a DataFrame with
+    the raw feature columns. `decision_record` and `predict_record` score a
+    single record given as a dict without building a DataFrame.
+
+    All precomputed terms are stacked into one table with a row per
+    category of every categorical column, a row per numeric column
+    (2 gamma s), a row multiplying ||z||^2 (-gamma) and a constant row
+    (-gamma ||s||^2). A batch is scored with one matrix product of its
+    design matrix (a one for each row's category, the scaled numeric values,
+    ||z||^2 and 1) with the table, giving -gamma times the squared distances
+    to all support vectors; a single record just adds up table rows.
+
+    If arrays hold the table and weights under TABLE_KEY and WEIGHTS_KEY,
+    they are used without copying; otherwise `compile_tables` builds them,
+    which costs one private table per process.
+
+    Parameters
+    ----------
+    spec : dict
+        Pipeline description from `describe_pipeline`.
+    arrays : dict of str to numpy.ndarray
+        The arrays referenced by spec.
+    batch_size : int, optional
+        Rows evaluated at a time, bounding the temporary
+        rows x support vectors matrices. Default is 1024.
+    """
+
+    def __init__(self, spec, arrays, batch_size=1024):
+        self.spec = spec
+        self.batch_size = batch_size
+        self.classes_ = np.asarray(spec["classes"])
+        self.feature_names_in_ = [col for block in spec["preprocessor"] for col in block["columns"]]
+        self._intercept = spec["model"]["intercept"]
+
+        self._categorical = []
+        numeric_cols, means, scales = [], [], []
+        for block in spec["preprocessor"]:
+            fill_values = block.get("fill_values") or [None] * len(block["columns"])
+            if block["kind"] in ("onehot", "ordinal"):
+                for col, categories, fill_value in zip(block["columns"], block["categories"], fill_values):
+                    self._add_categorical(col, categories, fill_value, _has_unknown_row(block))
+            else:
+                width = len(block["columns"])
+                numeric_cols += block["columns"]
+                if block["kind"] == "standard_scaler":
+                    means.append(arrays[block["mean"]])
+                    scales.append(arrays[block["scale"]])
+                else:
+                    means.append(np.zeros(width))
+                    scales.append(np.ones(width))
+
+        self._numeric_cols = numeric_cols
+        self._mean = np.concatenate(means) if means else np.zeros(0)
+        self._scale = np.concatenate(scales) if scales else np.ones(0)
+        self._n_codes = sum(column.n_rows for column in self._categorical)
+
+        # Tables compiled at export are used as they are (memory-mapped by
+        # `load_artifact`); otherwise they are compiled here
+        if TABLE_KEY in arrays and WEIGHTS_KEY in arrays:
+            self._table, self._weights = arrays[TABLE_KEY], arrays[WEIGHTS_KEY]
+        else:
+            self._table, self._weights = compile_tables(spec, arrays)
+
+    def _add_categorical(self, col, categories, fill_value, has_unknown_row):
+        """Registers a categorical column whose table rows come next."""
+        offset = sum(column.n_rows for column in self._categorical)
+        self._categorical.append(_CategoricalColumn(col, categories, fill_value, offset, has_unknown_row))
+
+    def _scores(self, exponent):
+        """Turns -gamma * squared distances into decision scores."""
+        # distances are non-negative; rounding can make them slightly negative
+        np.minimum(exponent, 0, out=exponent)
+        return np.exp(exponent, out=exponent) @ self._weights + self._intercept
+
+    def decision_function(self, X):
+        """
+        Computes the SVM decision score of each row of X.
+
+        Parameters
+        ----------
+        X : pd.DataFrame
+            Rows with the raw feature columns.
+
+        Returns
+        -------
+        numpy.ndarray
+            Decision scores; positive scores predict `classes_[1]`.
+        """
+        missing_cols = [col for col in self.feature_names_in_ if col not in X.columns]
+        if missing_cols:
+            raise ValueError(f"Input is missing required columns: {missing_cols}")
+
+        rows = np.column_stack([column.rows(X[column.name].to_numpy(dtype=object))
+                                for column in self._categorical] or [np.zeros((len(X), 0), dtype=np.intp)])
+        z = (X[self._numeric_cols].to_numpy(dtype=np.float64) - self._mean) / self._scale
+        if np.isnan(z).any():
+            raise ValueError("Input X contains NaN.")
+
+        n_numeric = len(self._numeric_cols)
+        scores = np.empty(len(X))
+        for start in range(0, len(X), self.batch_size):
+            stop = min(start + self.batch_size, len(X))
+            design = np.zeros((stop - start, len(self._table)))
+            design[np.arange(stop - start)[:, np.newaxis], rows[start:stop]] = 1.0
+            design[:, self._n_codes:self._n_codes + n_numeric] = z[start:stop]
+            design[:, -2] = np.einsum("ij,ij->i", z[start:stop], z[start:stop])
+            design[:, -1] = 1.0
+            scores[start:stop] = self._scores(design @ self._table)
+        return scores
+
+    def predict(self, X):
+        """
+        Predicts the class of each row of X.
+
+        Parameters
+        ----------
+        X : pd.DataFrame
+            Rows with the raw feature columns.
+
+        Returns
+        -------
+        numpy.ndarray
+            Predicted classes.
+        """
+        return self.classes_[(self.decision_function(X) > 0).astype(int)]
+
+    def decision_record(self, record):
+        """
+        Computes the SVM decision score of a single record.
+
+        Parameters
+        ----------
+        record : dict
+            Raw feature values keyed by column name. Missing keys are
+            treated as missing values.
+
+        Returns
+        -------
+        float
+            The decision score.
+        """
+        z = (np.array([record.get(col) for col in self._numeric_cols], dtype=np.float64) - self._mean) / self._scale
+        if np.isnan(z).any():
+            raise ValueError("Input X contains NaN.")
+        table = self._table
+        exponent = z @ table[self._n_codes:self._n_codes + len(z)]
+        exponent += (z @ z) * table[-2]
+        exponent += table[-1]
+        for column in self._categorical:
+            exponent += table[column.row(record.get(column.name))]
+        return float(self._scores(exponent))
+
+    def predict_record(self, record):
+        """
+        Predicts the class of a single record.
+
+        Parameters
+        ----------
+        record : dict
+            Raw feature values keyed by column name. Missing keys are
+            treated as missing values.
+
+        Returns
+        -------
+        object
+            The predicted class.
+        """
+        return self.classes_[int(self.decision_record(record) > 0)]
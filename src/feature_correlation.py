@@ -2,27 +2,99 @@
 Feature correlation validation module.
 
 This module provides functionality to validate the integrity of the training data
-using the Deepchecks library. It specifically checks for excessive correlations
+using the Deepchecks checks. It specifically checks for excessive correlations
 between features and the target label, as well as multicollinearity among features,
-to ensure dataset quality before model training.
+to ensure dataset quality before model training. The checks run on the native
+NumPy engine of `src.correlation_engine` by default, or on Deepchecks itself
+with `engine='deepchecks'`; both apply the same thresholds. Passed checks can be
+recorded in a `src.validation_cache.ValidationCache`, so that a check that
+already passed on identical data (e.g. in the preprocessing step) is not run
+again.
 
 Author: Godsgift Braimah
 Date: 2025-12-01
 """
 
+import os
+import sys
+import time
 import pandas as pd
-from deepchecks.tabular import Dataset
-from deepchecks.tabular.checks import FeatureLabelCorrelation, FeatureFeatureCorrelation
 import warnings
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.correlation_engine import feature_feature_correlation, pairs_above_threshold, predictive_power_scores
+from src.validation_cache import dataset_fingerprint
 
 warnings.filterwarnings("ignore", category=FutureWarning)
 warnings.filterwarnings("ignore", category=UserWarning)
 
-def feature_corr(df, target_col):
+CAT_FEATURES = ['job', 'marital', 'education', 'default', 'housing', 'loan', 'contact', 'month', 'pdays_contacted']
+
+# Maximum predictive power score of a feature for the label
+MAX_FEATURE_PPS = 0.9
+# Maximum correlation of a pair of features
+MAX_FEATURE_CORRELATION = 0.92
+# Engines computing the correlation checks
+CORRELATION_ENGINES = ['native', 'deepchecks']
+
+_LABEL_FAILURE = "Feature-Label correlation exceeds the maximum acceptable threshold."
+_FEATURE_FAILURE = "Feature-feature correlation exceeds the maximum acceptable threshold."
+
+
+def _deepchecks_checks(target_col, base_config):
+    """Returns the configuration, check function and failure message of each Deepchecks check."""
+    from deepchecks import __version__ as deepchecks_version
+    from deepchecks.tabular import Dataset
+    from deepchecks.tabular.checks import FeatureLabelCorrelation, FeatureFeatureCorrelation
+
+    base_config = {**base_config, "deepchecks": deepchecks_version}
+    datasets = {}
+
+    def passes(check):
+        def run(df):
+            if "ds" not in datasets:
+                # Initialize Deepchecks Dataset
+                datasets["ds"] = Dataset(df, label=target_col, cat_features=CAT_FEATURES)
+            return check.run(dataset=datasets["ds"]).passed_conditions()
+        return run
+
+    return [
+        ({"check": "FeatureLabelCorrelation", "condition": "feature_pps_less_than",
+          "threshold": MAX_FEATURE_PPS, **base_config},
+         passes(FeatureLabelCorrelation().add_condition_feature_pps_less_than(MAX_FEATURE_PPS)),
+         _LABEL_FAILURE),
+        ({"check": "FeatureFeatureCorrelation", "condition": "max_number_of_pairs_above_threshold",
+          "threshold": MAX_FEATURE_CORRELATION, "n_pairs": 0, **base_config},
+         passes(FeatureFeatureCorrelation().add_condition_max_number_of_pairs_above_threshold(
+             threshold=MAX_FEATURE_CORRELATION, n_pairs=0)),
+         _FEATURE_FAILURE),
+    ]
+
+
+def _correlation_checks(target_col, engine="native", n_jobs=1):
+    """Returns the configuration, check function and failure message of each correlation check."""
+    if engine not in CORRELATION_ENGINES:
+        raise ValueError(f"Unknown correlation engine {engine!r}; expected one of {CORRELATION_ENGINES}.")
+    base_config = {"label": target_col, "cat_features": CAT_FEATURES, "engine": engine}
+    if engine == "deepchecks":
+        return _deepchecks_checks(target_col, base_config)
+    return [
+        ({"check": "FeatureLabelCorrelation", "condition": "feature_pps_less_than",
+          "threshold": MAX_FEATURE_PPS, **base_config},
+         lambda df: bool((predictive_power_scores(df, target_col, n_jobs=n_jobs) < MAX_FEATURE_PPS).all()),
+         _LABEL_FAILURE),
+        ({"check": "FeatureFeatureCorrelation", "condition": "max_number_of_pairs_above_threshold",
+          "threshold": MAX_FEATURE_CORRELATION, "n_pairs": 0, **base_config},
+         lambda df: len(pairs_above_threshold(feature_feature_correlation(df, target_col, CAT_FEATURES),
+                                              MAX_FEATURE_CORRELATION)) <= 0,
+         _FEATURE_FAILURE),
+    ]
+
+
+def feature_corr(df, target_col, cache=None, engine="native", n_jobs=1):
     """
     Runs Deepchecks validation for feature-label and feature-feature correlations.
 
-    This function converts the input DataFrame into a Deepchecks Dataset, explicitly
+    This function computes the Deepchecks correlation statistics, explicitly
     defining categorical features. It then validates two conditions:
     1. The Predictive Power Score (PPS) between any feature and the label must be < 0.9.
     2. The correlation between any pair of features must be < 0.92.
@@ -33,6 +105,16 @@ def feature_corr(df, target_col):
         The training DataFrame containing features and the target.
     target_col : str
         The name of the target column.
+    cache : ValidationCache or None, optional
+        Cache of passed checks. Checks that already passed on data with the
+        same content are skipped, and checks that pass are recorded.
+        Default is None (run all checks, record nothing).
+    engine : str, optional
+        'native' to compute the statistics with `src.correlation_engine`, or
+        'deepchecks' to run the Deepchecks checks. Default is 'native'.
+    n_jobs : int, optional
+        Number of parallel workers computing the predictive power scores of
+        the native engine. Default is 1.
     
     Returns
     -------
@@ -42,31 +124,36 @@ def feature_corr(df, target_col):
     Raises
     ------
     ValueError
-        If the Feature-Label correlation or Feature-Feature correlation
-        exceeds the maximum acceptable thresholds.
+        If the data is empty or lacks the target column, the engine is
+        unknown, or the Feature-Label correlation or Feature-Feature
+        correlation exceeds the maximum acceptable thresholds.
     """
     # Pass input as a DataFrame
     if not isinstance(df, pd.DataFrame):
         raise TypeError("Input must be a pandas DataFrame, but got a " + str(type(df)))
     
-    # Initialize Deepchecks Dataset
-    ds = Dataset(df, label=target_col, cat_features=['job', 'marital', 'education', 'default', 'housing', 'loan', 'contact', 'month', 'pdays_contacted'])
-
-    # Check feature-label correlations
-    check_feat_lab = FeatureLabelCorrelation().add_condition_feature_pps_less_than(0.9)
-    result_feat_lab = check_feat_lab.run(dataset=ds)
+    if df.empty:
+        raise ValueError("Input DataFrame is empty.")
+    if target_col not in df.columns:
+        raise ValueError(f"Target column '{target_col}' is not in the DataFrame.")
 
-    # Check feature-feature correlations
-    check_feat_feat = FeatureFeatureCorrelation().add_condition_max_number_of_pairs_above_threshold(
-        threshold=0.92, n_pairs=0
-    )
-    result_feat_feat = check_feat_feat.run(dataset=ds)
+    checks = _correlation_checks(target_col, engine=engine, n_jobs=n_jobs)
+    fingerprint = dataset_fingerprint(df) if cache is not None else None
+    failures = []
 
-    if not result_feat_lab.passed_conditions():
-        raise ValueError("Feature-Label correlation exceeds the maximum acceptable threshold.")
+    # Check feature-label and feature-feature correlations
+    for config, passes, failure in checks:
+        if cache is not None and cache.lookup(fingerprint, config) is not None:
+            print(f"{config['check']} already passed on this data; skipped.")
+            continue
+        start = time.perf_counter()
+        if not passes(df):
+            failures.append(failure)
+        elif cache is not None:
+            cache.record(fingerprint, config, len(df), time.perf_counter() - start)
 
-    if not result_feat_feat.passed_conditions():
-        raise ValueError("Feature-feature correlation exceeds the maximum acceptable threshold.")
+    if failures:
+        raise ValueError(failures[0])
     
     print("Data validation checks passed.")
 
@@ -0,0 +1,264 @@
+"""
+Feature engineering for raw bank marketing records.
+
+This module contains the `FeatureEngineer` transformer, which turns raw
+records (as downloaded from UCI, or as sent to the inference server) into
+the feature columns expected by the fitted preprocessor: it derives
+`pdays_contacted` from `pdays`, drops the columns that are not used by the
+model and stores the categorical columns as pandas categoricals. It is
+fitted on the training data and reused for the test data and for serving.
+`engineer_features` and `encode_target` are the function forms used by the
+pipeline scripts.
+
+Every step is a vectorized column operation, so the cost is linear in the
+number of rows, and the output is assembled in one projection without
+copying the numeric columns or modifying the input.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Raw columns that are not model features: poutcome has 83% missing values.
+DROP_COLS = ['day_of_week', 'pdays', 'poutcome']
+
+# Raw categorical feature columns, stored as pandas categoricals
+CATEGORICAL_COLS = ['job', 'marital', 'education', 'default', 'housing', 'loan', 'contact', 'month']
+
+# Raw target column and its classes, in the order of their encoded values
+TARGET_COL = 'y'
+TARGET_CLASSES = ['no', 'yes']
+
+# Categories of the derived pdays_contacted feature: 'never' for pdays == -1
+PDAYS_CATEGORIES = ['never', 'contacted']
+_PDAYS_DTYPE = pd.CategoricalDtype(PDAYS_CATEGORIES)
+
+
+def _check_pdays(raw_df):
+    """Raises a ValueError if raw_df has no 'pdays' column."""
+    if 'pdays' not in raw_df.columns:
+        raise ValueError("Raw data is missing required column 'pdays'.")
+
+
+# below this many rows a Python dict lookup beats pandas' hash lookup
+_INDEXER_MIN_ROWS = 64
+
+
+def _category_codes(values, dtype, lookup):
+    """Maps an object array to the category codes of dtype, -1 if not a category."""
+    if len(values) < _INDEXER_MIN_ROWS:
+        return np.fromiter((lookup.get(value, -1) for value in values), dtype=np.intp, count=len(values))
+    return dtype.categories.get_indexer(values)
+
+
+def _categorize(column, dtype, lookup):
+    """Converts a column to a categorical of the given dtype, adding any unseen values as categories."""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        # recode the categories, then take the new code of every value
+        categories = column.cat.categories.to_numpy(dtype=object)
+        category_codes = _category_codes(categories, dtype, lookup)
+        unseen = category_codes == -1
+        if unseen.any():
+            category_codes[unseen] = len(dtype.categories) + np.arange(unseen.sum())
+            dtype = pd.CategoricalDtype([*dtype.categories, *categories[unseen]])
+        codes = np.append(category_codes, -1)[column.cat.codes.to_numpy()]
+        return pd.Categorical.from_codes(codes, dtype=dtype, validate=False)
+
+    values = column.to_numpy(dtype=object)
+    codes = _category_codes(values, dtype, lookup)
+    missed = codes == -1
+    if missed.any():
+        unseen = [value for value in pd.unique(values[missed]) if not pd.isna(value)]
+        if unseen:
+            dtype = pd.CategoricalDtype([*dtype.categories, *unseen])
+            codes = dtype.categories.get_indexer(values)
+    return pd.Categorical.from_codes(codes, dtype=dtype, validate=False)
+
+
+class FeatureEngineer:
+    """
+    Transformer deriving the model features from raw bank marketing records.
+
+    Follows the scikit-learn transformer interface (`fit`, `transform`,
+    `fit_transform`, `get_feature_names_out`) without depending on
+    scikit-learn, so it can be used by the inference server.
+
+    `transform` returns the raw columns except DROP_COLS and the target, in
+    input order, followed by `pdays_contacted` ('never' if pdays is -1,
+    else 'contacted'). CATEGORICAL_COLS and `pdays_contacted` are pandas
+    categoricals. The categories of CATEGORICAL_COLS are those learned by
+    `fit`; values not seen in fit are kept and added as extra categories,
+    so they are handled by the downstream encoders exactly as before.
+
+    Parameters
+    ----------
+    categories : dict of str to list or None, optional
+        Categories of each categorical column. Columns not given are learned
+        from the data in `fit`. Default is None (learn all).
+
+    Attributes
+    ----------
+    categories_ : dict of str to list
+        Categories of each categorical column present in the fitted data.
+    feature_names_in_ : numpy.ndarray
+        Columns of the fitted data.
+    """
+
+    def __init__(self, categories=None):
+        self.categories = categories
+
+    def fit(self, X, y=None):
+        """
+        Learns the categories of the categorical columns.
+
+        Parameters
+        ----------
+        X : pandas.DataFrame
+            Raw records. Must contain a 'pdays' column.
+        y : None
+            Ignored.
+
+        Returns
+        -------
+        FeatureEngineer
+            The fitted transformer.
+
+        Raises
+        ------
+        ValueError
+            If X has no 'pdays' column.
+        """
+        _check_pdays(X)
+        given = self.categories or {}
+        self.categories_ = {
+            col: list(given[col]) if col in given
+            else sorted((value for value in pd.unique(X[col]) if not pd.isna(value)), key=str)
+            for col in CATEGORICAL_COLS if col in X.columns
+        }
+        self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        self._dtypes = {col: pd.CategoricalDtype(categories) for col, categories in self.categories_.items()}
+        self._lookups = {col: {category: code for code, category in enumerate(categories)}
+                         for col, categories in self.categories_.items()}
+        return self
+
+    def transform(self, X):
+        """
+        Derives the model features from raw records.
+
+        Parameters
+        ----------
+        X : pandas.DataFrame
+            Raw records. Must contain a 'pdays' column; the target and
+            DROP_COLS are dropped if present.
+
+        Returns
+        -------
+        pandas.DataFrame
+            A new dataframe with the feature columns. X is not modified.
+
+        Raises
+        ------
+        ValueError
+            If the transformer is not fitted, or X has no 'pdays' column.
+        """
+        if not hasattr(self, "categories_"):
+            raise ValueError("This FeatureEngineer instance is not fitted yet. Call 'fit' first.")
+        _check_pdays(X)
+
+        columns = {}
+        for col in X.columns:
+            if col in DROP_COLS or col == TARGET_COL:
+                continue
+            if col in self._dtypes:
+                columns[col] = _categorize(X[col], self._dtypes[col], self._lookups[col])
+            else:
+                columns[col] = X[col]
+        # client was contacted in a previous campaign unless pdays is -1
+        contacted = (X['pdays'].to_numpy() != -1).astype(np.int8)
+        columns['pdays_contacted'] = pd.Categorical.from_codes(contacted, dtype=_PDAYS_DTYPE, validate=False)
+
+        return pd.DataFrame(columns, index=X.index, copy=False)
+
+    def fit_transform(self, X, y=None):
+        """
+        Fits the transformer on X and transforms X.
+
+        Parameters
+        ----------
+        X : pandas.DataFrame
+            Raw records, as for `fit`.
+        y : None
+            Ignored.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The feature columns, as for `transform`.
+        """
+        return self.fit(X).transform(X)
+
+    def get_feature_names_out(self, input_features=None):
+        """
+        Returns the names of the output columns.
+
+        Parameters
+        ----------
+        input_features : array-like of str or None, optional
+            Input columns. Default is None (the fitted columns).
+
+        Returns
+        -------
+        numpy.ndarray
+            The output column names.
+        """
+        if input_features is None:
+            input_features = self.feature_names_in_
+        names = [col for col in input_features if col not in DROP_COLS and col != TARGET_COL]
+        return np.asarray(names + ['pdays_contacted'], dtype=object)
+
+
+def engineer_features(raw_df, engineer=None):
+    """
+    Derives the model features from raw bank marketing records.
+
+    Parameters
+    ----------
+    raw_df : pandas.DataFrame
+        Raw records. Must contain a 'pdays' column; 'y', 'day_of_week' and
+        'poutcome' are dropped if present.
+    engineer : FeatureEngineer or None, optional
+        A fitted transformer. Default is None, which fits one on raw_df.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A new dataframe with the feature columns. raw_df is not modified.
+
+    Raises
+    ------
+    ValueError
+        If raw_df has no 'pdays' column.
+    """
+    if engineer is None:
+        engineer = FeatureEngineer().fit(raw_df)
+    return engineer.transform(raw_df)
+
+
+def encode_target(y):
+    """
+    Encodes the raw target as 0 ('no') and 1 ('yes').
+
+    Parameters
+    ----------
+    y : pandas.Series
+        The raw target column.
+
+    Returns
+    -------
+    pandas.Series
+        The encoded target, with the index and name of y. Integer if every
+        value is 'no' or 'yes', else float with NaN for the other values.
+    """
+    codes = pd.Categorical(y, categories=TARGET_CLASSES).codes
+    if (codes == -1).any():
+        return pd.Series(np.where(codes == -1, np.nan, codes), index=y.index, name=y.name)
+    return pd.Series(codes.astype(np.int64), index=y.index, name=y.name)
@@ -0,0 +1,212 @@
+"""
+Out-of-core incremental training for the term deposit classifier.
+
+This module contains functionality to train a linear SVM on Nystroem RBF
+features (as the 'approx' mode of src/svc_models.py) with stochastic
+gradient descent on the hinge loss, one chunk of rows at a time. Training
+files of any size are streamed through the preprocessor in chunks, so
+memory stays bounded by the chunk size, and a model can be updated with new
+campaign data without refitting it from scratch.
+
+The preprocessor and the Nystroem feature map are fitted on the first chunk
+ever seen and then kept fixed, so every later chunk is encoded the same way
+and only the linear model is updated. The first chunk should therefore be
+large enough to contain every category.
+
+The training state is saved to a checkpoint after every chunk: the fitted
+pipeline, the number of rows trained on, and the number of rows consumed
+from every training file, keyed by a hash of the file content. Training on
+a file that was interrupted resumes after its last consumed chunk, and a
+file that was already trained on is not trained on twice.
+"""
+
+import os
+import pickle
+import sys
+import numpy as np
+from sklearn.base import clone
+from sklearn.kernel_approximation import Nystroem
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import make_pipeline
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.pipeline_runner import file_digest
+from src.svc_models import NYSTROEM_COMPONENTS
+from src.read_data import iter_data_chunks
+
+# Encoded target classes; every chunk is trained with both, even if it only contains one
+CLASSES = np.array([0, 1])
+
+
+def build_incremental_pipeline(preprocessor, seed, gamma=None, alpha=1e-4):
+    """
+    Builds the incremental linear SVM pipeline.
+
+    Parameters
+    ----------
+    preprocessor : sklearn
+        The preprocessor object to apply before the model. It is cloned and
+        fitted on the first chunk of training data.
+    seed : int
+        Random seed for reproducibility.
+    gamma : float or None, optional
+        RBF kernel coefficient of the Nystroem feature map. None uses
+        1 / n_features. Default is None.
+    alpha : float, optional
+        Regularization strength of the linear SVM. Default is 1e-4.
+
+    Returns
+    -------
+    sklearn.pipeline.Pipeline
+        The unfitted preprocessor + Nystroem + SGDClassifier pipeline.
+    """
+    return make_pipeline(
+        clone(preprocessor),
+        Nystroem(kernel="rbf", gamma=gamma, n_components=NYSTROEM_COMPONENTS, random_state=seed),
+        SGDClassifier(loss="hinge", alpha=alpha, random_state=seed)
+    )
+
+
+def partial_fit_pipeline(pipe, X, y):
+    """
+    Updates the incremental pipeline with one chunk of rows.
+
+    On the first call, the preprocessor and the Nystroem feature map are
+    fitted on X. Every call runs one SGD epoch of the linear SVM over X.
+
+    Parameters
+    ----------
+    pipe : sklearn.pipeline.Pipeline
+        A pipeline built by `build_incremental_pipeline`.
+    X : pd.DataFrame
+        The feature matrix of the chunk.
+    y : pd.Series or np.ndarray
+        The encoded target vector of the chunk.
+
+    Returns
+    -------
+    sklearn.pipeline.Pipeline
+        The updated pipeline.
+    """
+    preprocessor, feature_map, model = (step for _, step in pipe.steps)
+    if not hasattr(model, "coef_"):
+        feature_map.fit(preprocessor.fit_transform(X, y))
+    model.partial_fit(feature_map.transform(preprocessor.transform(X)), np.asarray(y), classes=CLASSES)
+    return pipe
+
+
+def save_checkpoint(state, path):
+    """
+    Writes a training state to a checkpoint file.
+
+    The checkpoint is written to a temporary file that then replaces the
+    previous one, so an interruption never leaves a partial checkpoint.
+
+    Parameters
+    ----------
+    state : dict
+        The training state, as returned by `train_incremental`.
+    path : str
+        Path of the checkpoint file.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path):
+    """
+    Reads a training state from a checkpoint file.
+
+    Parameters
+    ----------
+    path : str
+        Path of the checkpoint file.
+
+    Returns
+    -------
+    dict
+        The training state, with the keys 'pipeline', 'n_rows' and 'sources'.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the checkpoint file does not exist.
+    """
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"Checkpoint file {path} does not exist.")
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def train_incremental(data_path, checkpoint_path=None, preprocessor=None, seed=522, chunk_size=50000,
+                      target_col="target", gamma=None, alpha=1e-4):
+    """
+    Trains the incremental pipeline on a data file, chunk by chunk.
+
+    If checkpoint_path exists, training resumes from it; otherwise a new
+    pipeline is built from preprocessor. Rows of data_path that the
+    checkpoint has already consumed are skipped. The checkpoint is updated
+    after every chunk.
+
+    Parameters
+    ----------
+    data_path : str
+        Path to the CSV, Parquet or Arrow file of processed training data.
+    checkpoint_path : str or None, optional
+        Path of the checkpoint file to resume from and to write. None trains
+        without checkpoints. Default is None.
+    preprocessor : sklearn or None, optional
+        The preprocessor of a new pipeline. Only used when there is no
+        checkpoint to resume from. Default is None.
+    seed : int, optional
+        Random seed of a new pipeline. Default is 522.
+    chunk_size : int, optional
+        Number of rows read and trained on at a time. Default is 50000.
+    target_col : str, optional
+        Name of the encoded target column. Default is 'target'.
+    gamma, alpha : float, optional
+        Hyperparameters of a new pipeline, see `build_incremental_pipeline`.
+
+    Returns
+    -------
+    dict
+        The training state: the fitted 'pipeline', the total number of
+        rows trained on ('n_rows'), and the rows consumed per file content
+        hash ('sources').
+
+    Raises
+    ------
+    ValueError
+        If chunk_size is not positive, or there is neither a checkpoint to
+        resume from nor a preprocessor.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+
+    if checkpoint_path is not None and os.path.isfile(checkpoint_path):
+        state = load_checkpoint(checkpoint_path)
+    elif preprocessor is not None:
+        state = {"pipeline": build_incremental_pipeline(preprocessor, seed, gamma, alpha),
+                 "n_rows": 0, "sources": {}}
+    else:
+        raise ValueError("A preprocessor is required when there is no checkpoint to resume from.")
+
+    source = file_digest(data_path)
+    consumed = state["sources"].get(source, 0)
+    position = 0
+    for chunk in iter_data_chunks(data_path, chunk_size, typed=True):
+        start, position = position, position + len(chunk)
+        if position <= consumed:
+            continue
+        chunk = chunk.iloc[max(consumed - start, 0):]
+
+        partial_fit_pipeline(state["pipeline"], chunk.drop(columns=target_col), chunk[target_col])
+        state["n_rows"] += len(chunk)
+        state["sources"][source] = position
+        if checkpoint_path is not None:
+            save_checkpoint(state, checkpoint_path)
+
+    return state
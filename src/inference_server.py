@@ -0,0 +1,394 @@
+"""
+Online inference server for the term deposit classifier.
+
+This module contains a small asyncio HTTP/1.1 server (TCP or Unix socket)
+that keeps a trained pipeline in memory and scores raw customer records.
+Concurrent requests are grouped by a micro-batcher so that validation,
+feature engineering and the SVC decision function run once per batch
+instead of once per request, and the batch is scored in a worker thread so
+the event loop keeps accepting requests meanwhile.
+
+Endpoints
+---------
+POST /predict
+    Body is a JSON record or a JSON list of records with the raw columns
+    (the target 'y' is not needed). Responds with one
+    {"prediction": ..., "decision_score": ...} per record, or with status 422
+    and the validation errors per record. Other JSON bodies are rejected
+    with status 400, and bodies above the size limit with status 413.
+GET /metrics
+    p50/p99 request latency, throughput and batch size statistics.
+GET /health
+    Liveness check.
+"""
+
+import asyncio
+import collections
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.batch_predict import predict_with_scores
+from src.feature_engineering import FeatureEngineer, engineer_features
+from src.validate_data import CATEGORY_VOCABULARIES, NUMERIC_RANGES, RAW_COLUMNS, find_invalid_rows
+
+# Raw columns a request record may contain
+REQUEST_COLUMNS = [col for col in RAW_COLUMNS if col != 'y']
+
+# Numeric inputs must be present: only the categorical features are imputed
+# by the fitted preprocessor.
+REQUIRED_COLUMNS = [col for col in REQUEST_COLUMNS
+                    if col in NUMERIC_RANGES and col != 'day_of_week']
+
+# Feature transformer for validated records: their categories are the
+# schema vocabularies.
+FEATURE_ENGINEER = FeatureEngineer(categories=CATEGORY_VOCABULARIES).fit(pd.DataFrame(columns=REQUEST_COLUMNS))
+
+# Largest request body read into memory, about 20,000 records
+MAX_BODY_BYTES = 10 * 2**20
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 413: "Payload Too Large",
+            422: "Unprocessable Entity", 500: "Internal Server Error"}
+
+
+def score_records(model, records):
+    """
+    Validates and scores a batch of raw records.
+
+    Parameters
+    ----------
+    model : sklearn estimator
+        The fitted pipeline.
+    records : list of dict
+        Raw records. Keys outside REQUEST_COLUMNS are ignored and missing
+        categorical values are imputed by the pipeline.
+
+    Returns
+    -------
+    list of dict
+        One result per record, in order: {"prediction", "decision_score"}
+        for valid records and {"errors": [...]} for invalid ones.
+    """
+    raw = pd.DataFrame.from_records(records, columns=REQUEST_COLUMNS)
+    invalid = find_invalid_rows(raw, required=REQUIRED_COLUMNS)
+    results = [{"errors": invalid[i]} if i in invalid else None for i in range(len(raw))]
+
+    valid = np.array([result is None for result in results])
+    if valid.any():
+        # Rebuilt column by column: much cheaper than DataFrame.astype for
+        # small batches. The fitted imputers only recognise NaN as missing.
+        columns = {}
+        for col in REQUEST_COLUMNS:
+            values = raw[col].to_numpy(dtype=object)[valid]
+            if col in NUMERIC_RANGES:
+                columns[col] = values.astype(float)
+            else:
+                columns[col] = np.where(pd.isna(values), np.nan, values)
+        y_pred, scores = predict_with_scores(model, engineer_features(pd.DataFrame(columns), FEATURE_ENGINEER))
+        scored = iter(zip(y_pred.tolist(), scores.tolist()))
+        for i in np.flatnonzero(valid):
+            prediction, score = next(scored)
+            results[i] = {"prediction": prediction, "decision_score": score}
+
+    return results
+
+
+class LatencyMetrics:
+    """
+    Rolling request latency and throughput statistics.
+
+    Parameters
+    ----------
+    window : int, optional
+        Number of most recent requests the statistics are computed over.
+        Default is 10000.
+    """
+
+    def __init__(self, window=10000):
+        self.latencies_ms = collections.deque(maxlen=window)
+        self.finished_at = collections.deque(maxlen=window)
+        self.batch_sizes = collections.deque(maxlen=window)
+        self.n_requests = 0
+        self.n_records = 0
+        self.n_errors = 0
+        self.started_at = time.monotonic()
+
+    def record_request(self, latency_ms, n_records, ok=True):
+        """Records one finished /predict request."""
+        self.latencies_ms.append(latency_ms)
+        self.finished_at.append(time.monotonic())
+        self.n_requests += 1
+        self.n_records += n_records
+        self.n_errors += not ok
+
+    def record_batch(self, n_records):
+        """Records the size of one scored micro-batch."""
+        self.batch_sizes.append(n_records)
+
+    def snapshot(self):
+        """
+        Summarises the current statistics.
+
+        Returns
+        -------
+        dict
+            Totals since start-up, p50/p99/max latency in milliseconds and
+            throughput in requests per second over the window, and the mean
+            and max micro-batch size.
+        """
+        summary = {
+            "uptime_s": round(time.monotonic() - self.started_at, 3),
+            "requests": self.n_requests,
+            "records": self.n_records,
+            "errors": self.n_errors,
+            "batches": len(self.batch_sizes),
+        }
+        if self.latencies_ms:
+            latencies = np.fromiter(self.latencies_ms, dtype=float)
+            p50, p99 = np.percentile(latencies, [50, 99])
+            summary.update(latency_p50_ms=round(p50, 3), latency_p99_ms=round(p99, 3),
+                           latency_max_ms=round(latencies.max(), 3))
+        if len(self.finished_at) > 1:
+            elapsed = self.finished_at[-1] - self.finished_at[0]
+            summary["throughput_rps"] = round((len(self.finished_at) - 1) / elapsed, 1) if elapsed > 0 else None
+        if self.batch_sizes:
+            summary.update(batch_size_mean=round(float(np.mean(self.batch_sizes)), 2),
+                           batch_size_max=int(max(self.batch_sizes)))
+        return summary
+
+
+class MicroBatcher:
+    """
+    Groups concurrently submitted records into batches for one scoring call.
+
+    The batcher takes the first waiting request, then collects further
+    requests until `max_batch_size` records are queued or `max_wait_ms` has
+    passed, and scores the batch in a single worker thread. While a batch is
+    being scored the next one accumulates, so under load batches grow
+    without any extra waiting.
+
+    Parameters
+    ----------
+    score_fn : callable
+        Called with a list of records, returns a list of results in order.
+    max_batch_size : int, optional
+        Maximum number of records per batch. Default is 64.
+    max_wait_ms : float, optional
+        Longest time to wait for more requests once one has arrived.
+        Default is 2.
+    metrics : LatencyMetrics or None, optional
+        Receives the batch sizes. Default is None.
+    """
+
+    def __init__(self, score_fn, max_batch_size=64, max_wait_ms=2.0, metrics=None):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be a positive integer.")
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.metrics = metrics
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scorer")
+
+    async def submit(self, records):
+        """Queues records for scoring and waits for their results."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((records, future))
+        return await future
+
+    async def run(self):
+        """Scores batches until cancelled."""
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                items = [await self._queue.get()]
+                n_records = len(items[0][0])
+                deadline = loop.time() + self.max_wait_ms / 1000
+                while n_records < self.max_batch_size:
+                    if self._queue.empty():
+                        timeout = deadline - loop.time()
+                        if timeout <= 0:
+                            break
+                        try:
+                            item = await asyncio.wait_for(self._queue.get(), timeout)
+                        except asyncio.TimeoutError:
+                            break
+                    else:
+                        item = self._queue.get_nowait()
+                    items.append(item)
+                    n_records += len(item[0])
+
+                batch = [record for records, _ in items for record in records]
+                try:
+                    results = await loop.run_in_executor(self._executor, self.score_fn, batch)
+                except Exception as error:
+                    for _, future in items:
+                        if not future.done():
+                            future.set_exception(error)
+                    continue
+                if self.metrics is not None:
+                    self.metrics.record_batch(len(batch))
+
+                start = 0
+                for records, future in items:
+                    if not future.done():
+                        future.set_result(results[start:start + len(records)])
+                    start += len(records)
+        finally:
+            self._executor.shutdown(wait=False)
+
+
+class InferenceServer:
+    """
+    HTTP/1.1 inference server with keep-alive connections.
+
+    Parameters
+    ----------
+    model : sklearn estimator
+        The fitted pipeline, loaded once and shared by all requests.
+    host : str, optional
+        Interface to listen on. Default is '127.0.0.1'.
+    port : int, optional
+        TCP port, 0 picks a free port. Default is 8080.
+    unix_socket : str or None, optional
+        Listen on this Unix socket path instead of TCP. Default is None.
+    max_batch_size : int, optional
+        See `MicroBatcher`. Default is 64.
+    max_wait_ms : float, optional
+        See `MicroBatcher`. Default is 2.
+    max_body_bytes : int, optional
+        Requests with a larger Content-Length are answered with status 413
+        without reading their body. Default is MAX_BODY_BYTES.
+    """
+
+    def __init__(self, model, host="127.0.0.1", port=8080, unix_socket=None,
+                 max_batch_size=64, max_wait_ms=2.0, max_body_bytes=MAX_BODY_BYTES):
+        self.model = model
+        self.max_body_bytes = max_body_bytes
+        self.host = host
+        self.port = port
+        self.unix_socket = unix_socket
+        self.metrics = LatencyMetrics()
+        self.batcher = MicroBatcher(lambda records: score_records(self.model, records),
+                                    max_batch_size=max_batch_size, max_wait_ms=max_wait_ms,
+                                    metrics=self.metrics)
+        self._loop = None
+        self._stopped = None
+
+    async def serve_forever(self, ready=None):
+        """
+        Serves requests until `shutdown` is called.
+
+        Parameters
+        ----------
+        ready : threading.Event or None, optional
+            Set once the server is listening; `port` then holds the bound
+            port. Default is None.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        batcher_task = asyncio.create_task(self.batcher.run())
+        if self.unix_socket:
+            server = await asyncio.start_unix_server(self._handle_connection, path=self.unix_socket)
+        else:
+            server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+            self.port = server.sockets[0].getsockname()[1]
+        if ready is not None:
+            ready.set()
+        try:
+            async with server:
+                await self._stopped.wait()
+        finally:
+            batcher_task.cancel()
+
+    def shutdown(self):
+        """Stops `serve_forever`; safe to call from another thread."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                start = time.perf_counter()
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                try:
+                    content_length = int(headers.get("content-length", 0))
+                except ValueError:
+                    content_length = -1
+                if content_length < 0:
+                    status, payload = 400, {"error": "Content-Length must be a non-negative integer."}
+                    keep_alive = False
+                elif content_length > self.max_body_bytes:
+                    # The body is never read, so the connection cannot be reused
+                    status, payload = 413, {"error": f"Body exceeds {self.max_body_bytes} bytes."}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(content_length)
+                    status, payload = await self._route(method, path, body)
+                if path == "/predict" and method == "POST":
+                    n_records = len(payload["predictions"]) if status == 200 else 0
+                    self.metrics.record_request((time.perf_counter() - start) * 1000,
+                                                n_records, ok=status == 200)
+
+                data = json.dumps(payload).encode()
+                head = (f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                        f"Content-Type: application/json\r\n"
+                        f"Content-Length: {len(data)}\r\n")
+                if not keep_alive:
+                    head += "Connection: close\r\n"
+                writer.write((head + "\r\n").encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, path, body):
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path == "/metrics":
+            return 200, self.metrics.snapshot()
+        if path != "/predict":
+            return 404, {"error": f"Unknown path {path}."}
+        if method != "POST":
+            return 405, {"error": "Use POST for /predict."}
+
+        try:
+            records = json.loads(body)
+        except ValueError:
+            return 400, {"error": "Body must be valid JSON."}
+        if isinstance(records, dict):
+            records = [records]
+        if (not isinstance(records, list) or not records
+                or not all(isinstance(record, dict) for record in records)):
+            return 400, {"error": "Body must be a JSON object or a non-empty list of objects."}
+
+        try:
+            results = await self.batcher.submit(records)
+        except Exception as error:
+            return 500, {"error": str(error)}
+        errors = {i: result["errors"] for i, result in enumerate(results) if "errors" in result}
+        if errors:
+            return 422, {"errors": errors}
+        return 200, {"predictions": results}
@@ -0,0 +1,119 @@
+"""
+Compact deployable model artifact for the term deposit classifier.
+
+This module contains functionality to export a fitted preprocessor + SVC
+pipeline as a versioned artifact directory and to load it back as a
+predictor that only needs NumPy and pandas. The artifact holds the fitted
+state and nothing else: a `manifest.json` with the column layout, encoder
+vocabularies, imputer fill values and scalar parameters, plus one `.npy`
+file per numeric array (scaler statistics, support vectors, dual
+coefficients), including the scoring table and weights of
+`src.fast_predictor.FastPredictor` compiled at export. The `.npy` files are
+memory-mapped on load, so the operating system shares their pages between
+worker processes, and the predictor scores straight from the mapped table.
+
+Supported pipelines are those built by scripts/preprocess.py and
+src/svc_models.py: a ColumnTransformer of (SimpleImputer +)
+OneHotEncoder / OrdinalEncoder, StandardScaler and passthrough columns,
+followed by an RBF `SVC`, or by a Nystroem RBF approximation and a
+`LinearSVC` (or a hinge-loss `SGDClassifier`, as trained by
+src/incremental_training.py).
+"""
+
+import json
+import os
+import sys
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.fast_predictor import TABLE_KEY, WEIGHTS_KEY, FastPredictor, compile_tables, describe_pipeline
+
+FORMAT_NAME = "term-deposit-classifier"
+FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+
+def export_artifact(pipeline, directory):
+    """
+    Writes the fitted state of a pipeline to an artifact directory.
+
+    Parameters
+    ----------
+    pipeline : sklearn.pipeline.Pipeline or fitted search object
+        A fitted ColumnTransformer + SVC (or Nystroem + LinearSVC) pipeline.
+        For a fitted hyperparameter search, its `best_estimator_` is exported.
+    directory : str
+        Directory the artifact is written to. Created if it does not exist.
+
+    Returns
+    -------
+    str
+        Path of the written manifest.
+
+    Raises
+    ------
+    ValueError
+        If the pipeline contains steps the artifact format cannot represent,
+        or is not a binary classifier.
+    """
+    from sklearn import __version__ as sklearn_version
+
+    spec, arrays = describe_pipeline(pipeline)
+    arrays[TABLE_KEY], arrays[WEIGHTS_KEY] = compile_tables(spec, arrays)
+
+    os.makedirs(directory, exist_ok=True)
+    for key, array in arrays.items():
+        np.save(os.path.join(directory, f"{key}.npy"), array)
+
+    manifest = {
+        "format": FORMAT_NAME,
+        "format_version": FORMAT_VERSION,
+        "sklearn_version": sklearn_version,
+        **spec,
+        "arrays": {key: f"{key}.npy" for key in arrays},
+    }
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest_path
+
+
+def load_artifact(directory, mmap=True):
+    """
+    Loads an artifact directory written by `export_artifact`.
+
+    Parameters
+    ----------
+    directory : str
+        The artifact directory.
+    mmap : bool, optional
+        Whether to memory-map the arrays instead of reading them into
+        memory. Default is True.
+
+    Returns
+    -------
+    FastPredictor
+        The compiled predictor.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the directory has no manifest.
+    ValueError
+        If the artifact was written in an unsupported format version.
+    """
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.isfile(manifest_path):
+        raise FileNotFoundError(f"Model artifact {directory} does not exist.")
+
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if manifest.get("format") != FORMAT_NAME or manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported model artifact format {manifest.get('format')!r} "
+                         f"version {manifest.get('format_version')!r}; expected {FORMAT_NAME!r} "
+                         f"version {FORMAT_VERSION}.")
+
+    arrays = {key: np.load(os.path.join(directory, filename), mmap_mode="r" if mmap else None)
+              for key, filename in manifest["arrays"].items()}
+    spec = {key: manifest[key] for key in ("classes", "preprocessor", "model")}
+    return FastPredictor(spec, arrays)
@@ -0,0 +1,333 @@
+"""
+Registry of the model families tuned by the training script.
+
+This module maps model names to functions that build the preprocessor +
+model pipeline and its hyperparameter search space, so that every model
+family is tuned, saved and evaluated by the same harness
+(`search_pipeline`):
+
+- 'svc': the RBF SVC of src/svc_models.py ('exact' or 'approx' mode).
+- 'logistic_regression': a logistic regression on the preprocessed features.
+- 'hist_gradient_boosting': a histogram gradient boosting classifier. The
+  one-hot encoded columns of the preprocessor are ordinal encoded instead,
+  and the model splits on their categories natively.
+
+Register another model family by adding a builder to MODEL_BUILDERS; it
+takes the preprocessor, a seed and keyword options (such as the SVC
+'mode'), ignoring the options it does not use, and returns the unfitted
+pipeline, whose first step is the preprocessor, and the parameter
+distributions.
+"""
+
+import os
+import sys
+import tempfile
+import numpy as np
+from scipy.stats import loguniform, randint
+from sklearn.base import clone
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import RandomizedSearchCV, HalvingRandomSearchCV
+from sklearn.pipeline import Pipeline, make_pipeline
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder
+from sklearn.svm import SVC
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.distributed_search import DEFAULT_STORE, DistributedSearchCV
+from src.precomputed_kernel_search import PrecomputedKernelSearchCV
+from src.svc_models import build_svc_pipeline
+
+SEARCH_STRATEGIES = ("random", "halving", "precomputed", "distributed")
+
+
+def _build_svc(preprocessor, seed, mode="exact", **options):
+    """Adapts `build_svc_pipeline` to the builder signature; only the 'mode' option is used."""
+    return build_svc_pipeline(preprocessor, seed, mode)
+
+
+def build_logistic_regression_pipeline(preprocessor, seed, **options):
+    """
+    Builds the logistic regression pipeline and its hyperparameter search space.
+
+    Parameters
+    ----------
+    preprocessor : sklearn
+        The preprocessor object to apply before the model.
+    seed : int
+        Random seed for reproducibility.
+    **options
+        Options of other model families, ignored.
+
+    Returns
+    -------
+    tuple of (sklearn.pipeline.Pipeline, dict)
+        The unfitted pipeline and the parameter distributions to search.
+    """
+    pipe = make_pipeline(preprocessor, LogisticRegression(max_iter=1000, random_state=seed))
+    param_dist = {
+        "logisticregression__C": loguniform(1e-3, 1e3)
+    }
+    return pipe, param_dist
+
+
+def native_categorical_preprocessor(preprocessor):
+    """
+    Converts the preprocessor's one-hot encoded columns to ordinal codes.
+
+    The one-hot encoded columns are ordinal encoded, with missing and
+    unknown categories encoded as NaN, and placed first in the output. The
+    other transformers are kept as they are.
+
+    Parameters
+    ----------
+    preprocessor : sklearn.compose.ColumnTransformer
+        The unfitted preprocessor, as built by scripts/preprocess.py.
+
+    Returns
+    -------
+    tuple of (sklearn.compose.ColumnTransformer, np.ndarray)
+        The unfitted preprocessor with dense output, and the boolean mask of
+        its categorical output columns.
+
+    Raises
+    ------
+    ValueError
+        If preprocessor is not a ColumnTransformer of column name lists
+        with remainder='drop'.
+    """
+    if not isinstance(preprocessor, ColumnTransformer) or preprocessor.remainder != "drop":
+        raise ValueError("The preprocessor must be a ColumnTransformer that drops the remaining columns.")
+
+    categorical_cols, transformers = [], []
+    for name, transformer, columns in preprocessor.transformers:
+        encoder = transformer.steps[-1][1] if isinstance(transformer, Pipeline) else transformer
+        if isinstance(encoder, OneHotEncoder):
+            categorical_cols += list(columns)
+        else:
+            transformers.append((name, transformer if isinstance(transformer, str) else clone(transformer),
+                                 columns))
+    if any(not isinstance(col, str) for col in categorical_cols):
+        raise ValueError("The one-hot encoded columns must be given by name.")
+
+    ordinal_encoder = OrdinalEncoder(handle_unknown="use_encoded_value", unknown_value=np.nan,
+                                     encoded_missing_value=np.nan)
+    native_preprocessor = ColumnTransformer(
+        [("categorical", ordinal_encoder, categorical_cols)] + transformers,
+        sparse_threshold=0
+    )
+    n_other = sum(len(columns) for _, transformer, columns in transformers if transformer != "drop")
+    categorical_mask = np.array([True] * len(categorical_cols) + [False] * n_other)
+    return native_preprocessor, categorical_mask
+
+
+def build_hist_gradient_boosting_pipeline(preprocessor, seed, **options):
+    """
+    Builds the histogram gradient boosting pipeline and its hyperparameter search space.
+
+    Parameters
+    ----------
+    preprocessor : sklearn.compose.ColumnTransformer
+        The preprocessor object; its one-hot encoded columns are handled as
+        native categorical features (see `native_categorical_preprocessor`).
+    seed : int
+        Random seed for reproducibility.
+    **options
+        Options of other model families, ignored.
+
+    Returns
+    -------
+    tuple of (sklearn.pipeline.Pipeline, dict)
+        The unfitted pipeline and the parameter distributions to search.
+    """
+    native_preprocessor, categorical_mask = native_categorical_preprocessor(preprocessor)
+    pipe = make_pipeline(
+        native_preprocessor,
+        HistGradientBoostingClassifier(categorical_features=categorical_mask, random_state=seed)
+    )
+    param_dist = {
+        "histgradientboostingclassifier__learning_rate": loguniform(1e-2, 3e-1),
+        "histgradientboostingclassifier__max_leaf_nodes": randint(8, 64),
+        "histgradientboostingclassifier__min_samples_leaf": randint(10, 100),
+        "histgradientboostingclassifier__l2_regularization": loguniform(1e-4, 1e1)
+    }
+    return pipe, param_dist
+
+
+MODEL_BUILDERS = {
+    "svc": _build_svc,
+    "logistic_regression": build_logistic_regression_pipeline,
+    "hist_gradient_boosting": build_hist_gradient_boosting_pipeline,
+}
+
+
+def search_model(model, X_train, y_train, preprocessor, seed, mode="exact", search="random", n_iter=100,
+                 cache=True, store=DEFAULT_STORE):
+    """
+    Fits and tunes a model family from the registry.
+
+    Parameters
+    ----------
+    model : str
+        Name of the model family, one of MODEL_BUILDERS.
+    X_train : pd.DataFrame or np.ndarray
+        The feature matrix for training.
+    y_train : pd.Series or np.ndarray
+        The target vector for training.
+    preprocessor : sklearn
+        The preprocessor object to apply before the model.
+    seed : int
+        Random seed for reproducibility.
+    mode : str, optional
+        The SVC mode ('exact' or 'approx'); only used for model='svc'.
+        Default is 'exact'.
+    search : str, optional
+        One of SEARCH_STRATEGIES, see `src.random_search_svc.search_svc`.
+        'precomputed' is only available for the exact SVC. Default is
+        'random'.
+    n_iter : int, optional
+        Number of parameter candidates sampled. Default is 100.
+    cache : bool, optional
+        For the randomized search, cache the fitted preprocessor of every
+        fold on disk. Default is True.
+    store : str, optional
+        Path of the trial store of the 'distributed' search. Default is
+        DEFAULT_STORE.
+
+    Returns
+    -------
+    RandomizedSearchCV, HalvingRandomSearchCV, PrecomputedKernelSearchCV or DistributedSearchCV
+        The fitted search object containing the best estimator.
+
+    Raises
+    ------
+    ValueError
+        If model is not one of MODEL_BUILDERS, mode is not one of the SVC
+        modes (model='svc'), search is not one of SEARCH_STRATEGIES, or
+        search='precomputed' is used with a model other than the exact SVC.
+    """
+    if model not in MODEL_BUILDERS:
+        raise ValueError(f"model must be one of {tuple(MODEL_BUILDERS)}, but got '{model}'")
+
+    pipe, param_dist = MODEL_BUILDERS[model](preprocessor, seed, mode=mode)
+    return search_pipeline(pipe, param_dist, X_train, y_train, seed, search, n_iter, cache, store)
+
+
+def _random_search_cached(pipe, param_dist, X_train, y_train, seed, n_iter):
+    """Runs the randomized search with the fitted preprocessors cached on disk."""
+    with tempfile.TemporaryDirectory(prefix="transform_cache_") as cache_dir:
+        search_cv = RandomizedSearchCV(
+            clone(pipe).set_params(memory=cache_dir),
+            param_distributions=param_dist,
+            n_iter=n_iter,
+            n_jobs=-1,
+            return_train_score=True,
+            random_state=seed
+        )
+        search_cv.fit(X_train, y_train)
+
+    # The cache directory is gone, so the pipelines must not look it up again
+    search_cv.estimator.set_params(memory=None)
+    search_cv.best_estimator_.set_params(memory=None)
+    return search_cv
+
+
+def search_pipeline(pipe, param_dist, X_train, y_train, seed, search="random", n_iter=100, cache=True,
+                    store=DEFAULT_STORE):
+    """
+    Tunes a preprocessor + model pipeline with one of the search strategies.
+
+    This is the search behind `search_model` and
+    `src.random_search_svc.search_svc`, for any pipeline whose first step
+    is the preprocessor.
+
+    Parameters
+    ----------
+    pipe : sklearn.pipeline.Pipeline
+        The unfitted pipeline; its first step is the preprocessor.
+    param_dist : dict
+        The parameter distributions to search.
+    X_train : pd.DataFrame or np.ndarray
+        The feature matrix for training.
+    y_train : pd.Series or np.ndarray
+        The target vector for training.
+    seed : int
+        Random seed for reproducibility.
+    search : str, optional
+        One of SEARCH_STRATEGIES, see `src.random_search_svc.search_svc`.
+        'precomputed' requires an RBF kernel SVC as the model. Default is
+        'random'.
+    n_iter : int, optional
+        Number of parameter candidates sampled. Default is 100.
+    cache : bool, optional
+        For the randomized search, cache the fitted preprocessor of every
+        fold on disk, see `src.random_search_svc.search_svc`. Default is
+        True.
+    store : str, optional
+        Path of the trial store of the 'distributed' search. Default is
+        DEFAULT_STORE.
+
+    Returns
+    -------
+    RandomizedSearchCV, HalvingRandomSearchCV, PrecomputedKernelSearchCV or DistributedSearchCV
+        The fitted search object containing the best estimator.
+
+    Raises
+    ------
+    ValueError
+        If search is not one of SEARCH_STRATEGIES, or search='precomputed'
+        is used with a model other than an RBF kernel SVC.
+    """
+    model = pipe.steps[-1][1]
+    if search == "precomputed" and not (isinstance(model, SVC) and model.kernel == "rbf"):
+        raise ValueError(f"search='precomputed' requires an RBF kernel SVC (model='svc' with mode='exact'), "
+                         f"got {type(model).__name__}")
+
+    if search == "random" and cache:
+        return _random_search_cached(pipe, param_dist, X_train, y_train, seed, n_iter)
+    elif search == "precomputed":
+        search_cv = PrecomputedKernelSearchCV(
+            pipe,
+            param_distributions=param_dist,
+            n_iter=n_iter,
+            n_jobs=-1,
+            return_train_score=True,
+            random_state=seed
+        )
+    elif search == "distributed":
+        search_cv = DistributedSearchCV(
+            pipe,
+            param_distributions=param_dist,
+            store=store,
+            n_iter=n_iter,
+            n_workers=-1,
+            random_state=seed
+        )
+    elif search == "random":
+        search_cv = RandomizedSearchCV(
+            pipe,
+            param_distributions=param_dist,
+            n_iter=n_iter,
+            n_jobs=-1,
+            return_train_score=True,
+            random_state=seed
+        )
+    elif search == "halving":
+        search_cv = HalvingRandomSearchCV(
+            pipe,
+            param_distributions=param_dist,
+            n_candidates=n_iter,
+            factor=3,
+            resource="n_samples",
+            min_resources="exhaust",
+            n_jobs=-1,
+            return_train_score=True,
+            random_state=seed
+        )
+    else:
+        raise ValueError(f"search must be one of {SEARCH_STRATEGIES}, but got '{search}'")
+
+    search_cv.fit(X_train, y_train)
+
+    return search_cv
@@ -0,0 +1,408 @@
+"""
+Incremental runner for the analysis pipeline.
+
+This module runs the `scripts/*.py` stages of the analysis as subprocesses
+and skips the stages whose results are already cached. The cache key of a
+stage is a SHA-256 hash of its command-line parameters, the content of its
+input files (the raw data or the outputs of upstream stages) and its code:
+the script and every `src` module it imports, directly or through other
+`src` modules.
+
+After a stage succeeds, its output files are stored in a content-addressed
+cache directory (one blob per distinct file content) with a manifest under
+the stage key. A stage whose key has a manifest is not run again: its
+outputs are left alone if they are unchanged, or restored from the cache
+otherwise, e.g. after switching a parameter back. Stages run as soon as the
+stages they depend on have finished, up to a number of concurrent stages.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Project root, the working directory of the stages
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Default cache directory, relative to the project root
+DEFAULT_CACHE_DIR = ".pipeline_cache"
+
+
+class Stage:
+    """
+    One stage of the pipeline: a run of a script.
+
+    Parameters
+    ----------
+    name : str
+        Name of the stage.
+    script : str
+        Path of the script, relative to the project root.
+    args : dict
+        Command-line options of the script (e.g. '--seed') and their values.
+    inputs : list of str, optional
+        Files or directories the stage reads. Default is none.
+    outputs : list of str, optional
+        Files or directories the stage writes. Default is none (a check).
+    deps : list of str, optional
+        Names of the stages that must finish first. Default is none.
+    """
+
+    def __init__(self, name, script, args, inputs=(), outputs=(), deps=()):
+        self.name = name
+        self.script = script
+        self.args = dict(args)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.deps = list(deps)
+
+    def command(self):
+        """Returns the command line of the stage."""
+        return [sys.executable, self.script] + [f"{option}={value}" for option, value in self.args.items()]
+
+
+def file_digest(path):
+    """Returns the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _list_files(path, root):
+    """Lists the files at a path (the path itself, or the files under a directory), relative to root."""
+    full_path = os.path.join(root, path)
+    if os.path.isfile(full_path):
+        return [path]
+    files = []
+    for directory, _, filenames in os.walk(full_path):
+        for filename in filenames:
+            files.append(os.path.relpath(os.path.join(directory, filename), root))
+    return sorted(files)
+
+
+def _digests(paths, root):
+    """Returns the content digest of every file at the paths, or None for a missing path."""
+    digests = {}
+    for path in paths:
+        if not os.path.exists(os.path.join(root, path)):
+            digests[path] = None
+            continue
+        for file in _list_files(path, root):
+            digests[file] = file_digest(os.path.join(root, file))
+    return digests
+
+
+def code_files(script, root=PROJECT_ROOT):
+    """
+    Lists the code a script runs: the script and the `src` modules it imports.
+
+    Parameters
+    ----------
+    script : str
+        Path of the script, relative to root.
+    root : str, optional
+        Project root. Default is PROJECT_ROOT.
+
+    Returns
+    -------
+    list of str
+        The script and the imported `src` module files, relative to root.
+    """
+    files, pending = set(), [script]
+    while pending:
+        path = pending.pop()
+        if path in files or not os.path.isfile(os.path.join(root, path)):
+            continue
+        files.add(path)
+        with open(os.path.join(root, path)) as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.module:
+                modules = [node.module]
+            elif isinstance(node, ast.Import):
+                modules = [alias.name for alias in node.names]
+            else:
+                continue
+            pending.extend(os.path.join(*module.split('.')) + '.py' for module in modules
+                           if module.split('.')[0] == 'src')
+    return sorted(files)
+
+
+def stage_key(stage, root=PROJECT_ROOT):
+    """
+    Computes the cache key of a stage.
+
+    Parameters
+    ----------
+    stage : Stage
+        The stage. Its inputs must exist.
+    root : str, optional
+        Project root. Default is PROJECT_ROOT.
+
+    Returns
+    -------
+    str
+        Hex SHA-256 digest of the stage's parameters, inputs and code.
+
+    Raises
+    ------
+    FileNotFoundError
+        If an input of the stage does not exist.
+    """
+    inputs = _digests(stage.inputs, root)
+    missing = [path for path, digest in inputs.items() if digest is None]
+    if missing:
+        raise FileNotFoundError(f"Inputs of stage '{stage.name}' do not exist: {missing}")
+    content = {
+        "script": stage.script,
+        "args": stage.args,
+        "outputs": stage.outputs,
+        "code": _digests(code_files(stage.script, root), root),
+        "inputs": inputs,
+    }
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+
+class PipelineRunner:
+    """
+    Runs pipeline stages that are not cached, concurrently where possible.
+
+    Parameters
+    ----------
+    stages : list of Stage
+        The stages. Stage names must be unique.
+    cache_dir : str, optional
+        Cache directory, relative to root. Default is DEFAULT_CACHE_DIR.
+    root : str, optional
+        Project root, the working directory of the stages.
+        Default is PROJECT_ROOT.
+    max_workers : int, optional
+        Maximum number of stages running at a time. Default is 2.
+    """
+
+    def __init__(self, stages, cache_dir=DEFAULT_CACHE_DIR, root=PROJECT_ROOT, max_workers=2):
+        self.stages = {stage.name: stage for stage in stages}
+        self.cache_dir = os.path.join(root, cache_dir)
+        self.root = root
+        self.max_workers = max_workers
+        unknown = {dep for stage in stages for dep in stage.deps if dep not in self.stages}
+        if unknown:
+            raise ValueError(f"Unknown stage dependencies: {sorted(unknown)}")
+
+    def _manifest_path(self, key):
+        return os.path.join(self.cache_dir, "stages", f"{key}.json")
+
+    def _blob_path(self, digest):
+        return os.path.join(self.cache_dir, "blobs", digest[:2], digest)
+
+    def _store(self, stage, key, seconds):
+        """Stores the outputs of a stage that ran in the cache under its key."""
+        outputs = _digests(stage.outputs, self.root)
+        missing = [path for path, digest in outputs.items() if digest is None]
+        if missing:
+            raise RuntimeError(f"Stage '{stage.name}' did not write its outputs: {missing}")
+        for path, digest in outputs.items():
+            blob = self._blob_path(digest)
+            if not os.path.exists(blob):
+                os.makedirs(os.path.dirname(blob), exist_ok=True)
+                shutil.copyfile(os.path.join(self.root, path), blob)
+        os.makedirs(os.path.dirname(self._manifest_path(key)), exist_ok=True)
+        with open(self._manifest_path(key), "w") as f:
+            json.dump({"stage": stage.name, "outputs": outputs, "seconds": round(seconds, 3)}, f, indent=2)
+
+    def _restore(self, key):
+        """Brings the outputs of a cached stage up to date; returns whether any file was restored."""
+        with open(self._manifest_path(key)) as f:
+            outputs = json.load(f)["outputs"]
+        restored = False
+        for path, digest in outputs.items():
+            full_path = os.path.join(self.root, path)
+            if os.path.isfile(full_path) and file_digest(full_path) == digest:
+                continue
+            os.makedirs(os.path.dirname(full_path) or ".", exist_ok=True)
+            shutil.copyfile(self._blob_path(digest), full_path)
+            restored = True
+        return restored
+
+    def _run_stage(self, stage, force):
+        """Runs or restores a stage; returns its status, seconds and captured output."""
+        start = time.perf_counter()
+        key = stage_key(stage, self.root)
+        if not force and os.path.isfile(self._manifest_path(key)):
+            status = "restored" if self._restore(key) else "up to date"
+            return status, time.perf_counter() - start, ""
+        result = subprocess.run(stage.command(), cwd=self.root, capture_output=True, text=True)
+        seconds = time.perf_counter() - start
+        if result.returncode != 0:
+            raise RuntimeError(f"Stage '{stage.name}' failed with exit code {result.returncode}:\n"
+                               f"{result.stdout}{result.stderr}")
+        self._store(stage, key, seconds)
+        return "ran", seconds, result.stdout
+
+    def _required(self, targets):
+        """Returns the names of the targets and the stages they depend on."""
+        required, pending = set(), list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage '{name}'; expected one of {list(self.stages)}.")
+            if name not in required:
+                required.add(name)
+                pending.extend(self.stages[name].deps)
+        return required
+
+    def run(self, targets=None, force=False, verbose=True):
+        """
+        Runs the stages needed for the targets.
+
+        Parameters
+        ----------
+        targets : list of str or None, optional
+            Stages to bring up to date, with the stages they depend on.
+            Default is None (all stages).
+        force : bool, optional
+            Whether to run the stages even if they are cached.
+            Default is False.
+        verbose : bool, optional
+            Whether to print the status and output of each stage as it
+            finishes. Default is True.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per stage in finishing order, with its 'stage', 'status'
+            ('ran', 'up to date' or 'restored') and 'seconds'.
+
+        Raises
+        ------
+        RuntimeError
+            If a stage fails. Stages already running are finished first.
+        """
+        pending = self._required(self.stages if targets is None else targets)
+        done, running, rows, error = set(), {}, [], None
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                if error is None:
+                    ready = [name for name in self.stages if name in pending
+                             and all(dep in done for dep in self.stages[name].deps)]
+                    for name in ready:
+                        pending.discard(name)
+                        running[executor.submit(self._run_stage, self.stages[name], force)] = name
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        status, seconds, output = future.result()
+                    except Exception as err:
+                        error = error or err
+                        continue
+                    done.add(name)
+                    rows.append((name, status, round(seconds, 3)))
+                    if verbose:
+                        print(f"[{name}] {status} ({seconds:.2f} s)")
+                        if output:
+                            print(output.rstrip())
+        if error is not None:
+            raise error
+        import pandas as pd
+        return pd.DataFrame(rows, columns=["stage", "status", "seconds"])
+
+
+def analysis_stages(raw_data="data/raw/raw_data_sample.csv", data_format="csv", model="svc", svc_mode="exact",
+                    search="random", validation="full", validation_cache=".validation_cache", correlation_engine="native",
+                    validate_chunk_size=100000):
+    """
+    Builds the stages of the analysis, as run by the Makefile.
+
+    The exploratory analysis is split into a 'split' stage, which feeds the
+    preprocessing, and a 'plots' stage that runs alongside it.
+
+    Parameters
+    ----------
+    raw_data : str, optional
+        Path of the raw data CSV. Default is the 4,000-row sample.
+    data_format : str, optional
+        File format of the intermediate data: 'csv', 'parquet' or 'arrow'.
+        Default is 'csv'.
+    model : str, optional
+        Model family of src/model_registry.py; the model, score and plot
+        files are named after it. Default is 'svc'.
+    svc_mode : str, optional
+        'exact' or 'approx' SVC backend, for model='svc'. Default is 'exact'.
+    search : str, optional
+        Hyperparameter search: 'random', 'halving', 'precomputed' or
+        'distributed'.
+        Default is 'random'.
+    validation : str, optional
+        Deepchecks validation mode: 'full' or 'tiered'. Default is 'full'.
+    validation_cache : str, optional
+        Directory of the validation cache. Default is '.validation_cache'.
+    correlation_engine : str, optional
+        Engine of the correlation checks: 'native' or 'deepchecks'.
+        Default is 'native'.
+    validate_chunk_size : int, optional
+        Rows validated at a time by the raw data validation.
+        Default is 100,000.
+
+    Returns
+    -------
+    list of Stage
+        The 'validate', 'split', 'plots', 'preprocess', 'train' and
+        'evaluate' stages.
+    """
+    processed = "data/processed_data"
+    train_split, test_split = f"{processed}/train.{data_format}", f"{processed}/test.{data_format}"
+    processed_train = f"{processed}/preprocess_train.{data_format}"
+    processed_test = f"{processed}/preprocess_test.{data_format}"
+    model_pipeline = f"results/models/{model}_pipeline.pickle"
+    # the artifact format holds SVC pipelines only
+    model_artifact = ["results/models/svc_artifact"] if model == "svc" else []
+    eda_args = {"--loaded-data": raw_data, "--processed-data": processed, "--plot-to": "results/figures",
+                "--data-format": data_format}
+    return [
+        Stage("validate", "scripts/data_validation.py",
+              {"--raw_data": raw_data, "--chunk_size": validate_chunk_size},
+              inputs=[raw_data]),
+        Stage("split", "scripts/eda.py", {**eda_args, "--stage": "split"},
+              inputs=[raw_data], outputs=[train_split, test_split]),
+        Stage("plots", "scripts/eda.py", {**eda_args, "--stage": "plots"},
+              inputs=[raw_data],
+              outputs=[f"results/figures/{name}.png"
+                       for name in ["numeric_univariate", "categorical_univariate", "correlation_plot"]]),
+        Stage("preprocess", "scripts/preprocess.py",
+              {"--train-csv-file": train_split, "--test-csv-file": test_split, "--data-to": processed,
+               "--preprocessor-to": "results/models", "--plot-to": "results/figures",
+               "--data-format": data_format, "--validation": validation,
+               "--validation-cache": validation_cache, "--correlation-engine": correlation_engine},
+              inputs=[train_split, test_split],
+              outputs=[f"{processed}/scaled_train.{data_format}", f"{processed}/scaled_test.{data_format}",
+                       processed_train, processed_test, "results/models/data_preprocessor.pickle",
+                       "results/figures/correlation_heat_map.png"],
+              deps=["split"]),
+        Stage("train", "scripts/term_deposit_classifier.py",
+              {"--processed-train-data": processed_train,
+               "--preprocessor": "results/models/data_preprocessor.pickle", "--pipeline-to": "results/models",
+               "--plot-to": "results/figures", "--table-to": "results/tables", "--target-col": "target",
+               "--seed": 522, "--model": model, "--svc-mode": svc_mode, "--search": search,
+               "--validation-cache": validation_cache, "--correlation-engine": correlation_engine},
+              inputs=[processed_train, "results/models/data_preprocessor.pickle"],
+              outputs=[model_pipeline, *model_artifact,
+                       f"results/figures/train_{model}_confusion_matrix.png", f"results/tables/{model}_train_score.csv"],
+              deps=["preprocess"]),
+        Stage("evaluate", "scripts/evaluate_term_deposit_classifier.py",
+              {"--processed-test-data": processed_test, "--pipeline-from": model_pipeline,
+               "--plot-to": "results/figures", "--table-to": "results/tables", "--target-col": "target",
+               "--model": model},
+              inputs=[processed_test, model_pipeline],
+              outputs=[f"results/figures/test_{model}_{name}.png" for name in ["confusion_matrix", "roc_curve", "pr_curve"]]
+                      + [f"results/tables/{model}_test_score.csv", f"results/tables/{model}_classification_report.csv"],
+              deps=["train"]),
+    ]
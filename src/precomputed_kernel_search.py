@@ -0,0 +1,315 @@
+"""
+Randomized SVC search on precomputed RBF kernels.
+
+The RBF kernel is K = exp(-gamma * D), where D holds the pairwise squared
+euclidean distances between rows. D does not depend on 'C' or 'gamma', so
+this module computes it once per cross-validation fold on the encoded
+features. Each candidate's kernel is then derived from D with one in-place
+vectorized exponentiation, and an `SVC(kernel='precomputed')` is fitted on
+it. Candidates sharing a 'gamma' also share the kernel.
+
+The candidates, folds and scoring are the same as in RandomizedSearchCV, so
+the search selects the same parameters as the standard randomized search.
+The distance and kernel matrices are quadratic in the number of rows; a
+memory budget limits how many folds are processed at once, and distances
+are computed in row chunks to bound temporary memory.
+"""
+
+import time
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
+from scipy import sparse
+from scipy.stats import rankdata
+from sklearn.base import BaseEstimator, ClassifierMixin, clone
+from sklearn.metrics.pairwise import euclidean_distances
+from sklearn.model_selection import ParameterSampler, check_cv
+from sklearn.svm import SVC
+from sklearn.utils import gen_batches
+from sklearn.utils.extmath import row_norms
+from sklearn.utils.validation import check_array, check_consistent_length, check_is_fitted
+
+
+def transform_fold(preprocessor, X, y, train):
+    """
+    Fits a clone of the preprocessor on one fold and transforms all rows.
+
+    Parameters
+    ----------
+    preprocessor : sklearn
+        The unfitted preprocessor object.
+    X : pd.DataFrame or np.ndarray
+        The feature matrix for training.
+    y : np.ndarray
+        The target vector for training.
+    train : np.ndarray
+        Indices of the fold's training rows.
+
+    Returns
+    -------
+    np.ndarray or scipy.sparse matrix
+        The float64 transformed feature matrix for every row of X.
+    """
+    X_train = X.iloc[train] if hasattr(X, "iloc") else X[train]
+    fold_preprocessor = clone(preprocessor).fit(X_train, y[train])
+    X_fold = fold_preprocessor.transform(X)
+    # Object outputs (e.g. of an object ordinal encoder) and float32 sparse
+    # outputs are converted to float64 once instead of in every fit
+    if sparse.issparse(X_fold):
+        return X_fold.astype(np.float64)
+    return np.asarray(X_fold, dtype=np.float64)
+
+
+def squared_distances(A, B, chunk_mb=64):
+    """
+    Computes pairwise squared euclidean distances in row chunks.
+
+    Parameters
+    ----------
+    A : np.ndarray or scipy.sparse matrix
+        Matrix of shape (n_a, n_features).
+    B : np.ndarray or scipy.sparse matrix
+        Matrix of shape (n_b, n_features).
+    chunk_mb : int, optional
+        Approximate size in megabytes of each chunk of rows of A computed at
+        once. Default is 64.
+
+    Returns
+    -------
+    np.ndarray
+        Float64 matrix of shape (n_a, n_b).
+    """
+    out = np.empty((A.shape[0], B.shape[0]), dtype=np.float64)
+    B_norms = row_norms(B, squared=True)[np.newaxis, :]
+    chunk_rows = max(1, int(chunk_mb * 2**20 // (8 * max(B.shape[0], 1))))
+    for rows in gen_batches(A.shape[0], chunk_rows):
+        out[rows] = euclidean_distances(A[rows], B, Y_norm_squared=B_norms, squared=True)
+    return out
+
+
+def rbf_from_distances(distances, gamma, out):
+    """
+    Writes exp(-gamma * distances) into a preallocated kernel matrix.
+
+    Parameters
+    ----------
+    distances : np.ndarray
+        Pairwise squared distances.
+    gamma : float
+        The RBF kernel coefficient.
+    out : np.ndarray
+        Buffer of the same shape as distances, overwritten in place.
+
+    Returns
+    -------
+    np.ndarray
+        The `out` buffer holding the kernel.
+    """
+    np.multiply(distances, -gamma, out=out)
+    return np.exp(out, out=out)
+
+
+def _score_fold(preprocessor, svc, X, y, train, test, candidates, chunk_mb, return_train_score):
+    """Scores every candidate on one fold and returns test and train scores and timings."""
+    X_fold = transform_fold(preprocessor, X, y, train)
+    X_train, X_test = X_fold[train], X_fold[test]
+    y_train, y_test = y[train], y[test]
+
+    dist_train = squared_distances(X_train, X_train, chunk_mb)
+    dist_test = squared_distances(X_test, X_train, chunk_mb)
+    kernel_train = np.empty_like(dist_train)
+    kernel_test = np.empty_like(dist_test)
+
+    n_candidates = len(candidates)
+    scores = np.empty(n_candidates)
+    train_scores = np.full(n_candidates, np.nan)
+    fit_times = np.empty(n_candidates)
+    score_times = np.empty(n_candidates)
+
+    # Candidates with equal gamma share one kernel
+    by_gamma = {}
+    for i, (gamma, _) in enumerate(candidates):
+        by_gamma.setdefault(gamma, []).append(i)
+
+    for gamma, indices in by_gamma.items():
+        start = time.perf_counter()
+        rbf_from_distances(dist_train, gamma, kernel_train)
+        rbf_from_distances(dist_test, gamma, kernel_test)
+        kernel_seconds = (time.perf_counter() - start) / len(indices)
+
+        for i in indices:
+            start = time.perf_counter()
+            model = clone(svc).set_params(kernel="precomputed", **candidates[i][1])
+            model.fit(kernel_train, y_train)
+            fit_times[i] = time.perf_counter() - start + kernel_seconds
+
+            start = time.perf_counter()
+            scores[i] = model.score(kernel_test, y_test)
+            score_times[i] = time.perf_counter() - start
+
+            if return_train_score:
+                train_scores[i] = model.score(kernel_train, y_train)
+
+    return scores, train_scores, fit_times, score_times
+
+
+class PrecomputedKernelSearchCV(ClassifierMixin, BaseEstimator):
+    """
+    Randomized search over an RBF SVC pipeline using precomputed kernels.
+
+    Samples the same candidates as RandomizedSearchCV, cross-validates them
+    on kernels derived from one squared-distance matrix per fold, and refits
+    the original pipeline with the best parameters on all rows. The fitted
+    object exposes the usual search attributes (`cv_results_`,
+    `best_params_`, `best_score_`, `best_estimator_`) and predicts with the
+    refitted pipeline.
+
+    Parameters
+    ----------
+    estimator : sklearn.pipeline.Pipeline
+        Preprocessor followed by an `SVC(kernel='rbf')` as the final step.
+    param_distributions : dict
+        Distributions of the final step's parameters, keyed as
+        '<step name>__C' and '<step name>__gamma'.
+    n_iter : int, optional
+        Number of parameter candidates sampled. Default is 100.
+    cv : int or cross-validation splitter, optional
+        Folds, as in RandomizedSearchCV. Default is 5.
+    random_state : int or None, optional
+        Seed of the parameter sampler. Default is None.
+    n_jobs : int or None, optional
+        Number of folds processed in parallel, further limited by
+        max_memory_mb. Default is None (one).
+    max_memory_mb : int, optional
+        Memory budget for the distance and kernel matrices of all folds
+        processed at once. Default is 2048.
+    chunk_mb : int, optional
+        Size of the row chunks used to compute distances. Default is 64.
+    return_train_score : bool, optional
+        Also record the training fold accuracy of every candidate in
+        `cv_results_`, as RandomizedSearchCV does. The training kernel is
+        already computed, so this only adds one prediction per fit. Default
+        is False.
+    """
+
+    def __init__(self, estimator, param_distributions, n_iter=100, cv=5, random_state=None,
+                 n_jobs=None, max_memory_mb=2048, chunk_mb=64, return_train_score=False):
+        self.estimator = estimator
+        self.param_distributions = param_distributions
+        self.n_iter = n_iter
+        self.cv = cv
+        self.random_state = random_state
+        self.n_jobs = n_jobs
+        self.max_memory_mb = max_memory_mb
+        self.chunk_mb = chunk_mb
+        self.return_train_score = return_train_score
+
+    def fit(self, X, y):
+        """
+        Runs the search and refits the best pipeline on all rows.
+
+        Parameters
+        ----------
+        X : pd.DataFrame or np.ndarray
+            The feature matrix for training.
+        y : pd.Series or np.ndarray
+            The target vector for training.
+
+        Returns
+        -------
+        PrecomputedKernelSearchCV
+            The fitted search.
+
+        Raises
+        ------
+        ValueError
+            If the final pipeline step is not an RBF SVC.
+        MemoryError
+            If the matrices of a single fold exceed max_memory_mb.
+        """
+        step_name, svc = self.estimator.steps[-1]
+        if not isinstance(svc, SVC) or svc.kernel != "rbf":
+            raise ValueError("The final pipeline step must be an SVC with kernel='rbf'.")
+        preprocessor = self.estimator[:-1]
+
+        check_array(X, dtype=None, ensure_all_finite=False)
+        y = np.asarray(y)
+        check_consistent_length(X, y)
+
+        cv = check_cv(self.cv, y, classifier=True)
+        splits = list(cv.split(X, y))
+
+        params = list(ParameterSampler(self.param_distributions, self.n_iter,
+                                       random_state=self.random_state))
+        prefix = step_name + "__"
+        candidates = []
+        for candidate in params:
+            svc_params = {key[len(prefix):]: value for key, value in candidate.items()}
+            candidates.append((svc_params.pop("gamma", svc.gamma), svc_params))
+
+        # Distances and kernels for the training rows and the test rows of a fold
+        fold_bytes = max(2 * 8 * len(train) * len(y) for train, _ in splits)
+        budget = self.max_memory_mb * 2**20
+        if fold_bytes > budget:
+            raise MemoryError(
+                f"Precomputed kernels need {fold_bytes / 2**20:.0f} MB per fold, above "
+                f"max_memory_mb={self.max_memory_mb}. Use a smaller sample, "
+                f"mode='approx', or the 'random' or 'halving' search."
+            )
+        n_parallel = max(1, min(effective_n_jobs(self.n_jobs), len(splits), int(budget // fold_bytes)))
+
+        fold_results = Parallel(n_jobs=n_parallel)(
+            delayed(_score_fold)(preprocessor, svc, X, y, train, test, candidates, self.chunk_mb,
+                                 self.return_train_score)
+            for train, test in splits
+        )
+        scores = np.column_stack([result[0] for result in fold_results])
+        train_scores = np.column_stack([result[1] for result in fold_results])
+        fit_times = np.column_stack([result[2] for result in fold_results])
+        score_times = np.column_stack([result[3] for result in fold_results])
+
+        mean_scores = scores.mean(axis=1)
+        results = {
+            "mean_fit_time": fit_times.mean(axis=1),
+            "std_fit_time": fit_times.std(axis=1),
+            "mean_score_time": score_times.mean(axis=1),
+            "std_score_time": score_times.std(axis=1),
+            "params": params,
+        }
+        for key in params[0]:
+            results[f"param_{key}"] = np.ma.MaskedArray([candidate[key] for candidate in params])
+        for split in range(scores.shape[1]):
+            results[f"split{split}_test_score"] = scores[:, split]
+        results["mean_test_score"] = mean_scores
+        results["std_test_score"] = scores.std(axis=1)
+        results["rank_test_score"] = rankdata(-mean_scores, method="min").astype(np.int32)
+        if self.return_train_score:
+            for split in range(train_scores.shape[1]):
+                results[f"split{split}_train_score"] = train_scores[:, split]
+            results["mean_train_score"] = train_scores.mean(axis=1)
+            results["std_train_score"] = train_scores.std(axis=1)
+
+        self.cv_results_ = results
+        self.n_splits_ = len(splits)
+        self.best_index_ = int(results["rank_test_score"].argmin())
+        self.best_params_ = params[self.best_index_]
+        self.best_score_ = mean_scores[self.best_index_]
+
+        start = time.perf_counter()
+        self.best_estimator_ = clone(self.estimator).set_params(**self.best_params_).fit(X, y)
+        self.refit_time_ = time.perf_counter() - start
+        return self
+
+    @property
+    def classes_(self):
+        check_is_fitted(self, "best_estimator_")
+        return self.best_estimator_.classes_
+
+    def predict(self, X):
+        """Predicts with the refitted best pipeline."""
+        check_is_fitted(self, "best_estimator_")
+        return self.best_estimator_.predict(X)
+
+    def decision_function(self, X):
+        """Returns decision values of the refitted best pipeline."""
+        check_is_fitted(self, "best_estimator_")
+        return self.best_estimator_.decision_function(X)
@@ -8,25 +8,170 @@ a set of critical data integrity and validation checks using the
 Deepchecks library. It is designed to be called by the main
 data processing pipeline.
 
+The checks can run in tiers: cheap checks on all rows and the expensive
+nearest-neighbour outlier check on a fixed-size stratified sample. The
+outlier score of a row depends on its neighbours within the sample, so the
+sampled outlier ratio comes with no error guarantee; the sample keeps the
+class proportions and is smaller than the random 5000 rows the check
+draws by default. The checks are independent and can run in parallel
+workers, and the time of each check is reported.
+
 Author: Teem KWONG
 Date: 2025-12-13
 """
 
+import os
+import sys
+import time
 import pandas as pd
-from deepchecks.tabular import Dataset
-from deepchecks.tabular.checks import *
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.feature_engineering import FeatureEngineer, encode_target
+
+CAT_FEATURES = ['job', 'marital', 'education', 'default', 'housing', 'loan', 'contact',
+                'month', 'pdays_contacted']
+
+# Validation checks in reporting order
+CHECK_NAMES = ['Outliers', 'Single Value', 'String Mismatch', 'Class Imbalance']
+
+# Tier of each check in the 'tiered' validation mode: 'full' checks run on
+# all rows, 'sample' checks on a stratified sample. The 'full' mode runs
+# every check as 'full'.
+TIERED_CHECKS = {
+    'Outliers': 'sample',
+    'Single Value': 'full',
+    'String Mismatch': 'full',
+    'Class Imbalance': 'full',
+}
+VALIDATION_MODES = ['full', 'tiered']
+
+# Rows of the stratified sample of the 'sample' checks
+SAMPLE_ROWS = 3000
+
+
+def stratified_sample(df, label, n_rows, seed=522):
+    """
+    Draws a sample of about n_rows rows with the class proportions of df.
 
-def preprocess_deepcheck(target_df):
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The data.
+    label : str
+        The column to stratify on.
+    n_rows : int
+        Number of rows to draw. If it is at least len(df), df is returned.
+    seed : int, optional
+        Random seed. Default is 522.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The sampled rows, in their original order.
+    """
+    if n_rows >= len(df):
+        return df
+    sample = df.groupby(label, dropna=False, group_keys=False).sample(frac=n_rows / len(df), random_state=seed)
+    return sample.sort_index()
+
+
+def _build_check(name, sampled):
+    """Returns the configured Deepchecks check of the given name."""
+    from deepchecks.tabular.checks import ClassImbalance, IsSingleValue, OutlierSampleDetection, StringMismatch
+    if name == 'Outliers':
+        # OutlierSampleDetection draws its own random 5000 rows unless given a sample
+        check = OutlierSampleDetection(n_samples=sampled) if sampled else OutlierSampleDetection()
+        return check.add_condition_outlier_ratio_less_or_equal(0.05)
+    if name == 'Single Value':
+        return IsSingleValue()
+    if name == 'String Mismatch':
+        return StringMismatch()
+    return ClassImbalance().add_condition_class_ratio_less_than(0.99)
+
+
+def _run_check(name, data, sampled):
+    """Runs one check on data; returns whether its conditions passed, the condition details and seconds."""
+    from deepchecks.tabular import Dataset
+    start = time.perf_counter()
+    dataset = Dataset(data, label="target", cat_features=CAT_FEATURES)
+    result = _build_check(name, len(data) if sampled else None).run(dataset)
+    details = "; ".join(condition.details for condition in result.conditions_results)
+    return result.passed_conditions(), details, time.perf_counter() - start
+
+
+def run_validation_checks(target_df, mode='full', n_jobs=1, sample_rows=SAMPLE_ROWS, seed=522):
+    """
+    Runs the Deepchecks validation checks on preprocessed data.
+
+    Parameters
+    ----------
+    target_df : pandas.DataFrame
+        Preprocessed data with a 'target' column, as returned by
+        `preprocess_deepcheck`.
+    mode : str or dict, optional
+        'full' to run every check on all rows (the outlier check draws its
+        own random 5000 rows), 'tiered' to use TIERED_CHECKS, or a dict
+        giving the tier ('full' or 'sample') of each check. Default is 'full'.
+    n_jobs : int, optional
+        Number of parallel workers running the checks. Default is 1.
+    sample_rows : int, optional
+        Number of rows of the stratified sample the 'sample' checks run on.
+        Default is SAMPLE_ROWS.
+    seed : int, optional
+        Random seed of the sample. Default is 522.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per check in CHECK_NAMES order, with its 'tier', number of
+        'rows', whether it 'passed', the condition 'details' and 'seconds'.
+
+    Raises
+    ------
+    ValueError
+        If mode is not a validation mode.
+    """
+    if isinstance(mode, dict):
+        tiers = {name: mode.get(name, 'full') for name in CHECK_NAMES}
+    elif mode == 'tiered':
+        tiers = TIERED_CHECKS
+    elif mode == 'full':
+        tiers = {name: 'full' for name in CHECK_NAMES}
+    else:
+        raise ValueError(f"Unknown validation mode {mode!r}; expected one of {VALIDATION_MODES} or a dict of tiers.")
+
+    from joblib import Parallel, delayed
+    data = {'full': target_df}
+    if 'sample' in tiers.values():
+        data['sample'] = stratified_sample(target_df, 'target', sample_rows, seed)
+
+    outcomes = Parallel(n_jobs=n_jobs)(
+        delayed(_run_check)(name, data[tiers[name]], tiers[name] == 'sample') for name in CHECK_NAMES
+    )
+    return pd.DataFrame([(name, tiers[name], len(data[tiers[name]]), *outcome)
+                         for name, outcome in zip(CHECK_NAMES, outcomes)],
+                        columns=['check', 'tier', 'rows', 'passed', 'details', 'seconds'])
+
+
+def preprocess_deepcheck(target_df, engineer=None, validation='full', n_jobs=1):
     """
     Preprocess a target dataset and validate it using Deepchecks.
 
     The function performs data preprocessing, and creates a 
     Deepchecks `Dataset` object for validation. If any validation fails, an error is raised.
+    The input dataframe is not modified.
 
     Parameters
     ----------
     target_df : pandas.DataFrame
         Input dataframe containing the target column and features.
+    engineer : FeatureEngineer or None, optional
+        Fitted feature transformer, e.g. fitted on the training data to
+        preprocess the test data. Default is None, which fits one on target_df.
+    validation : str or dict, optional
+        Validation mode, 'full' or 'tiered', or the tier of each check; see
+        `run_validation_checks`. Default is 'full'.
+    n_jobs : int, optional
+        Number of parallel workers running the checks. Default is 1.
 
     Returns
     -------
@@ -59,56 +204,26 @@ def preprocess_deepcheck(target_df):
     if missing_cols:
         raise ValueError(f"Target DataFrame is missing required columns for preprocessing: {missing_cols}")
     
+    # feature engineering on 'pdays' column into categorical determining if client was contacted before or not,
+    # and dropping the columns that are not needed from EDA
+    if engineer is None:
+        engineer = FeatureEngineer().fit(target_df)
+    X_target = engineer.transform(target_df)
+
     # map the target variable to numeric
-    target_df['y'] = target_df['y'].map({'yes': 1, 'no': 0})
-
-    # feature engineering on 'pdays' column into categorical determining if client was contacted before or not
-    target_df['pdays_contacted'] = target_df['pdays'].apply(lambda x: 'never' if x == -1 else 'contacted')
-
-    # Drop columns that are not needed from EDA: poutcome has 83% missing values.
-    drop_cols = ['day_of_week', 'pdays', 'poutcome']
-    target_df = target_df.drop(columns=drop_cols)
-
-    # split data
-    X_target = target_df.drop(columns='y')
-    y_target = target_df['y']
-
-    # Rename target column for Deepchecks
-    target_df.rename(columns={'y': 'target'}, inplace=True)
-
-    # create Deepchecks Dataset
-    X_target_ds = Dataset(target_df, label="target", cat_features=['job', 'marital', 'education', 'default', 'housing', 'loan', 'contact',
-        'month', 'pdays_contacted'])
-
-    # Outlier Detection
-    check_outliers = OutlierSampleDetection()
-    check_outliers.add_condition_outlier_ratio_less_or_equal(0.05)
-    result_outliers = check_outliers.run(X_target_ds)
-
-    # Single Value Check
-    check_single_val = IsSingleValue()
-    result_single_val = check_single_val.run(X_target_ds)
-
-    # String Mismatch Check
-    check_string_mismatch = StringMismatch()
-    result_string_mismatch = check_string_mismatch.run(X_target_ds)
-
-    # Class Imbalance Check
-    check_imbalance = ClassImbalance()
-    check_imbalance.add_condition_class_ratio_less_than(0.99)
-    result_imbalance = check_imbalance.run(X_target_ds)
-
-    result_checks = {
-                'Outliers': result_outliers,
-                'Single Value': result_single_val,
-                'String Mismatch': result_string_mismatch,
-                'Class Imbalance': result_imbalance
-        }
-
-    for name, result in result_checks.items():
-        if not result.passed_conditions():
-                raise ValueError(f"Check '{name}' failed!!")
+    y_target = encode_target(target_df['y'])
+
+    # Target column for Deepchecks, in the position of 'y'
+    target_df = X_target.copy(deep=False)
+    target_df.insert(target_df.columns.get_loc('pdays_contacted'), 'target', y_target)
+
+    # Outlier Detection, Single Value, String Mismatch and Class Imbalance checks
+    results = run_validation_checks(target_df, mode=validation, n_jobs=n_jobs)
+
+    for check in results.itertuples():
+        if not check.passed:
+                raise ValueError(f"Check '{check.check}' failed!!")
         else:
-                print(f"Check '{name}' passed.")
+                print(f"Check '{check.check}' passed ({check.seconds:.2f} s on {check.rows} rows).")
 
     return target_df, X_target, y_target
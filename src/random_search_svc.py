@@ -6,31 +6,58 @@ model. It utilizes a randomized search strategy over a log-uniform distribution
 to identify the optimal 'C' (regularization) and 'gamma' (kernel coefficient)
 parameters, ensuring the model is tuned for best performance.
 
+The search can either be a plain randomized search, which cross-validates
+every candidate on all rows, or a successive halving search, which screens
+the candidates on small row budgets and only fits the survivors on the
+full data. The 'precomputed' search evaluates the same candidates as the
+randomized search, but derives every kernel from one squared-distance
+matrix per fold (see src/precomputed_kernel_search.py). The 'distributed'
+search also evaluates the same candidates, in worker processes on any
+number of hosts that share a trial store, and resumes where an interrupted
+search stopped (see src/distributed_search.py). The searches are run by
+`src.model_registry.search_pipeline`, which tunes every model family.
+
+The preprocessor is the first step of every candidate pipeline, but its
+output only depends on the training fold, not on 'C' or 'gamma'. With
+cache=True the randomized search caches the fitted preprocessor of every
+fold on disk (`Pipeline(memory=...)`), so candidates after the first reuse
+it instead of refitting it.
+
+Two model backends are available, built by src/svc_models.py: the 'exact'
+mode fits a kernel SVC on samples of a few thousand rows, and the 'approx'
+mode fits a linear SVM on Nystroem RBF features of the full dataset.
+
 Author: Godsgift Braimah
 Date: 2025-12-01
 """
 
-import pandas as pd
-import pickle
-from scipy.stats import loguniform
-from sklearn.pipeline import make_pipeline
-from sklearn.svm import SVC
-from sklearn.model_selection import RandomizedSearchCV
-from sklearn.metrics import ConfusionMatrixDisplay
+import os
+import sys
 import warnings
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.distributed_search import DEFAULT_STORE
+from src.model_registry import search_model
+
 warnings.filterwarnings("ignore", category=FutureWarning)
 warnings.filterwarnings("ignore", category=UserWarning)
 
-def search_svc(X_train, y_train, preprocessor, seed):
+
+def search_svc(X_train, y_train, preprocessor, seed, mode="exact", search="random", n_iter=100,
+               cache=True, store=DEFAULT_STORE):
     """
-    Fits and tunes an SVC model using RandomizedSearchCV.
+    Fits and tunes an SVC model using a randomized or successive halving search.
 
     Constructs a machine learning pipeline combining the provided
     preprocessor with an SVC classifier. It then executes a randomized search 
     to find the best hyperparameters ('C' and 'gamma') sampling from a 
     log-uniform distribution.
 
+    With search='halving', all n_iter candidates are first cross-validated
+    on a small subsample of rows. Each round keeps the best third of the
+    candidates and triples their row budget, so only the final survivors are
+    fitted on the full training data.
+
     Parameters
     ----------
     X_train : pd.DataFrame or np.ndarray
@@ -41,28 +68,45 @@ def search_svc(X_train, y_train, preprocessor, seed):
         The preprocessor object to apply before the model.
     seed : int
         Random seed for reproducibility.
+    mode : str, optional
+        'exact' fits a kernel SVC and is suited to samples of a few thousand
+        rows. 'approx' fits a linear SVM on Nystroem RBF features and scales
+        to the full dataset. Default is 'exact'.
+    search : str, optional
+        'random' for RandomizedSearchCV, 'halving' for HalvingRandomSearchCV,
+        or 'precomputed' for PrecomputedKernelSearchCV, which selects the
+        same parameters as 'random' on precomputed kernels ('exact' mode
+        only), or 'distributed' for DistributedSearchCV, which runs the
+        candidates of 'random' through a shared trial store. Default is
+        'random'.
+    n_iter : int, optional
+        Number of parameter candidates sampled. Default is 100.
+    cache : bool, optional
+        For the randomized search, cache the preprocessor fitted on each
+        fold in a temporary directory and reuse it for all candidates. The
+        cache lives on disk, so it saves preprocessor fits without keeping
+        transformed copies of the data in memory; it pays off when the
+        preprocessor is slow to fit relative to the model. Successive
+        halving draws new row subsets every round, so it always refits the
+        preprocessor. Default is True.
+    store : str, optional
+        Path of the trial store of the 'distributed' search. Default is
+        DEFAULT_STORE.
 
     Returns
     -------
-    sklearn.model_selection.RandomizedSearchCV
-        The fitted RandomizedSearchCV object containing the best estimator.
-    """
-    svc_pipe = make_pipeline(preprocessor, SVC(random_state=seed))
-    
-    param_dist = {
-        "svc__C": loguniform(1e-2, 1e3),
-        "svc__gamma": loguniform(1e-2, 1e3)
-    }
-    
-    random_svc = RandomizedSearchCV(
-        svc_pipe, 
-        param_distributions=param_dist,
-        n_iter=100, 
-        n_jobs=-1, 
-        return_train_score=True, 
-        random_state=seed
-    )
-    
-    random_svc.fit(X_train, y_train)
+    RandomizedSearchCV, HalvingRandomSearchCV, PrecomputedKernelSearchCV or DistributedSearchCV
+        The fitted search object containing the best estimator.
 
-    return random_svc
\ No newline at end of file
+    Raises
+    ------
+    ValueError
+        If mode is not one of `src.svc_models.SVC_MODES`, search is not one of
+        `src.model_registry.SEARCH_STRATEGIES`, or search='precomputed' is
+        used with mode='approx'.
+    MemoryError
+        If search='precomputed' and a fold's kernel matrices exceed the
+        memory budget.
+    """
+    return search_model("svc", X_train, y_train, preprocessor, seed, mode=mode, search=search, n_iter=n_iter,
+                        cache=cache, store=store)
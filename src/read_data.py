@@ -0,0 +1,218 @@
+"""
+Module for reading data files of any supported format.
+
+This module contains functionality to read the CSV, Parquet and Arrow IPC
+files written by `src.write_csv.write_csv`, choosing the reader from the
+file extension, either whole (`read_data`) or in fixed-size chunks
+(`iter_data_chunks`). Parquet files are read with memory mapping and Arrow
+IPC files are memory-mapped, so columns are not parsed.
+
+With `typed=True` the columns of the raw data schema declared in
+`src.validate_data` get compact dtypes (`apply_schema_dtypes`): the
+string columns are pandas categoricals with the schema's vocabulary as
+categories, and the integer columns have the smallest integer dtype that
+holds their values.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+
+def _read_table(path, columns=None):
+    """Reads a Parquet or Arrow IPC file into a pyarrow Table."""
+    if str(path).endswith(".parquet"):
+        return pq.read_table(path, columns=columns, memory_map=True)
+    with pa.memory_map(str(path)) as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.select(columns) if columns is not None else table
+
+
+# Integer dtypes tried for the schema's integer columns, smallest first
+_INT_DTYPES = (np.int8, np.int16, np.int32, np.int64)
+
+# Integers up to this magnitude are exact in float32
+_FLOAT32_MAX_INT = 2 ** 24
+
+
+def _schema_categorical(column, vocabulary):
+    """Converts a column to a categorical with the vocabulary, then any other values, as categories."""
+    if not isinstance(column.dtype, pd.CategoricalDtype):
+        column = column.astype("category")
+    # values outside the vocabulary are kept, for validation to report them
+    extra = sorted(set(column.cat.categories) - set(vocabulary), key=str)
+    return column.cat.set_categories([*vocabulary, *extra])
+
+
+def _schema_integer(column, low, high):
+    """Downcasts an integer column, or a float column of integers with missing values, without losing values."""
+    values = column.to_numpy()
+    if np.issubdtype(values.dtype, np.integer):
+        if not len(values):
+            low_value, high_value = low, high
+        else:
+            low_value, high_value = min(low, values.min()), max(high, values.max())
+        for dtype in _INT_DTYPES:
+            info = np.iinfo(dtype)
+            if info.min <= low_value and high_value <= info.max:
+                return column.astype(dtype)
+    elif np.issubdtype(values.dtype, np.floating) and values.dtype.itemsize > 4:
+        present = values[~np.isnan(values)]
+        if (present % 1 == 0).all() and (np.abs(present) <= _FLOAT32_MAX_INT).all():
+            return column.astype(np.float32)
+    return column
+
+
+def apply_schema_dtypes(df):
+    """
+    Gives the columns of the raw data schema their compact dtypes.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The data. Columns that are not in the schema of
+        `src.validate_data` are left as they are.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A new dataframe in which every categorical column of the schema is
+        a pandas categorical whose categories are the schema's vocabulary
+        followed by any other values present, and every integer column has
+        the smallest integer dtype holding both the schema's range and its
+        values (float32 if it has missing values). Values that do not fit a
+        dtype, such as strings in an integer column, keep their column as
+        it is. df is not modified.
+    """
+    from src.validate_data import CATEGORY_VOCABULARIES, NUMERIC_RANGES
+
+    columns = {}
+    for col in df.columns:
+        if col in CATEGORY_VOCABULARIES:
+            columns[col] = _schema_categorical(df[col], CATEGORY_VOCABULARIES[col])
+        elif col in NUMERIC_RANGES:
+            columns[col] = _schema_integer(df[col], *NUMERIC_RANGES[col])
+        else:
+            columns[col] = df[col]
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def _read_typed_csv(path, columns=None, **csv_kwargs):
+    """Reads a CSV file with the schema's string columns parsed as categoricals."""
+    from src.validate_data import CATEGORY_VOCABULARIES
+
+    index_col = csv_kwargs.pop("index_col", None)
+    if columns is not None or csv_kwargs or not (index_col is None or isinstance(index_col, int)):
+        # options only pandas' parser has; integers are parsed as int64 and
+        # downcast afterwards, because a narrower parse dtype wraps values
+        # that are out of its range
+        dtype = {col: "category" for col in CATEGORY_VOCABULARIES}
+        dtype.update(csv_kwargs.pop("dtype", None) or {})
+        return pd.read_csv(path, usecols=columns, index_col=index_col, dtype=dtype, **csv_kwargs)
+
+    # Arrow's parser dictionary-encodes the string columns as it reads them
+    column_types = {col: pa.dictionary(pa.int32(), pa.string()) for col in CATEGORY_VOCABULARIES}
+    table = pa_csv.read_csv(path, convert_options=pa_csv.ConvertOptions(column_types=column_types,
+                                                                        strings_can_be_null=True))
+    df = table.to_pandas()
+    if index_col is not None:
+        df = df.set_index(df.columns[index_col])
+        # pandas leaves an index with an empty header unnamed
+        df.index.name = df.index.name or None
+    return df
+
+
+def _to_pandas(table, categorical):
+    """Converts a pyarrow Table to pandas, decoding categoricals unless asked not to."""
+    df = table.to_pandas()
+    if not categorical:
+        category_cols = [col for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)]
+        df = df.astype({col: object for col in category_cols})
+    return df
+
+
+def read_data(path, columns=None, categorical=False, typed=False, **csv_kwargs):
+    """
+    Reads a CSV, Parquet or Arrow IPC file into a DataFrame.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file. Files ending in '.parquet' or '.arrow' are read as
+        columnar files, anything else as CSV.
+    columns : list of str or None, optional
+        Columns to read. Default is None (all columns).
+    categorical : bool, optional
+        Whether to keep dictionary-encoded string columns of columnar files
+        as pandas categoricals. If False they are returned as object
+        columns, as from a CSV file. Default is False.
+    typed : bool, optional
+        Whether to give the columns of the raw data schema their compact
+        dtypes; see `apply_schema_dtypes`. Default is False.
+    **csv_kwargs
+        Passed to `pandas.read_csv` for CSV files.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The data.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the file does not exist.
+    """
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"File {path} does not exist.")
+    if str(path).endswith((".parquet", ".arrow")):
+        df = _to_pandas(_read_table(path, columns), categorical or typed)
+    elif typed:
+        df = _read_typed_csv(path, columns, **csv_kwargs)
+    else:
+        return pd.read_csv(path, usecols=columns, **csv_kwargs)
+    return apply_schema_dtypes(df) if typed else df
+
+
+def iter_data_chunks(path, chunk_size, categorical=False, typed=False):
+    """
+    Reads a CSV, Parquet or Arrow IPC file in chunks of rows.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file, as for `read_data`.
+    chunk_size : int
+        Maximum number of rows per chunk.
+    categorical, typed : bool, optional
+        See `read_data`. Defaults are False.
+
+    Yields
+    ------
+    pandas.DataFrame
+        Consecutive chunks of the file.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the file does not exist.
+    """
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"File {path} does not exist.")
+    for chunk in _iter_chunks(path, chunk_size, categorical or typed):
+        yield apply_schema_dtypes(chunk) if typed else chunk
+
+
+def _iter_chunks(path, chunk_size, categorical):
+    """Yields the chunks of a file, as read by `iter_data_chunks` without typing."""
+    if str(path).endswith(".parquet"):
+        for batch in pq.ParquetFile(path, memory_map=True).iter_batches(batch_size=chunk_size):
+            yield _to_pandas(pa.Table.from_batches([batch]), categorical)
+    elif str(path).endswith(".arrow"):
+        table = _read_table(path)
+        for start in range(0, table.num_rows, chunk_size):
+            yield _to_pandas(table.slice(start, chunk_size), categorical)
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
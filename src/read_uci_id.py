@@ -16,17 +16,23 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from src.write_csv import write_csv
 
-def read_uci_id(id, directory):
+def read_uci_id(id, directory, sample_size=4000):
     """
     Read in a data set from the UCI Machine Learning repository using their API and save the 
     contents to a specified directory.
 
+    The full data set is written to raw_data.csv. A random sample is also
+    written to raw_data_sample.csv for quick exploration and exact SVC training.
+
     Parameters:
     -----------
     id : int
         The ucimlrepo id of the dataset to read in. 
     directory : str
         The directory where the data set will be saved.
+    sample_size : int or None, optional
+        Number of rows in raw_data_sample.csv. If None, no sample is written
+        and only the full data set is saved. Default is 4000.
 
     Raises:
     -------
@@ -68,15 +74,19 @@ def read_uci_id(id, directory):
     if raw_uci_data.empty:
         raise ValueError("DataFrame must contain observations.")
 
+    # write to CSV
+    write_csv(raw_uci_data, directory, "raw_data.csv")
+
+    if sample_size is None:
+        return
+
     # Take random sample of data
-    raw_uci_data_sample = raw_uci_data.sample(4000, random_state=522)
+    raw_uci_data_sample = raw_uci_data.sample(min(int(sample_size), len(raw_uci_data)), random_state=522)
 
     # Check Random Sample of Data is not empty
     if raw_uci_data_sample.empty:
         raise ValueError("DataFrame must contain observations.")
 
-    # write to CSV
-    write_csv(raw_uci_data, directory, "raw_data.csv")
     write_csv(raw_uci_data_sample, directory, "raw_data_sample.csv")
 
     
\ No newline at end of file
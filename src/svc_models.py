@@ -0,0 +1,68 @@
+"""
+SVC pipelines of the term deposit classifier.
+
+This module builds the preprocessor + SVC pipeline and the log-uniform
+search space of its 'C' and 'gamma' parameters, which are tuned by the
+searches of src/model_registry.py.
+
+Two model backends are available. The 'exact' mode fits a kernel SVC, whose
+fit time grows roughly cubically with the number of rows. The 'approx' mode
+maps the features through a Nystroem approximation of the same RBF kernel and
+fits a linear SVM on top, so it can be trained on the full dataset.
+"""
+
+from scipy.stats import loguniform
+from sklearn.kernel_approximation import Nystroem
+from sklearn.pipeline import make_pipeline
+from sklearn.svm import SVC, LinearSVC
+
+SVC_MODES = ("exact", "approx")
+
+# Number of landmark rows used by the Nystroem kernel approximation
+NYSTROEM_COMPONENTS = 300
+
+
+def build_svc_pipeline(preprocessor, seed, mode="exact"):
+    """
+    Builds the SVC pipeline and its hyperparameter search space.
+
+    Parameters
+    ----------
+    preprocessor : sklearn
+        The preprocessor object to apply before the model.
+    seed : int
+        Random seed for reproducibility.
+    mode : str, optional
+        'exact' for a kernel SVC, or 'approx' for a Nystroem RBF feature map
+        followed by a linear SVM. Default is 'exact'.
+
+    Returns
+    -------
+    tuple of (sklearn.pipeline.Pipeline, dict)
+        The unfitted pipeline and the parameter distributions to search.
+
+    Raises
+    ------
+    ValueError
+        If mode is not one of SVC_MODES.
+    """
+    if mode == "exact":
+        svc_pipe = make_pipeline(preprocessor, SVC(random_state=seed))
+        param_dist = {
+            "svc__C": loguniform(1e-2, 1e3),
+            "svc__gamma": loguniform(1e-2, 1e3)
+        }
+    elif mode == "approx":
+        svc_pipe = make_pipeline(
+            preprocessor,
+            Nystroem(kernel="rbf", n_components=NYSTROEM_COMPONENTS, random_state=seed),
+            LinearSVC(random_state=seed)
+        )
+        param_dist = {
+            "linearsvc__C": loguniform(1e-2, 1e3),
+            "nystroem__gamma": loguniform(1e-2, 1e3)
+        }
+    else:
+        raise ValueError(f"mode must be one of {SVC_MODES}, but got '{mode}'")
+
+    return svc_pipe, param_dist
@@ -5,21 +5,272 @@ Data validation module using pandera.
 
 This module contains functionality to validate data,
 checking for correct column names, data types, and 
-outliers or anaomalous values.
+outliers or anaomalous values. Files that do not fit in memory can be
+validated in chunks (`validate_data(raw_data, chunk_size=...)`), which
+gives the same report as validating the whole file at once.
 
 Author: Devon Vorster (Code adapted from Tiffany A. 
 Timbers, Joel Ostblom & Melissa Lee 2023/11/09's code)
 Date: 2025-12-13
 """
 
+import numpy as np
 import pandas as pd
 import pandera.pandas as pa
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+from pandera.errors import SchemaErrorReason, SchemaErrors
 
 def assert_csv_format(file_path):
     assert file_path.endswith(".csv"), "Error: File must be a CSV."
     return True
     
-def validate_data(raw_data):
+# Allowed values of the categorical columns. Missing values are allowed.
+CATEGORY_VOCABULARIES = {
+    "job": ['technician', 'blue-collar', 'admin.', 'entrepreneur',
+            'management', 'self-employed', 'retired', 'services', 'unemployed',
+            'housemaid', 'student'],
+    "marital": ['married', 'single', 'divorced'],
+    "education": ['tertiary', 'secondary', 'primary'],
+    "default": ['no', 'yes'],
+    "housing": ['yes', 'no'],
+    "loan": ['no', 'yes'],
+    "contact": ['cellular', 'telephone'],
+    "month": ['feb', 'nov', 'jul', 'may', 'aug', 'jun', 'apr', 'mar', 'jan',
+              'oct', 'sep', 'dec'],
+    "poutcome": ['failure', 'success', 'other'],
+    "y": ['no', 'yes'],
+}
+
+_VOCABULARY_SETS = {col: frozenset(values) for col, values in CATEGORY_VOCABULARIES.items()}
+
+# Inclusive (min, max) bounds of the integer columns. Missing values are allowed.
+NUMERIC_RANGES = {
+    "age": (18, 91),
+    "balance": (-10000000, 10000000),
+    "day_of_week": (1, 31),
+    "duration": (0, 4000),
+    "campaign": (0, 40),
+    "pdays": (-1, 800),
+    "previous": (0, 30),
+}
+
+# Column order of the raw data
+RAW_COLUMNS = ['age', 'job', 'marital', 'education', 'default', 'balance', 'housing', 'loan',
+               'contact', 'day_of_week', 'month', 'duration', 'campaign', 'pdays', 'previous',
+               'poutcome', 'y']
+
+# Error messages of the dataframe-level checks, in schema order
+FRAME_CHECK_ERRORS = ["Duplicate rows found.", "Empty rows found.", "Missing values is above threshold."]
+# Missing-value rate of a column below which the missingness check passes
+MAX_MISSING_RATE = 0.10
+
+# Hash of a missing value, whatever the dtype of its column
+_NULL_HASH = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def build_schema(columns=None, frame_checks=True):
+    """
+    Builds the pandera schema of the raw bank marketing data.
+
+    Parameters
+    ----------
+    columns : list of str or None, optional
+        Raw columns to include. Default is None (all of RAW_COLUMNS).
+    frame_checks : bool, optional
+        Whether to include the dataframe-level checks for duplicate rows,
+        empty rows and missingness. Default is True.
+
+    Returns
+    -------
+    pandera.DataFrameSchema
+        The schema.
+    """
+    columns = RAW_COLUMNS if columns is None else columns
+    schema_columns = {}
+    for col in columns:
+        if col in NUMERIC_RANGES:
+            low, high = NUMERIC_RANGES[col]
+            schema_columns[col] = pa.Column(int, pa.Check.between(low, high), nullable=True)
+        else:
+            schema_columns[col] = pa.Column(object, pa.Check.isin(CATEGORY_VOCABULARIES[col]), nullable=True)
+
+    #check for no duplicate observations, no empty observations and missingness not beyond expected threshold:
+    checks = [
+        pa.Check(lambda df: ~df.duplicated().any(), error=FRAME_CHECK_ERRORS[0]),
+        pa.Check(lambda df: ~(df.isna().all(axis=1)).any(), error=FRAME_CHECK_ERRORS[1]),
+        pa.Check(lambda df: (df.isna().mean() < MAX_MISSING_RATE).any(), error=FRAME_CHECK_ERRORS[2])
+    ] if frame_checks else []
+
+    return pa.DataFrameSchema(schema_columns, checks=checks)
+
+
+def find_invalid_rows(df, required=()):
+    """
+    Checks each row of df against the column rules of the schema.
+
+    This applies the same value rules as `build_schema` (vocabularies and
+    integer ranges) with vectorized pandas operations and reports failures
+    per row, which is much cheaper than a pandera validation for small
+    batches such as online inference requests. Columns of df that are not
+    in the schema are ignored.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Rows to check, with raw column names.
+    required : iterable of str, optional
+        Columns that must be present and non-missing. Default is none.
+
+    Returns
+    -------
+    dict
+        Maps the position of every invalid row to a list of error messages.
+        Empty if all rows are valid.
+    """
+    errors = {}
+
+    def add_errors(mask, message):
+        for position in np.flatnonzero(mask):
+            errors.setdefault(int(position), []).append(message)
+
+    for col in required:
+        if col not in df.columns:
+            add_errors(np.ones(len(df), dtype=bool), f"'{col}' is required.")
+
+    for col in df.columns:
+        if col not in NUMERIC_RANGES and col not in CATEGORY_VOCABULARIES:
+            continue
+        values = df[col].to_numpy(dtype=object)
+        missing = pd.isna(values)
+        if col in NUMERIC_RANGES:
+            low, high = NUMERIC_RANGES[col]
+            numeric = pd.to_numeric(values, errors="coerce").astype(float)
+            with np.errstate(invalid="ignore"):
+                invalid = ~missing & ~((numeric % 1 == 0) & (numeric >= low) & (numeric <= high))
+            add_errors(invalid, f"'{col}' must be an integer between {low} and {high}.")
+        else:
+            vocabulary = _VOCABULARY_SETS[col]
+            invalid = ~missing & np.fromiter((not isinstance(value, str) or value not in vocabulary for value in values), dtype=bool, count=len(values))
+            add_errors(invalid, f"'{col}' must be one of {CATEGORY_VOCABULARIES[col]}.")
+        if col in required:
+            add_errors(missing, f"'{col}' is required.")
+
+    return errors
+
+
+def _row_hashes(chunk):
+    """
+    Hashes the rows of a chunk of a CSV file.
+
+    Numeric columns are hashed as float64 and missing values with one
+    constant, so equal rows have equal hashes whichever dtypes pandas
+    infers for the chunk they are in.
+    """
+    hashes = np.zeros(len(chunk), dtype=np.uint64)
+    for col in chunk.columns:
+        values = chunk[col]
+        if is_numeric_dtype(values) and not is_bool_dtype(values):
+            values = values.astype(np.float64)
+        column_hashes = pd.util.hash_array(values.to_numpy())
+        column_hashes[values.isna().to_numpy()] = _NULL_HASH
+        hashes = hashes * np.uint64(1000003) ^ column_hashes
+    return hashes
+
+
+def _combined_dtype(dtypes):
+    """Returns the dtype pandas infers for a whole column from the dtypes of its chunks."""
+    dtypes = list(dict.fromkeys(dtypes))
+    if len(dtypes) == 1:
+        return dtypes[0]
+    if all(is_numeric_dtype(dtype) and not is_bool_dtype(dtype) for dtype in dtypes):
+        return np.result_type(*dtypes)
+    return np.dtype(object)
+
+
+class _StreamingValidator:
+    """
+    Accumulates what the schema needs to report on a file, chunk by chunk.
+
+    Only the rows failing a column check are kept, with their row index in
+    the file; the dataframe-level checks are reduced to null counts, an
+    empty-row flag and the row hashes of every chunk, which are checked
+    for duplicates once all chunks are read.
+    """
+
+    def __init__(self):
+        self.columns = None
+        self.dtypes = {}
+        self.failures = {}
+        self.n_rows = 0
+        self.null_counts = None
+        self.has_empty_rows = False
+        self.hashes = []
+
+    def update(self, chunk):
+        """Validates the column values of a chunk and updates the statistics."""
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+            self.null_counts = pd.Series(0, index=chunk.columns)
+        for col, dtype in chunk.dtypes.items():
+            self.dtypes.setdefault(col, []).append(dtype)
+
+        try:
+            build_schema(frame_checks=False).validate(chunk, lazy=True)
+        except SchemaErrors as err:
+            for error in err.schema_errors:
+                if error.reason_code == SchemaErrorReason.DATAFRAME_CHECK:
+                    col = error.schema.name
+                    index = error.failure_cases["index"].unique()
+                    self.failures.setdefault(col, []).append(chunk.loc[index, col])
+
+        nulls = chunk.isna()
+        self.n_rows += len(chunk)
+        self.null_counts += nulls.sum()
+        self.has_empty_rows |= bool(nulls.all(axis=1).any())
+        self.hashes.append(_row_hashes(chunk))
+
+    def has_duplicates(self):
+        """Returns whether any two rows of the file are equal, from one sort of all the row hashes."""
+        hashes = np.concatenate(self.hashes)
+        return len(np.unique(hashes)) < len(hashes)
+
+    def schema_errors(self):
+        """Returns the SchemaError list that validating the whole file would collect."""
+        schema = build_schema()
+        errors = []
+
+        def collect(column_schema, df):
+            try:
+                column_schema.validate(df, lazy=True)
+            except SchemaErrors as err:
+                errors.extend(err.schema_errors)
+
+        # missing columns, then the dtype and value checks of each column on
+        # its failing rows, typed as in the whole file
+        missing = [col for col in schema.columns if col not in self.columns]
+        for col in missing:
+            collect(build_schema(columns=[col], frame_checks=False), pd.DataFrame(columns=self.columns))
+        for col in schema.columns:
+            if col in missing:
+                continue
+            dtype = _combined_dtype(self.dtypes[col])
+            parts = self.failures.get(col, [])
+            values = pd.concat(parts) if parts else pd.Series(dtype=dtype)
+            collect(build_schema(columns=[col], frame_checks=False), pd.DataFrame({col: values.astype(dtype)}))
+
+        # dataframe-level checks from the accumulated statistics
+        with np.errstate(invalid="ignore", divide="ignore"):
+            missing_rates = self.null_counts.to_numpy() / self.n_rows
+        passed = [np.bool_(not self.has_duplicates()), np.bool_(not self.has_empty_rows),
+                  np.bool_((missing_rates < MAX_MISSING_RATE).any())]
+        frame_schema = pa.DataFrameSchema(checks=[
+            pa.Check(lambda df, result=result: result, error=error) for result, error in zip(passed, FRAME_CHECK_ERRORS)
+        ])
+        collect(frame_schema, pd.DataFrame())
+        return errors
+
+
+def validate_data(raw_data, chunk_size=None):
     """
     This script validates the data, checking for: 
         - correct column names
@@ -32,45 +283,38 @@ def validate_data(raw_data):
     -----------
     raw_data : str
         path to the raw data CSV file
+    chunk_size : int or None, optional
+        number of rows read and validated at a time, so that memory use is
+        bounded by the chunk size (plus 8 bytes per row for the duplicate
+        row hashes). The report is the same as for the whole file. Default
+        is None (validate the whole file at once).
 
     Returns:
     --------
     None
+
+    Raises:
+    -------
+    pandera.errors.SchemaErrors
+        If the data does not pass validation.
     """
     assert_csv_format(raw_data)
-    marketing_sample = pd.read_csv(raw_data)
-
-
-    #Validate Data:
-    schema = pa.DataFrameSchema(
-        {
-            "age": pa.Column(int, pa.Check.between(18, 91), nullable=True),
-            "job": pa.Column(object, pa.Check.isin(['technician', 'blue-collar', 'admin.', 'entrepreneur',
-           'management', 'self-employed', 'retired', 'services', 'unemployed',
-           'housemaid', 'student']), nullable=True),
-            "marital": pa.Column(object, pa.Check.isin(['married', 'single', 'divorced']), nullable=True),
-            "education": pa.Column(object, pa.Check.isin(['tertiary', 'secondary', 'primary']), nullable=True), 
-            "default": pa.Column(object, pa.Check.isin(['no', 'yes']), nullable=True),
-            "balance": pa.Column(int, pa.Check.between(-10000000, 10000000), nullable=True),
-            "housing": pa.Column(object, pa.Check.isin(['yes', 'no']), nullable=True),
-            "loan": pa.Column(object, pa.Check.isin(['no', 'yes']), nullable=True),
-            "contact": pa.Column(object, pa.Check.isin(['cellular', 'telephone']), nullable=True),
-            "day_of_week": pa.Column(int, pa.Check.between(1, 31), nullable=True),
-            "month": pa.Column(object, pa.Check.isin(['feb', 'nov', 'jul', 'may', 'aug', 'jun', 'apr', 'mar', 'jan',
-           'oct', 'sep', 'dec']), nullable=True),
-            "duration": pa.Column(int, pa.Check.between(0, 4000), nullable=True),
-            "campaign": pa.Column(int, pa.Check.between(0, 40), nullable=True),
-            "pdays": pa.Column(int, pa.Check.between(-1, 800), nullable=True), 
-            "previous": pa.Column(int, pa.Check.between(0, 30), nullable=True),
-            "poutcome": pa.Column(object, pa.Check.isin(['failure', 'success', 'other']), nullable=True),
-            "y": pa.Column(object, pa.Check.isin(['no', 'yes']), nullable=True),
-        },
-        #check for no duplicate observations, no empty observations and missingness not beyond expected threshold:
-        checks=[
-            pa.Check(lambda df: ~df.duplicated().any(), error="Duplicate rows found."),
-            pa.Check(lambda df: ~(df.isna().all(axis=1)).any(), error="Empty rows found."),
-            pa.Check(lambda df: (df.isna().mean() < 0.10).any(), error="Missing values is above threshold.")
-        ]
-    )
-
-    schema.validate(marketing_sample, lazy=True)
\ No newline at end of file
+    if chunk_size is None:
+        marketing_sample = pd.read_csv(raw_data)
+
+        #Validate Data:
+        schema = build_schema()
+
+        schema.validate(marketing_sample, lazy=True)
+        return
+
+    validator = _StreamingValidator()
+    for chunk in pd.read_csv(raw_data, chunksize=chunk_size):
+        validator.update(chunk)
+    if validator.columns is None:
+        # no data rows: validate the header alone
+        build_schema().validate(pd.read_csv(raw_data), lazy=True)
+        return
+    errors = validator.schema_errors()
+    if errors:
+        raise SchemaErrors(build_schema(), errors, pd.DataFrame(columns=validator.columns))
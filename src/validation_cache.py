@@ -0,0 +1,170 @@
+"""
+Cache of passed data validation checks.
+
+This module contains the `ValidationCache` class, which records the data
+validation checks that passed on a dataset, so a later pipeline stage that
+runs the same check on the same data can skip it. A cache entry is keyed by
+a content hash of the dataset (`dataset_fingerprint`) and by the check
+configuration (check name, condition thresholds, label and categorical
+features, correlation engine). Entries are small JSON files in a cache
+directory, one per key.
+
+The dataset hash covers the column names and the values, not the index.
+Numeric columns are hashed as float64 and categorical columns by their
+values, so a dtype-only change (downcast integers, category instead of
+object columns) and a round trip through a CSV, Parquet or Arrow file keep
+the fingerprint.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+# Default cache directory, relative to the project root
+DEFAULT_CACHE_DIR = ".validation_cache"
+
+
+def dataset_fingerprint(df):
+    """
+    Computes a content hash of a DataFrame.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The data.
+
+    Returns
+    -------
+    str
+        Hex SHA-256 digest of the column names and the row hashes of
+        `pandas.util.hash_pandas_object` (index excluded), with the numeric
+        columns converted to float64.
+    """
+    import numpy as np
+    import pandas as pd
+    numeric_cols = df.select_dtypes('number').columns
+    if len(numeric_cols):
+        df = df.astype({col: np.float64 for col in numeric_cols})
+    digest = hashlib.sha256(json.dumps([str(col) for col in df.columns]).encode())
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    digest.update(np.ascontiguousarray(row_hashes).tobytes())
+    return digest.hexdigest()
+
+
+def _entry_key(fingerprint, config):
+    """Returns the cache key of a dataset fingerprint and a check configuration."""
+    return hashlib.sha256(json.dumps([fingerprint, config], sort_keys=True).encode()).hexdigest()
+
+
+class ValidationCache:
+    """
+    Directory of passed validation check results.
+
+    Parameters
+    ----------
+    directory : str, optional
+        The cache directory. Created on the first write.
+        Default is DEFAULT_CACHE_DIR.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR):
+        self.directory = directory
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def lookup(self, fingerprint, config):
+        """
+        Returns the recorded pass of a check on a dataset.
+
+        Parameters
+        ----------
+        fingerprint : str
+            The dataset fingerprint.
+        config : dict
+            The JSON-serializable check configuration.
+
+        Returns
+        -------
+        dict or None
+            The cache entry, or None if the check has not passed on the
+            dataset before.
+        """
+        path = self._path(_entry_key(fingerprint, config))
+        if not os.path.isfile(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def record(self, fingerprint, config, n_rows, seconds):
+        """
+        Records that a check passed on a dataset.
+
+        Parameters
+        ----------
+        fingerprint : str
+            The dataset fingerprint.
+        config : dict
+            The JSON-serializable check configuration.
+        n_rows : int
+            Number of rows of the dataset.
+        seconds : float
+            Run time of the check.
+
+        Returns
+        -------
+        dict
+            The written cache entry.
+        """
+        entry = {
+            "config": config,
+            "dataset": fingerprint,
+            "rows": int(n_rows),
+            "seconds": round(float(seconds), 3),
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(_entry_key(fingerprint, config)), "w") as f:
+            json.dump(entry, f, indent=2)
+        return entry
+
+    def entries(self):
+        """
+        Lists the cache entries.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per entry, oldest first, with the 'check', the first 12
+            hex digits of the 'dataset' fingerprint, 'rows', 'seconds' and
+            'created' time.
+        """
+        import pandas as pd
+        columns = ["check", "dataset", "rows", "seconds", "created"]
+        if not os.path.isdir(self.directory):
+            return pd.DataFrame(columns=columns)
+        rows = []
+        for filename in sorted(os.listdir(self.directory)):
+            if filename.endswith(".json"):
+                with open(os.path.join(self.directory, filename)) as f:
+                    entry = json.load(f)
+                rows.append((entry["config"]["check"], entry["dataset"][:12], entry["rows"],
+                             entry["seconds"], entry["created"]))
+        return pd.DataFrame(rows, columns=columns).sort_values("created", ignore_index=True)
+
+    def clear(self):
+        """
+        Deletes all cache entries.
+
+        Returns
+        -------
+        int
+            Number of deleted entries.
+        """
+        if not os.path.isdir(self.directory):
+            return 0
+        filenames = [name for name in os.listdir(self.directory) if name.endswith(".json")]
+        for filename in filenames:
+            os.remove(os.path.join(self.directory, filename))
+        return len(filenames)
@@ -6,7 +6,8 @@ Module for reading data to csv.
 
 This module contains functionality to read data to csv,
 ensuring correct filenames, directory path, datatype,
-and non-empty data frame.
+and non-empty data frame. Files named '.parquet' or '.arrow' are
+written in a columnar format instead (see `write_columnar`).
 
 Author: Tiffany A. Timbers (code taken from 
 https://github.com/ttimbers/breast-cancer-predictor/blob/3.0.0/src/write_csv.py)
@@ -14,6 +15,49 @@ https://github.com/ttimbers/breast-cancer-predictor/blob/3.0.0/src/write_csv.py)
 
 import os
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Columnar formats: zstd-compressed Parquet, or uncompressed Arrow IPC
+# (Feather v2) files that can be memory-mapped when read.
+COLUMNAR_EXTENSIONS = (".parquet", ".arrow")
+
+
+def _dense_columns(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """Returns dataframe with its sparse columns (e.g. one-hot features) as dense columns of their subtype."""
+    sparse_cols = {col: dtype.subtype for col, dtype in dataframe.dtypes.items() if isinstance(dtype, pd.SparseDtype)}
+    return dataframe.astype(sparse_cols) if sparse_cols else dataframe
+
+
+def write_columnar(dataframe: pd.DataFrame, filepath: str, index: bool = False):
+    """
+    Save a Pandas DataFrame to a Parquet or Arrow IPC file.
+
+    String columns are stored as dictionary-encoded categoricals, and all
+    column dtypes are kept, so readers neither re-parse nor re-infer them.
+    Sparse columns are stored as dense columns of their value dtype.
+
+    Parameters
+    ----------
+    dataframe : pandas.DataFrame
+        The DataFrame to save.
+    filepath : str
+        Path of the file, ending in '.parquet' or '.arrow'.
+    index : bool, optional
+        Whether to include the DataFrame's index. Default is False.
+    """
+    dataframe = _dense_columns(dataframe)
+    string_cols = [col for col in dataframe.columns
+                   if dataframe[col].dtype == object
+                   and pd.api.types.infer_dtype(dataframe[col], skipna=True) in ("string", "empty")]
+    table = pa.Table.from_pandas(dataframe.astype({col: "category" for col in string_cols}),
+                                 preserve_index=index)
+    if filepath.endswith(".parquet"):
+        pq.write_table(table, filepath, compression="zstd")
+    else:
+        with pa.OSFile(filepath, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
 
 def write_csv(dataframe: pd.DataFrame, directory: str, filename: str, index: bool = False):
     """
@@ -26,21 +70,23 @@ def write_csv(dataframe: pd.DataFrame, directory: str, filename: str, index: boo
     directory : str
         The directory where the file will be saved.
     filename : str
-        The name of the file (must include the '.csv' extension).
+        The name of the file (must include the '.csv' extension, or
+        '.parquet' / '.arrow' for a columnar file).
     index : bool, optional
         Whether to include the DataFrame's index in the CSV file. Default is False.
 
     Raises
     ------
     ValueError
-        If the filename does not end with '.csv', or the DataFrame is empty.
+        If the filename does not end with '.csv', '.parquet' or '.arrow', or
+        the DataFrame is empty.
     FileNotFoundError
         If the specified directory does not exist.
     TypeError
         If the input is not a pandas DataFrame.
     """
-    if not filename.endswith(".csv"):
-        raise ValueError("Filename must end with '.csv'")
+    if not filename.endswith((".csv",) + COLUMNAR_EXTENSIONS):
+        raise ValueError("Filename must end with '.csv', '.parquet' or '.arrow'")
     if not os.path.exists(directory):
         raise FileNotFoundError(f"Directory {directory} does not exist.")
     if not isinstance(dataframe, pd.DataFrame):
@@ -49,4 +95,7 @@ def write_csv(dataframe: pd.DataFrame, directory: str, filename: str, index: boo
         raise ValueError("DataFrame must contain observations.")
 
     filepath = os.path.join(directory, filename)
-    dataframe.to_csv(filepath, index=index)
\ No newline at end of file
+    if filename.endswith(COLUMNAR_EXTENSIONS):
+        write_columnar(dataframe, filepath, index)
+    else:
+        _dense_columns(dataframe).to_csv(filepath, index=index)
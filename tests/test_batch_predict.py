@@ -0,0 +1,88 @@
+"""
+Tests for batch and streaming prediction.
+
+This module tests that `stream_predictions` scores a file in chunks with
+the same results as predicting on the whole file at once, and that
+`load_pipeline` unwraps saved hyperparameter searches.
+"""
+import pickle
+import pytest
+import sys
+import os
+import pandas as pd
+import numpy as np
+from sklearn.compose import make_column_transformer
+from sklearn.model_selection import RandomizedSearchCV
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.batch_predict import load_pipeline, predict_with_scores, stream_predictions
+
+
+@pytest.fixture
+def scoring_data():
+    """Creates features with an id and a target column."""
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({'customer_id': np.arange(53), 'feat_A': rng.random(53), 'feat_B': rng.random(53)})
+    df['target'] = (df['feat_A'] > 0.5).astype(int)
+    return df
+
+
+@pytest.fixture
+def fitted_pipeline(scoring_data):
+    """Fits a small SVC pipeline on the scoring data."""
+    pipe = make_pipeline(make_column_transformer((StandardScaler(), ['feat_A', 'feat_B'])), SVC())
+    return pipe.fit(scoring_data[['feat_A', 'feat_B']], scoring_data['target'])
+
+
+def test_predict_with_scores_matches_predict(scoring_data, fitted_pipeline):
+    """Test that predictions derived from decision scores equal `predict`."""
+    X = scoring_data[['feat_A', 'feat_B']]
+    predictions, scores = predict_with_scores(fitted_pipeline, X)
+
+    np.testing.assert_array_equal(predictions, fitted_pipeline.predict(X))
+    np.testing.assert_allclose(scores, fitted_pipeline.decision_function(X))
+
+
+def test_stream_predictions_in_chunks(scoring_data, fitted_pipeline, tmp_path):
+    """Test that chunked scoring writes every row once, in order, with ids."""
+    input_path = tmp_path / "to_score.csv"
+    output_path = tmp_path / "predictions.csv"
+    scoring_data.to_csv(input_path, index=False)
+
+    n_rows = stream_predictions(fitted_pipeline, input_path, output_path, chunk_size=10, id_col='customer_id')
+    scored = pd.read_csv(output_path)
+
+    assert n_rows == len(scoring_data)
+    assert scored.columns.tolist() == ['customer_id', 'prediction', 'decision_score']
+    np.testing.assert_array_equal(scored['customer_id'], scoring_data['customer_id'])
+    np.testing.assert_array_equal(scored['prediction'],
+                                  fitted_pipeline.predict(scoring_data[['feat_A', 'feat_B']]))
+
+
+def test_stream_predictions_invalid_chunk_size(fitted_pipeline, tmp_path):
+    """Test that a non-positive chunk size raises a ValueError."""
+    with pytest.raises(ValueError, match="chunk_size must be a positive integer"):
+        stream_predictions(fitted_pipeline, tmp_path / "in.csv", tmp_path / "out.csv", chunk_size=0)
+
+
+def test_load_pipeline_unwraps_search(scoring_data, fitted_pipeline, tmp_path):
+    """Test that a pickled search is unwrapped to its best estimator."""
+    search = RandomizedSearchCV(fitted_pipeline, {"svc__C": [0.1, 1.0]}, n_iter=2, cv=3)
+    search.fit(scoring_data[['feat_A', 'feat_B']], scoring_data['target'])
+    model_path = tmp_path / "pipeline.pickle"
+    with open(model_path, "wb") as f:
+        pickle.dump(search, f)
+
+    loaded = load_pipeline(str(model_path))
+
+    assert not isinstance(loaded, RandomizedSearchCV)
+    assert loaded.get_params()["svc__C"] == search.best_params_["svc__C"]
+
+
+def test_load_pipeline_missing_file(tmp_path):
+    """Test that a missing pickle raises a FileNotFoundError."""
+    with pytest.raises(FileNotFoundError, match="does not exist"):
+        load_pipeline(str(tmp_path / "missing.pickle"))
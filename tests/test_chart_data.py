@@ -0,0 +1,82 @@
+"""
+Tests for the aggregated chart data of the EDA distribution plots.
+
+This module tests that the density curves are per-class densities over
+the column's extent with the bandwidth of Vega's density transform, that
+the rug ticks keep the observed values and the combined opacity of
+overlapping ticks, that the category counts match the data, and that the
+size of the chart data does not grow with the number of rows.
+"""
+import pytest
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.chart_data import bandwidth_nrd, category_counts, density_curves, rug_ticks, DENSITY_STEPS
+
+RAW_SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'data', 'raw', 'raw_data_sample.csv')
+
+
+@pytest.fixture
+def raw_df():
+    """Loads the raw data sample."""
+    return pd.read_csv(RAW_SAMPLE, index_col=0)
+
+
+def test_bandwidth_nrd():
+    """Test the normal reference bandwidth and its fallbacks for constant data."""
+    values = np.array([1.0, 2.0, 3.0, 4.0, 10.0])
+    iqr_scale = (4.0 - 2.0) / 1.34
+    assert bandwidth_nrd(values) == pytest.approx(1.06 * min(np.std(values, ddof=1), iqr_scale) * 5 ** -0.2)
+    assert bandwidth_nrd(np.array([3.0, 3.0])) == pytest.approx(1.06 * 3.0 * 2 ** -0.2)
+    assert bandwidth_nrd(np.array([0.0])) == pytest.approx(1.06)
+
+
+def test_density_curves(raw_df):
+    """Test that every class gets a density curve over the column's extent that integrates to about 1."""
+    curves = density_curves(raw_df, ['age', 'balance'], 'y')
+    assert list(pd.unique(curves['label'])) == list(pd.unique(raw_df['y']))
+    for (column, _), curve in curves.groupby(['column', 'label']):
+        assert len(curve) == DENSITY_STEPS + 1
+        assert curve['value'].iloc[0] == raw_df[column].min() and curve['value'].iloc[-1] == raw_df[column].max()
+        assert np.trapz(curve['density'], curve['value']) == pytest.approx(1, abs=0.1)
+
+
+def test_rug_ticks_and_category_counts(raw_df):
+    """Test that rug ticks keep the observed values and opacity, and that the counts add up."""
+    ticks = rug_ticks(raw_df, ['previous'])
+    assert set(ticks['value']) == set(raw_df['previous'])
+    combined = 1 - (1 - ticks['opacity']).groupby(ticks['value']).prod()
+    expected = 1 - 0.7 ** raw_df['previous'].astype(float).value_counts()
+    pd.testing.assert_series_equal(combined.sort_index(), expected.sort_index(), check_names=False)
+
+    counts = category_counts(raw_df, ['job', 'y'], 'y')
+    assert list(pd.unique(counts['column'])) == ['y', 'job']
+    job = counts[counts['column'] == 'job'].set_index(['category', 'label'])['count']
+    pd.testing.assert_series_equal(job.sort_index(), raw_df.groupby(['job', 'y'], dropna=False).size().sort_index(),
+                                   check_names=False, check_index_type=False)
+
+
+def test_size_does_not_grow_with_rows(raw_df):
+    """Test that ten times the rows, with many distinct values, give chart data of bounded size."""
+    large = raw_df.sample(len(raw_df) * 10, replace=True, random_state=0)
+    large['balance'] = large['balance'] + np.random.default_rng(0).uniform(0, 1, len(large))
+    numeric = ['age', 'balance']
+    assert len(density_curves(large, numeric, 'y')) == len(density_curves(raw_df, numeric, 'y'))
+    assert len(category_counts(large, ['job'], 'y')) == len(category_counts(raw_df, ['job'], 'y'))
+    ticks = rug_ticks(large, ['balance'])
+    assert len(ticks) <= 16 * 1001 and len(ticks) < len(large) / 4
+
+
+def test_categorical_columns_give_the_same_data(raw_df):
+    """Test that categorical columns, with a missing label, give the chart data of object columns."""
+    raw_df = raw_df.head(200).copy()
+    raw_df.loc[raw_df.index[0], 'y'] = np.nan
+    typed = raw_df.astype({'job': 'category', 'y': 'category'})
+    pd.testing.assert_frame_equal(density_curves(typed, ['age'], 'y'), density_curves(raw_df, ['age'], 'y'))
+    sort = ['column', 'category', 'label']
+    pd.testing.assert_frame_equal(
+        category_counts(typed, ['job'], 'y').sort_values(sort, ignore_index=True),
+        category_counts(raw_df, ['job'], 'y').sort_values(sort, ignore_index=True))
@@ -0,0 +1,102 @@
+"""
+Tests for the native correlation engine.
+
+Checks that the correlation matrices and predictive power scores of
+`src.correlation_engine` match the Deepchecks checks they replace, on data
+with missing values and rare categories.
+"""
+import pytest
+import sys
+import os
+import warnings
+import numpy as np
+import pandas as pd
+from scipy.stats.contingency import association, crosstab
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.correlation_engine import feature_feature_correlation, pairs_above_threshold, predictive_power_scores
+from src.correlation_engine import _feature_pps
+from src.feature_correlation import feature_corr
+
+warnings.filterwarnings("ignore", category=FutureWarning)
+warnings.filterwarnings("ignore", category=UserWarning)
+
+
+@pytest.fixture
+def mixed_df():
+    """Numeric and categorical features with missing values, a rare category and a correlated pair."""
+    rng = np.random.default_rng(0)
+    n_rows = 600
+    df = pd.DataFrame({
+        'a': rng.normal(size=n_rows),
+        'b': rng.integers(0, 5, n_rows).astype(float),
+        'c': rng.choice(['x', 'y', 'z', 'rare'], n_rows, p=[0.4, 0.3, 0.295, 0.005]),
+        'd': rng.choice(['p', 'q'], n_rows),
+        'e': rng.integers(0, 3, n_rows),
+    })
+    df.loc[rng.random(n_rows) < 0.1, 'a'] = np.nan
+    df.loc[rng.random(n_rows) < 0.1, 'c'] = np.nan
+    df['f'] = 2 * df['a'] + rng.normal(size=n_rows) * 0.1
+    df['y'] = (df['b'] > 2).astype(int) + (df['d'] == 'p')
+    return df
+
+
+def test_feature_feature_correlation_matches_deepchecks(mixed_df):
+    """Spearman, Theil's U and correlation ratio entries equal the Deepchecks matrix."""
+    from deepchecks.tabular import Dataset
+    from deepchecks.tabular.checks import FeatureFeatureCorrelation
+
+    expected = FeatureFeatureCorrelation().run(Dataset(mixed_df, label='y', cat_features=['c', 'd'])).value
+    result = feature_feature_correlation(mixed_df, 'y', ['c', 'd']).loc[expected.index, expected.columns]
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(dtype=float), atol=1e-12)
+
+
+def test_cramers_v_and_pearson(mixed_df):
+    """The alternative methods give Cramér's V and Pearson correlation."""
+    result = feature_feature_correlation(mixed_df, 'y', ['c', 'd'], numeric_method='pearson',
+                                         categorical_method='cramers_v')
+    valid = mixed_df.dropna(subset=['c'])
+    assert result.loc['c', 'd'] == pytest.approx(association(crosstab(valid['c'], valid['d']).count, method='cramer'))
+    assert result.loc['a', 'f'] == pytest.approx(mixed_df['a'].corr(mixed_df['f']))
+    with pytest.raises(ValueError, match="Unknown numeric method"):
+        feature_feature_correlation(mixed_df, 'y', ['c', 'd'], numeric_method='kendall')
+
+
+def test_pairs_above_threshold(mixed_df):
+    """Each pair above the threshold is listed once."""
+    matrix = feature_feature_correlation(mixed_df, 'y', ['c', 'd'])
+    assert pairs_above_threshold(matrix, 0.92) == [('a', 'f')]
+
+
+@pytest.mark.parametrize('random_state', [1, 123])
+def test_predictive_power_scores_match_ppscore(mixed_df, random_state):
+    """The decision tree emulation gives the ppscore scores on numeric and categorical features."""
+    from deepchecks import ppscore
+
+    y = mixed_df['y'].astype(object)
+    for col in ['a', 'b', 'c', 'd', 'e', 'f']:
+        expected = ppscore.score(pd.DataFrame({col: mixed_df[col], 'y': y}), col, 'y', sample=5000,
+                                 cross_validation=4, random_seed=random_state, invalid_score=0,
+                                 catch_errors=False)['ppscore']
+        assert _feature_pps(mixed_df[col], y, 5000, 4, random_state) == pytest.approx(expected, abs=1e-12)
+
+
+def test_predictive_power_scores_parallel(mixed_df):
+    """Parallel workers give the same scores, highest first."""
+    scores = predictive_power_scores(mixed_df, 'y')
+    assert scores.is_monotonic_decreasing and scores.iloc[0] > 0.1
+    pd.testing.assert_series_equal(predictive_power_scores(mixed_df, 'y', n_jobs=2), scores)
+
+
+def test_feature_corr_engines_agree(mixed_df):
+    """Both engines pass uncorrelated data and fail on the same correlated pair."""
+    rng = np.random.default_rng(1)
+    data = mixed_df.drop(columns='f').dropna().rename(columns={'c': 'job', 'd': 'month'})
+    for col in ['marital', 'education', 'default', 'housing', 'loan', 'contact', 'pdays_contacted']:
+        data[col] = rng.choice(['u', 'v', 'w'], len(data))
+    for engine in ['native', 'deepchecks']:
+        feature_corr(data, 'y', engine=engine)
+        with pytest.raises(ValueError, match="Feature-feature correlation exceeds"):
+            feature_corr(data.assign(f=data['a'] * 2), 'y', engine=engine)
+    with pytest.raises(ValueError, match="Unknown correlation engine"):
+        feature_corr(data, 'y', engine='ppscore')
@@ -11,6 +11,7 @@ Test Categories
 
 The test data files are stored in the same directory as this test file.
 """
+import functools
 import pytest
 import pandas as pd
 import os
@@ -19,7 +20,7 @@ import numpy as np
 
 # Add the src directory to the Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.create_visualizations import create_visualizations
+from src.create_visualizations import create_visualizations, correlation_chart, correlation_data, figure_jobs
 
 # Define the path to test data directory
 test_data_dir = os.path.dirname(__file__)
@@ -94,3 +95,64 @@ def test_visualizations_missing_target_column(temp_output_dir):
     df_no_y = pd.read_csv(os.path.join(test_data_dir, 'missing_y_column.csv'))
     with pytest.raises(KeyError):
         create_visualizations(df_no_y, df_no_y, temp_output_dir)
+
+def test_unchanged_figures_are_skipped(sample_dataframe, temp_output_dir):
+    """
+    Tests that figures are rendered again only when their input data changes.
+    """
+    first = create_visualizations(sample_dataframe, sample_dataframe, temp_output_dir)
+    assert set(first['status']) == {"rendered"}
+    second = create_visualizations(sample_dataframe, sample_dataframe, temp_output_dir)
+    assert set(second['status']) == {"unchanged"}
+
+    # new categorical values change only the categorical plot
+    changed = sample_dataframe.assign(job="student")
+    third = create_visualizations(changed, sample_dataframe, temp_output_dir)
+    assert dict(zip(third['figure'], third['status'])) == {
+        "numeric_univariate.png": "unchanged",
+        "categorical_univariate.png": "rendered",
+        "correlation_plot.png": "unchanged",
+    }
+    forced = create_visualizations(changed, sample_dataframe, temp_output_dir, force=True)
+    assert set(forced['status']) == {"rendered"}
+
+def test_changed_chart_code_renders_again(sample_dataframe, temp_output_dir, monkeypatch):
+    """
+    Tests that a figure is rendered again when its chart-building code changes.
+    """
+    create_visualizations(sample_dataframe, sample_dataframe, temp_output_dir)
+    square_chart = functools.partial(correlation_chart, mark='square')
+    monkeypatch.setattr('src.create_visualizations.correlation_chart', square_chart)
+
+    summary = create_visualizations(sample_dataframe, sample_dataframe, temp_output_dir)
+    assert dict(zip(summary['figure'], summary['status'])) == {
+        "numeric_univariate.png": "unchanged",
+        "categorical_univariate.png": "unchanged",
+        "correlation_plot.png": "rendered",
+    }
+
+def test_correlation_chart_matches_altair_ally(sample_dataframe):
+    """
+    Tests that the chart of the precomputed correlations is the altair_ally correlation plot.
+    """
+    import altair_ally as aly
+    expected = aly.corr(sample_dataframe).to_dict()
+    chart = correlation_chart(correlation_data(sample_dataframe)).to_dict()
+    assert sorted(chart['datasets'].values(), key=str) == sorted(expected['datasets'].values(), key=str)
+    for spec in (chart, expected):
+        spec.pop('datasets')
+        for subplot in spec['concat']:
+            for key in ('data', 'params', 'name'):
+                subplot.pop(key, None)
+    assert chart == expected
+
+def test_distribution_data_does_not_grow_with_rows(sample_dataframe):
+    """
+    Tests that the distribution plots get aggregates whose size does not depend on the number of rows.
+    """
+    jobs = [figure_jobs(df, df) for df in (pd.concat([sample_dataframe] * n, ignore_index=True) for n in (20, 80))]
+    (curves, ticks), (large_curves, large_ticks) = (job["numeric_univariate.png"][2] for job in jobs)
+    assert len(curves) == len(large_curves) and len(ticks) == len(large_ticks)
+    counts, large_counts = (job["categorical_univariate.png"][2] for job in jobs)
+    assert len(counts) == len(large_counts)
+    assert large_counts['count'].sum() == 80 * len(sample_dataframe) * counts['column'].nunique()
@@ -0,0 +1,157 @@
+"""
+Tests for the distributed randomized search.
+
+This module tests that `DistributedSearchCV` scores the same candidates as
+the randomized search, that a search run again resumes from its trial store
+(including trials abandoned by a dead worker), and that workers only run
+the searches of their own pipeline on their own data.
+"""
+import sqlite3
+import time
+import pytest
+import sys
+import os
+import pandas as pd
+import numpy as np
+from sklearn.compose import make_column_transformer
+from sklearn.preprocessing import StandardScaler
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.distributed_search import DistributedSearchCV, TrialStore, _Lease, data_fingerprint, run_worker, search_key
+from src.random_search_svc import search_svc
+from src.svc_models import build_svc_pipeline
+
+
+@pytest.fixture
+def training_data():
+    """Creates numerical data with a learnable target."""
+    rng = np.random.default_rng(4)
+    X = pd.DataFrame({'feat_A': rng.random(60), 'feat_B': rng.random(60)})
+    y = pd.Series((X['feat_A'] + 0.3 * rng.random(60) > 0.6).astype(int), name='target')
+    return X, y
+
+
+@pytest.fixture
+def preprocessor():
+    return make_column_transformer((StandardScaler(), ['feat_A', 'feat_B']))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return str(tmp_path / "trials.sqlite")
+
+
+def test_distributed_search_matches_random_search(training_data, preprocessor, store):
+    """Test that the distributed search selects the same candidate with the same scores."""
+    X, y = training_data
+    random_search = search_svc(X, y, preprocessor, 522, n_iter=6)
+    distributed = search_svc(X, y, preprocessor, 522, search='distributed', n_iter=6, store=store)
+
+    assert isinstance(distributed, DistributedSearchCV)
+    assert distributed.best_params_ == pytest.approx(random_search.best_params_)
+    np.testing.assert_allclose(distributed.cv_results_['mean_test_score'], random_search.cv_results_['mean_test_score'])
+    np.testing.assert_allclose(distributed.cv_results_['mean_train_score'],
+                               random_search.cv_results_['mean_train_score'])
+    np.testing.assert_array_equal(distributed.predict(X), random_search.predict(X))
+
+
+def test_distributed_search_local_workers(training_data, preprocessor, store):
+    """Test that the trials are shared between several local worker processes."""
+    X, y = training_data
+    pipe, param_dist = build_svc_pipeline(preprocessor, 522)
+    search = DistributedSearchCV(pipe, param_dist, store=store, n_iter=8, random_state=522, n_workers=2).fit(X, y)
+
+    assert len(search.worker_trials_) == 2
+    assert sum(search.worker_trials_) == 8
+    assert TrialStore(store).status(search.search_key_) == {'done': 8}
+
+
+def test_distributed_search_resumes(training_data, preprocessor, store):
+    """Test that an interrupted search only runs its unfinished trials when run again."""
+    X, y = training_data
+    pipe, param_dist = build_svc_pipeline(preprocessor, 522)
+    search = DistributedSearchCV(pipe, param_dist, store=store, n_iter=6, random_state=522)
+    first = search.fit(X, y).cv_results_['mean_test_score']
+    assert not search.resumed_
+
+    # two trials never ran and one was claimed by a worker that died
+    with sqlite3.connect(store) as connection:
+        connection.execute("UPDATE trials SET status = 'pending', test_scores = NULL WHERE id IN (1, 4)")
+        connection.execute("UPDATE trials SET status = 'running', heartbeat = 0, test_scores = NULL WHERE id = 2")
+
+    search.fit(X, y)
+    assert search.resumed_
+    assert search.worker_trials_ == [3]
+    np.testing.assert_allclose(search.cv_results_['mean_test_score'], first)
+
+
+def test_run_worker_other_data(training_data, preprocessor, store):
+    """Test that a worker does not run the trials of a search on other data."""
+    X, y = training_data
+    pipe, param_dist = build_svc_pipeline(preprocessor, 522)
+    search = DistributedSearchCV(pipe, param_dist, store=store, n_iter=4, random_state=522)
+    search.fit(X.head(40), y.head(40))
+
+    with sqlite3.connect(store) as connection:
+        connection.execute("UPDATE trials SET status = 'pending'")
+
+    assert run_worker(store, pipe, X, y) == 0
+    assert run_worker(store, pipe, X.head(40), y.head(40)) == 4
+
+
+def test_distributed_search_new_candidates(training_data, preprocessor, store):
+    """Test that a search with other candidates is added next to the existing one."""
+    X, y = training_data
+    pipe, param_dist = build_svc_pipeline(preprocessor, 522)
+    first = DistributedSearchCV(pipe, param_dist, store=store, n_iter=3, random_state=522).fit(X, y)
+    second = DistributedSearchCV(pipe, param_dist, store=store, n_iter=3, random_state=7).fit(X, y)
+
+    assert not second.resumed_
+    assert second.search_key_ != first.search_key_
+    assert second.worker_trials_ == [3]
+
+
+def test_search_key_depends_on_parameters_not_objects(training_data, preprocessor):
+    """Test that the search key is computed from the pipeline parameters and the fold indices."""
+    X, y = training_data
+    pipe, param_dist = build_svc_pipeline(preprocessor, 522)
+    data = data_fingerprint(X, y)
+    splits = [(np.arange(0, 30), np.arange(30, 60)), (np.arange(30, 60), np.arange(0, 30))]
+    candidates = [{'svc__C': 1.0, 'svc__gamma': 0.1}]
+
+    key = search_key(data, pipe, splits, candidates)
+    assert search_key(data, build_svc_pipeline(preprocessor, 522)[0], splits, candidates) == key
+    assert search_key(data, pipe.set_params(svc__tol=1e-2), splits, candidates) != key
+    assert search_key(data, pipe, splits[::-1], candidates) != key
+
+
+def test_lease_renewal_is_bounded(training_data, preprocessor, store):
+    """Test that a worker stops renewing its lease after max_trial_seconds, so another worker takes the trial."""
+    X, y = training_data
+    pipe, _ = build_svc_pipeline(preprocessor, 522)
+    trial_store = TrialStore(store)
+    trial_store.add_search('key', data_fingerprint(X, y), pipe, [], [{'svc__C': 1.0}])
+    trial_id, _ = trial_store.claim('key', 'hung', lease_seconds=0.3)
+
+    with _Lease(trial_store, 'key', trial_id, 'hung', lease_seconds=0.3, max_seconds=0.5):
+        time.sleep(0.6)
+        assert trial_store.claim('key', 'other', lease_seconds=0.3) is None
+        time.sleep(1.0)
+        # the hung worker still holds the trial, but its lease ran out
+        assert trial_store.claim('key', 'other', lease_seconds=0.3) == (trial_id, {'svc__C': 1.0})
+    trial_store.close()
+
+
+def test_run_worker_other_pipeline(training_data, preprocessor, store):
+    """Test that the store holds no pickles and a worker only runs the searches of its own pipeline."""
+    X, y = training_data
+    pipe, param_dist = build_svc_pipeline(preprocessor, 522)
+    DistributedSearchCV(pipe, param_dist, store=store, n_iter=4, random_state=522).fit(X, y)
+
+    with sqlite3.connect(store) as connection:
+        connection.execute("UPDATE trials SET status = 'pending'")
+        types = connection.execute("SELECT DISTINCT typeof(estimator), typeof(cv) FROM searches").fetchall()
+    assert types == [('text', 'text')]
+
+    assert run_worker(store, build_svc_pipeline(preprocessor, 7)[0], X, y) == 0
+    assert run_worker(store, build_svc_pipeline(preprocessor, 522)[0], X, y) == 4
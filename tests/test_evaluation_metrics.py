@@ -0,0 +1,102 @@
+"""
+Tests for the single-pass evaluation metrics.
+
+This module tests that the tables derived from `evaluate_classifier` match
+sklearn's metrics computed from separate prediction calls, that the model
+is only run once, and that the plots are written.
+"""
+import pytest
+import sys
+import os
+import pandas as pd
+import numpy as np
+import matplotlib.pyplot as plt
+from sklearn.metrics import accuracy_score, classification_report
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.evaluation_metrics import (
+    evaluate_classifier, score_table, classification_report_table, save_evaluation_plots
+)
+
+
+class CountingSVC(SVC):
+    """SVC that counts how often it is asked to evaluate rows."""
+    calls = 0
+
+    def decision_function(self, X):
+        CountingSVC.calls += 1
+        return super().decision_function(X)
+
+    def predict(self, X):
+        CountingSVC.calls += 1
+        return super().predict(X)
+
+
+@pytest.fixture
+def evaluation_data():
+    """Creates a fitted pipeline and an evaluation set."""
+    rng = np.random.default_rng(5)
+    X = pd.DataFrame({'feat_A': rng.random(60), 'feat_B': rng.random(60)})
+    y = pd.Series((X['feat_A'] + 0.3 * rng.random(60) > 0.7).astype(int), name='target')
+    pipe = make_pipeline(StandardScaler(), CountingSVC()).fit(X, y)
+    return pipe, X, y
+
+
+def test_tables_match_sklearn_metrics(evaluation_data):
+    """Test that tables built from cached arrays equal the usual metrics."""
+    pipe, X, y = evaluation_data
+    CountingSVC.calls = 0
+    evaluation = evaluate_classifier(pipe, X, y)
+    scores = score_table(evaluation).set_index("metric")["score"]
+    report = classification_report_table(evaluation)
+
+    assert CountingSVC.calls == 1
+    assert scores["accuracy"] == round(accuracy_score(y, pipe.predict(X)), 4)
+    assert {"roc_auc", "average_precision"} <= set(scores.index)
+    expected = pd.DataFrame(classification_report(y, pipe.predict(X), output_dict=True)).T.round(2)
+    pd.testing.assert_frame_equal(report, expected)
+
+
+def test_score_table_single_class(evaluation_data):
+    """Test that ranking metrics are skipped when only one class is present."""
+    pipe, X, y = evaluation_data
+    mask = (y == 0).to_numpy()
+    evaluation = evaluate_classifier(pipe, X[mask], y[mask])
+
+    assert score_table(evaluation)["metric"].tolist() == ["accuracy"]
+
+
+def test_save_evaluation_plots(evaluation_data, tmp_path):
+    """Test that the confusion matrix and curve plots are written."""
+    pipe, X, y = evaluation_data
+    evaluation = evaluate_classifier(pipe, X, y)
+
+    paths = save_evaluation_plots(evaluation, str(tmp_path), "test_svc", "Test Data")
+
+    assert [os.path.basename(path) for path in paths] == [
+        "test_svc_confusion_matrix.png", "test_svc_roc_curve.png", "test_svc_pr_curve.png"
+    ]
+    assert all(os.path.isfile(path) for path in paths)
+
+
+def test_save_evaluation_plots_model_name(evaluation_data, tmp_path, monkeypatch):
+    """Test that the plot titles and legends name the model family."""
+    pipe, X, y = evaluation_data
+    evaluation = evaluate_classifier(pipe, X, y)
+    titles, legends = [], []
+
+    def record(path):
+        axes = plt.gcf().axes[0]
+        titles.append(axes.get_title())
+        legend = axes.get_legend()
+        legends.extend(text.get_text() for text in (legend.get_texts() if legend else []))
+
+    monkeypatch.setattr(plt, "savefig", record)
+    save_evaluation_plots(evaluation, str(tmp_path), "test_lr", "Test Data", "logistic_regression")
+
+    assert titles[0] == "Test Data: Confusion Matrix for Logistic Regression model"
+    assert all("Logistic Regression" in title and "SVC" not in title for title in titles)
+    assert legends and all(text.startswith("Logistic Regression") for text in legends)
@@ -0,0 +1,105 @@
+"""
+Tests for the compiled fast-path predictor.
+
+This module tests that `compile_pipeline` produces a predictor with the same
+predictions and decision scores as the fitted sklearn pipeline, for whole
+batches, chunked batches and single records.
+"""
+import pytest
+import sys
+import os
+import pandas as pd
+import numpy as np
+from sklearn.compose import make_column_transformer
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.fast_predictor import compile_pipeline
+from src.svc_models import build_svc_pipeline
+
+
+@pytest.fixture
+def features():
+    """Creates processed features with missing categorical values."""
+    rng = np.random.default_rng(5)
+    n = 120
+    df = pd.DataFrame({
+        'job': rng.choice(['admin.', 'technician', 'services', 'retired'], n).astype(object),
+        'month': rng.choice(['jan', 'feb', 'mar'], n),
+        'education': rng.choice(['primary', 'secondary', 'tertiary'], n).astype(object),
+        'age': rng.integers(18, 90, n),
+        'balance': rng.normal(1000, 800, n),
+        'duration': rng.integers(0, 900, n),
+    })
+    df.loc[::8, 'job'] = np.nan
+    df.loc[::5, 'education'] = np.nan
+    df['target'] = ((df['duration'] > 450) ^ (df['job'] == 'retired')).astype(int)
+    return df
+
+
+@pytest.fixture(params=[("exact", "dense"), ("exact", "sparse"), ("approx", "dense"), ("approx", "sparse")],
+                ids=lambda param: "-".join(param))
+def fitted_pipeline(request, features):
+    """Fits the SVC pipeline with a preprocessor shaped like scripts/preprocess.py.
+
+    The 'sparse' preprocessor outputs a float CSR matrix, as in scripts/preprocess.py,
+    so the model stores sparse support vectors; the 'dense' one outputs an object array.
+    """
+    mode, output = request.param
+    ordinal_dtype, sparse_threshold = (np.float64, 1.0) if output == "sparse" else (object, 0.3)
+    preprocessor = make_column_transformer(
+        (make_pipeline(SimpleImputer(strategy='most_frequent'), OneHotEncoder(handle_unknown='ignore')),
+         ['job', 'month']),
+        (make_pipeline(SimpleImputer(strategy='most_frequent'),
+                       OrdinalEncoder(categories=[['unknown', 'primary', 'secondary', 'tertiary']],
+                                      dtype=ordinal_dtype)),
+         ['education']),
+        (StandardScaler(), ['age', 'balance', 'duration']),
+        sparse_threshold=sparse_threshold,
+    )
+    pipe, _ = build_svc_pipeline(preprocessor, 522, mode)
+    return pipe.fit(features.drop(columns='target'), features['target'])
+
+
+def test_fast_predictor_matches_pipeline(features, fitted_pipeline):
+    """Test batch predictions, including unknown categories, in several chunks."""
+    X = features.drop(columns='target')
+    X.loc[1, 'job'] = 'astronaut'
+    predictor = compile_pipeline(fitted_pipeline)
+    predictor.batch_size = 50
+
+    np.testing.assert_array_equal(predictor.predict(X), fitted_pipeline.predict(X))
+    np.testing.assert_allclose(predictor.decision_function(X), fitted_pipeline.decision_function(X), atol=1e-10)
+
+
+def test_fast_predictor_single_records(features, fitted_pipeline):
+    """Test that single records score like the same rows in a batch."""
+    X = features.drop(columns='target')
+    predictor = compile_pipeline(fitted_pipeline)
+    expected = fitted_pipeline.decision_function(X)
+
+    for i, record in enumerate(X.head(20).to_dict(orient='records')):
+        assert predictor.decision_record(record) == pytest.approx(expected[i], abs=1e-10)
+        assert predictor.predict_record(record) == fitted_pipeline.predict(X.iloc[[i]])[0]
+
+
+def test_fast_predictor_missing_numeric(features, fitted_pipeline):
+    """Test that missing numeric values raise like the sklearn pipeline."""
+    X = features.drop(columns='target')
+    X.loc[3, 'age'] = np.nan
+    predictor = compile_pipeline(fitted_pipeline)
+
+    with pytest.raises(ValueError, match="Input X contains NaN."):
+        predictor.decision_function(X)
+    with pytest.raises(ValueError, match="Input X contains NaN."):
+        predictor.decision_record({'job': 'admin.', 'month': 'jan', 'education': 'primary', 'balance': 1.0})
+
+
+def test_fast_predictor_missing_columns(features, fitted_pipeline):
+    """Test that missing input columns raise a ValueError."""
+    predictor = compile_pipeline(fitted_pipeline)
+
+    with pytest.raises(ValueError, match="missing required columns: \\['month'\\]"):
+        predictor.decision_function(features.drop(columns=['target', 'month']))
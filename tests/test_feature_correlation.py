@@ -16,6 +16,7 @@ import numpy as np
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from src.feature_correlation import feature_corr
+from src.validation_cache import ValidationCache
 
 @pytest.fixture
 def sample_validation_df():
@@ -119,4 +120,22 @@ def test_feature_corr_wrong_type():
     
     # Raise an error for Wrong input
     with pytest.raises((TypeError, AttributeError, ValueError)):
-        feature_corr(invalid_input, 'target')
\ No newline at end of file
+        feature_corr(invalid_input, 'target')
+
+def test_feature_corr_skips_cached_checks(sample_validation_df, tmp_path, capsys):
+    """Test that checks that passed on the same data are skipped, and failures are not cached."""
+    cache = ValidationCache(str(tmp_path))
+    feature_corr(sample_validation_df, 'target', cache=cache)
+    assert len(cache.entries()) == 2
+
+    # same content read back from a CSV file
+    sample_validation_df.to_csv(tmp_path / "data.csv", index=False)
+    capsys.readouterr()
+    feature_corr(pd.read_csv(tmp_path / "data.csv"), 'target', cache=cache)
+    assert capsys.readouterr().out.count("already passed on this data; skipped") == 2
+
+    # different data is checked again
+    sample_validation_df['balance'] = sample_validation_df['age']
+    with pytest.raises(ValueError, match="Feature-feature correlation exceeds"):
+        feature_corr(sample_validation_df, 'target', cache=cache)
+    assert len(cache.entries()) == 3
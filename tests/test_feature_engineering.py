@@ -0,0 +1,89 @@
+"""
+Tests for the feature engineering transformer.
+
+This module tests that `FeatureEngineer` derives `pdays_contacted`, drops
+the unused columns, stores the categorical columns as categoricals with the
+fitted categories, keeps unseen categories and does not modify its input,
+and that `encode_target` maps the target to 0/1.
+"""
+import pytest
+import sys
+import os
+import pandas as pd
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.feature_engineering import FeatureEngineer, engineer_features, encode_target
+
+
+@pytest.fixture
+def raw_df():
+    """Creates raw records with missing categorical values."""
+    return pd.DataFrame({
+        'age': [30, 45, 61, 72, 25, 38],
+        'job': ['admin.', 'technician', np.nan, 'retired', 'admin.', 'services'],
+        'education': ['primary', 'tertiary', 'secondary', np.nan, 'primary', 'tertiary'],
+        'day_of_week': [5, 6, 7, 8, 9, 12],
+        'balance': [1000, -20, 0, 350, 12, 77],
+        'pdays': [-1, 120, -1, 3, -1, 40],
+        'poutcome': [np.nan, 'success', np.nan, 'failure', np.nan, 'other'],
+        'y': ['no', 'yes', 'no', 'yes', 'no', 'no'],
+    })
+
+
+@pytest.mark.parametrize("categorical_input", [False, True])
+def test_feature_engineer_transform(raw_df, categorical_input):
+    """Test the output columns, dtypes and values for object and categorical input."""
+    if categorical_input:
+        raw_df = raw_df.astype({'job': 'category', 'education': 'category'})
+    original = raw_df.copy()
+    features = FeatureEngineer().fit_transform(raw_df)
+
+    assert list(features.columns) == ['age', 'job', 'education', 'balance', 'pdays_contacted']
+    assert features['job'].cat.categories.tolist() == ['admin.', 'retired', 'services', 'technician']
+    assert features['pdays_contacted'].tolist() == ['never', 'contacted', 'never', 'contacted', 'never', 'contacted']
+    assert features['job'].isna().tolist() == raw_df['job'].isna().tolist()
+    assert features['age'].dtype == np.int64
+    pd.testing.assert_frame_equal(raw_df, original)
+
+
+@pytest.mark.parametrize("categorical_input", [False, True])
+def test_feature_engineer_unseen_categories(raw_df, categorical_input):
+    """Test that categories not seen in fit are kept as extra categories."""
+    engineer = FeatureEngineer().fit(raw_df)
+    new_df = raw_df.head(3).assign(job=['astronaut', 'admin.', np.nan])
+    if categorical_input:
+        new_df = new_df.astype({'job': 'category'})
+    features = engineer.transform(new_df)
+
+    assert features['job'].tolist()[:2] == ['astronaut', 'admin.']
+    assert pd.isna(features['job'].iloc[2])
+    assert features['job'].cat.categories.tolist()[-1] == 'astronaut'
+
+
+def test_feature_engineer_given_categories(raw_df):
+    """Test that given categories are used instead of learned ones."""
+    engineer = FeatureEngineer(categories={'education': ['primary', 'secondary', 'tertiary', 'unknown']})
+    features = engineer.fit_transform(raw_df)
+
+    assert features['education'].cat.categories.tolist() == ['primary', 'secondary', 'tertiary', 'unknown']
+    assert list(engineer.get_feature_names_out()) == list(features.columns)
+
+
+def test_feature_engineer_errors(raw_df):
+    """Test that transforming before fit, or without 'pdays', raises a ValueError."""
+    with pytest.raises(ValueError, match="not fitted yet"):
+        FeatureEngineer().transform(raw_df)
+    with pytest.raises(ValueError, match="missing required column 'pdays'"):
+        engineer_features(raw_df.drop(columns='pdays'))
+
+
+def test_encode_target(raw_df):
+    """Test the 0/1 target encoding, with NaN for other values."""
+    y = encode_target(raw_df['y'])
+    assert y.dtype == np.int64
+    assert y.tolist() == [0, 1, 0, 1, 0, 0]
+
+    y = encode_target(pd.Series(['yes', 'maybe', np.nan], name='y'))
+    assert y.iloc[0] == 1
+    assert y.iloc[1:].isna().all()
@@ -0,0 +1,132 @@
+"""
+Tests for out-of-core incremental training.
+
+This module tests that `train_incremental` trains on a file chunk by chunk
+like successive `partial_fit_pipeline` calls, that an interrupted run
+resumes from its checkpoint with the same result as an uninterrupted one,
+that a file is not trained on twice, and that the trained pipeline can be
+compiled into the fast-path predictor.
+"""
+import pytest
+import sys
+import os
+import pandas as pd
+import numpy as np
+from sklearn.compose import make_column_transformer
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import src.incremental_training as incremental_training
+from src.fast_predictor import compile_pipeline
+from src.incremental_training import (build_incremental_pipeline, load_checkpoint, partial_fit_pipeline,
+                                      train_incremental)
+from src.read_data import read_data
+
+
+@pytest.fixture
+def preprocessor():
+    """Creates a preprocessor shaped like scripts/preprocess.py."""
+    return make_column_transformer(
+        (make_pipeline(SimpleImputer(strategy='most_frequent'), OneHotEncoder(handle_unknown='ignore')),
+         ['job', 'month']),
+        (StandardScaler(), ['age', 'balance', 'duration']),
+        sparse_threshold=1.0,
+    )
+
+
+@pytest.fixture
+def train_file(tmp_path):
+    """Writes processed training data to a CSV file."""
+    rng = np.random.default_rng(11)
+    n = 200
+    df = pd.DataFrame({
+        'job': rng.choice(['admin.', 'technician', 'services', 'retired'], n),
+        'month': rng.choice(['jan', 'feb', 'mar'], n),
+        'age': rng.integers(18, 90, n),
+        'balance': rng.normal(1000, 800, n).round(2),
+        'duration': rng.integers(0, 900, n),
+    })
+    df['target'] = ((df['duration'] > 450) ^ (df['job'] == 'retired')).astype(int)
+    path = tmp_path / "train.csv"
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def test_train_incremental_matches_partial_fit(preprocessor, train_file):
+    """Test that streaming a file trains like partial_fit calls on its chunks."""
+    state = train_incremental(train_file, preprocessor=preprocessor, chunk_size=60)
+
+    df = read_data(train_file, typed=True)
+    expected = build_incremental_pipeline(preprocessor, 522)
+    for start in range(0, len(df), 60):
+        chunk = df.iloc[start:start + 60]
+        partial_fit_pipeline(expected, chunk.drop(columns='target'), chunk['target'])
+
+    assert state['n_rows'] == len(df)
+    np.testing.assert_allclose(state['pipeline'].decision_function(df), expected.decision_function(df))
+
+
+def test_train_incremental_resumes_interrupted_run(preprocessor, train_file, tmp_path, monkeypatch):
+    """Test that a run interrupted after two chunks resumes from its checkpoint."""
+    checkpoint = str(tmp_path / "checkpoint.pickle")
+    expected = train_incremental(train_file, preprocessor=preprocessor, chunk_size=60)
+
+    calls = []
+
+    def interrupted_partial_fit(pipe, X, y):
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        calls.append(len(X))
+        return partial_fit_pipeline(pipe, X, y)
+
+    monkeypatch.setattr(incremental_training, "partial_fit_pipeline", interrupted_partial_fit)
+    with pytest.raises(KeyboardInterrupt):
+        train_incremental(train_file, checkpoint, preprocessor, chunk_size=60)
+    assert load_checkpoint(checkpoint)['n_rows'] == 120
+
+    monkeypatch.undo()
+    state = train_incremental(train_file, checkpoint, chunk_size=60)
+    X = read_data(train_file).drop(columns='target')
+    assert state['n_rows'] == 200
+    np.testing.assert_allclose(state['pipeline'].decision_function(X), expected['pipeline'].decision_function(X))
+
+
+def test_train_incremental_skips_trained_file(preprocessor, train_file, tmp_path):
+    """Test that a file already in the checkpoint is not trained on again, and a new one is."""
+    checkpoint = str(tmp_path / "checkpoint.pickle")
+    train_incremental(train_file, checkpoint, preprocessor, chunk_size=60)
+    coef = load_checkpoint(checkpoint)['pipeline'][-1].coef_.copy()
+
+    state = train_incremental(train_file, checkpoint, chunk_size=60)
+    assert state['n_rows'] == 200
+    np.testing.assert_array_equal(state['pipeline'][-1].coef_, coef)
+
+    new_file = str(tmp_path / "new_week.csv")
+    read_data(train_file).head(50).to_csv(new_file, index=False)
+    state = train_incremental(new_file, checkpoint, chunk_size=60)
+    assert state['n_rows'] == 250
+    assert len(state['sources']) == 2
+
+
+def test_train_incremental_requires_preprocessor(train_file, tmp_path):
+    """Test that a new model without a preprocessor raises a ValueError."""
+    with pytest.raises(ValueError, match="A preprocessor is required"):
+        train_incremental(train_file, str(tmp_path / "checkpoint.pickle"))
+
+
+def test_train_incremental_invalid_chunk_size(preprocessor, train_file):
+    """Test that a non-positive chunk size raises a ValueError."""
+    with pytest.raises(ValueError, match="chunk_size must be a positive integer."):
+        train_incremental(train_file, preprocessor=preprocessor, chunk_size=0)
+
+
+def test_incremental_pipeline_compiles(preprocessor, train_file):
+    """Test that the fast-path predictor scores like the incremental pipeline."""
+    pipe = train_incremental(train_file, preprocessor=preprocessor, chunk_size=60)['pipeline']
+    X = read_data(train_file).drop(columns='target')
+
+    predictor = compile_pipeline(pipe)
+    np.testing.assert_array_equal(predictor.predict(X), pipe.predict(X))
+    np.testing.assert_allclose(predictor.decision_function(X), pipe.decision_function(X), atol=1e-10)
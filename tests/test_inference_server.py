@@ -0,0 +1,192 @@
+"""
+Tests for the online inference server.
+
+This module tests that `score_records` validates and scores raw records
+like the batch path does, that the micro-batcher groups concurrent
+requests, and the HTTP endpoints of `InferenceServer`.
+"""
+import asyncio
+import http.client
+import json
+import pytest
+import sys
+import os
+import threading
+import pandas as pd
+import numpy as np
+from sklearn.compose import make_column_transformer
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.svm import SVC
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.batch_predict import predict_with_scores
+from src.feature_engineering import engineer_features
+from src.inference_server import InferenceServer, MicroBatcher, score_records
+from src.validate_data import CATEGORY_VOCABULARIES
+
+
+@pytest.fixture
+def raw_records():
+    """Creates valid raw records, with some missing categorical values."""
+    rng = np.random.default_rng(7)
+    n = 60
+    raw = pd.DataFrame({
+        'age': rng.integers(18, 90, n), 'balance': rng.integers(-500, 5000, n),
+        'day_of_week': rng.integers(1, 31, n), 'duration': rng.integers(0, 1000, n),
+        'campaign': rng.integers(1, 10, n), 'pdays': rng.choice([-1, 30, 200], n),
+        'previous': rng.integers(0, 5, n),
+    })
+    for col in ['job', 'marital', 'education', 'default', 'housing', 'loan', 'contact', 'month', 'poutcome']:
+        raw[col] = rng.choice(CATEGORY_VOCABULARIES[col], n)
+    raw.loc[::7, 'education'] = None
+    raw['y'] = np.where(raw['duration'] > 500, 'yes', 'no')
+    return raw
+
+
+@pytest.fixture
+def fitted_pipeline(raw_records):
+    """Fits a small SVC pipeline on the engineered raw records."""
+    features = engineer_features(raw_records.astype({'education': object}).fillna(np.nan))
+    categorical = ['job', 'education', 'contact', 'pdays_contacted']
+    numeric = ['age', 'balance', 'duration', 'campaign', 'previous']
+    preprocessor = make_column_transformer(
+        (make_pipeline(SimpleImputer(strategy='most_frequent'), OneHotEncoder(handle_unknown='ignore')), categorical),
+        (StandardScaler(), numeric),
+    )
+    return make_pipeline(preprocessor, SVC()).fit(features, raw_records['y'].map({'yes': 1, 'no': 0}))
+
+
+def to_json_records(raw):
+    """Converts a raw dataframe into JSON-compatible request records."""
+    return json.loads(raw.drop(columns='y').to_json(orient='records'))
+
+
+def test_score_records_matches_batch_prediction(raw_records, fitted_pipeline):
+    """Test that scored records equal the batch predictions on the same rows."""
+    results = score_records(fitted_pipeline, to_json_records(raw_records))
+    predictions, scores = predict_with_scores(fitted_pipeline, engineer_features(raw_records.fillna(np.nan)))
+
+    assert [result['prediction'] for result in results] == predictions.tolist()
+    np.testing.assert_allclose([result['decision_score'] for result in results], scores)
+
+
+def test_score_records_reports_invalid_records(raw_records, fitted_pipeline):
+    """Test that invalid records get errors and the others are still scored."""
+    records = to_json_records(raw_records.head(4))
+    records[1]['age'] = 200
+    records[2]['job'] = 'astronaut'
+    del records[3]['balance']
+
+    results = score_records(fitted_pipeline, records)
+
+    assert 'prediction' in results[0]
+    assert results[1]['errors'] == ["'age' must be an integer between 18 and 91."]
+    assert results[2]['errors'][0].startswith("'job' must be one of")
+    assert results[3]['errors'] == ["'balance' is required."]
+
+
+def test_micro_batcher_groups_concurrent_requests():
+    """Test that concurrent submissions are scored in one batch, in order."""
+    batches = []
+
+    def score_fn(records):
+        batches.append(len(records))
+        return [record * 10 for record in records]
+
+    async def run():
+        batcher = MicroBatcher(score_fn, max_batch_size=64, max_wait_ms=50)
+        task = asyncio.create_task(batcher.run())
+        results = await asyncio.gather(*(batcher.submit([i, i + 1]) for i in range(5)))
+        task.cancel()
+        return results
+
+    results = asyncio.run(run())
+
+    assert batches == [10]
+    assert results == [[i * 10, (i + 1) * 10] for i in range(5)]
+
+
+def test_micro_batcher_invalid_batch_size():
+    """Test that a non-positive batch size raises a ValueError."""
+    with pytest.raises(ValueError, match="max_batch_size must be a positive integer."):
+        MicroBatcher(lambda records: records, max_batch_size=0)
+
+
+def test_server_endpoints(raw_records, fitted_pipeline):
+    """Test /predict, /metrics, /health and unknown paths over one keep-alive connection."""
+    server = InferenceServer(fitted_pipeline, port=0)
+    ready = threading.Event()
+    thread = threading.Thread(target=asyncio.run, args=(server.serve_forever(ready),))
+    thread.start()
+    try:
+        assert ready.wait(10)
+        conn = http.client.HTTPConnection("127.0.0.1", server.port, timeout=10)
+
+        def request(method, path, body=None):
+            conn.request(method, path, body=None if body is None else json.dumps(body))
+            response = conn.getresponse()
+            return response.status, json.loads(response.read())
+
+        records = to_json_records(raw_records.head(5))
+        status, payload = request("POST", "/predict", records)
+        assert status == 200
+        assert payload['predictions'] == score_records(fitted_pipeline, records)
+
+        status, payload = request("POST", "/predict", records[0])
+        assert status == 200
+        assert len(payload['predictions']) == 1
+
+        status, payload = request("POST", "/predict", dict(records[0], age=-1))
+        assert status == 422
+        assert list(payload['errors']) == ['0']
+
+        assert request("POST", "/predict", [])[0] == 400
+        assert request("GET", "/predict")[0] == 405
+        assert request("GET", "/unknown")[0] == 404
+        assert request("GET", "/health") == (200, {"status": "ok"})
+
+        status, metrics = request("GET", "/metrics")
+        assert status == 200
+        assert metrics['requests'] == 4
+        assert metrics['records'] == 6
+        assert metrics['errors'] == 2
+        assert metrics['latency_p50_ms'] <= metrics['latency_p99_ms']
+        conn.close()
+    finally:
+        server.shutdown()
+        thread.join(10)
+
+
+def test_server_rejects_bad_bodies(raw_records, fitted_pipeline):
+    """Test that non-list JSON bodies get status 400 and oversized bodies status 413."""
+    server = InferenceServer(fitted_pipeline, port=0, max_body_bytes=1000)
+    ready = threading.Event()
+    thread = threading.Thread(target=asyncio.run, args=(server.serve_forever(ready),))
+    thread.start()
+    try:
+        assert ready.wait(10)
+
+        def request(body):
+            conn = http.client.HTTPConnection("127.0.0.1", server.port, timeout=10)
+            conn.request("POST", "/predict", body=json.dumps(body))
+            response = conn.getresponse()
+            result = response.status, json.loads(response.read())
+            conn.close()
+            return result
+
+        for body in (5, True, "record", None, [1, 2]):
+            status, payload = request(body)
+            assert status == 400
+            assert 'error' in payload
+
+        status, payload = request(to_json_records(raw_records))
+        assert status == 413
+        assert 'error' in payload
+
+        # the server still answers after the rejected requests
+        assert request(to_json_records(raw_records.head(1)))[0] == 200
+    finally:
+        server.shutdown()
+        thread.join(10)
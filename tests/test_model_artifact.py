@@ -0,0 +1,128 @@
+"""
+Tests for the compact model artifact.
+
+This module tests that a pipeline exported with `export_artifact` and loaded
+with `load_artifact` predicts like the fitted sklearn pipeline, for both SVC
+backends, and that unsupported pipelines and artifact versions are rejected.
+"""
+import json
+import pytest
+import sys
+import os
+import pandas as pd
+import numpy as np
+from sklearn.compose import make_column_transformer
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import RandomizedSearchCV
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.batch_predict import load_pipeline
+from src.fast_predictor import FastPredictor
+from src.model_artifact import export_artifact, load_artifact
+from src.svc_models import build_svc_pipeline
+
+
+@pytest.fixture
+def features():
+    """Creates processed features with missing categorical values."""
+    rng = np.random.default_rng(11)
+    n = 80
+    df = pd.DataFrame({
+        'job': rng.choice(['admin.', 'technician', 'services'], n).astype(object),
+        'contact': rng.choice(['cellular', 'telephone'], n),
+        'education': rng.choice(['primary', 'secondary', 'tertiary'], n).astype(object),
+        'age': rng.integers(18, 90, n),
+        'balance': rng.normal(1000, 800, n),
+    })
+    df.loc[::9, 'job'] = np.nan
+    df.loc[::7, 'education'] = np.nan
+    df['target'] = ((df['age'] > 50) ^ (df['contact'] == 'telephone')).astype(int)
+    return df
+
+
+def make_preprocessor():
+    """Builds a preprocessor shaped like the one in scripts/preprocess.py."""
+    return make_column_transformer(
+        (make_pipeline(SimpleImputer(strategy='most_frequent'), OneHotEncoder(handle_unknown='ignore')),
+         ['job', 'contact']),
+        (make_pipeline(SimpleImputer(strategy='most_frequent'),
+                       OrdinalEncoder(categories=[['unknown', 'primary', 'secondary', 'tertiary']], dtype=object)),
+         ['education']),
+        (StandardScaler(), ['age', 'balance']),
+    )
+
+
+@pytest.mark.parametrize("mode", ["exact", "approx"])
+def test_artifact_matches_pipeline(features, tmp_path, mode):
+    """Test that the loaded artifact predicts like the fitted pipeline."""
+    X, y = features.drop(columns='target'), features['target']
+    pipe, _ = build_svc_pipeline(make_preprocessor(), 522, mode)
+    pipe.fit(X, y)
+
+    export_artifact(pipe, tmp_path / "artifact")
+    predictor = load_artifact(tmp_path / "artifact")
+
+    X_new = X.copy()
+    X_new.loc[0, 'job'] = 'astronaut'
+    np.testing.assert_array_equal(predictor.predict(X_new), pipe.predict(X_new))
+    np.testing.assert_allclose(predictor.decision_function(X_new), pipe.decision_function(X_new), atol=1e-10)
+    # the compiled table is read from the mapped artifact, not rebuilt
+    assert isinstance(predictor._table, np.memmap)
+
+
+def test_artifact_from_search_and_load_pipeline(features, tmp_path):
+    """Test that a search exports its best estimator and `load_pipeline` reads directories."""
+    X, y = features.drop(columns='target'), features['target']
+    pipe, param_dist = build_svc_pipeline(make_preprocessor(), 522)
+    search = RandomizedSearchCV(pipe, param_dist, n_iter=2, cv=3, random_state=522).fit(X, y)
+
+    export_artifact(search, tmp_path / "artifact")
+    predictor = load_pipeline(str(tmp_path / "artifact"))
+
+    assert isinstance(predictor, FastPredictor)
+    assert predictor.classes_.tolist() == [0, 1]
+    np.testing.assert_array_equal(predictor.predict(X), search.best_estimator_.predict(X))
+    assert not any(name.endswith(".pickle") for name in os.listdir(tmp_path / "artifact"))
+
+
+def test_artifact_unknown_ordinal_category(features, tmp_path):
+    """Test that an unknown ordinal category raises like the OrdinalEncoder."""
+    X, y = features.drop(columns='target'), features['target']
+    pipe, _ = build_svc_pipeline(make_preprocessor(), 522)
+    export_artifact(pipe.fit(X, y), tmp_path / "artifact")
+
+    with pytest.raises(ValueError, match="Found unknown categories"):
+        load_artifact(tmp_path / "artifact").predict(X.assign(education='doctorate'))
+
+
+def test_export_unsupported_pipeline(features, tmp_path):
+    """Test that estimators the format cannot represent raise a ValueError."""
+    X, y = features.drop(columns='target'), features['target']
+    pipe = make_pipeline(make_preprocessor(), LogisticRegression()).fit(X, y)
+
+    with pytest.raises(ValueError, match="Unsupported estimator steps"):
+        export_artifact(pipe, tmp_path / "artifact")
+
+
+def test_load_artifact_version_mismatch(features, tmp_path):
+    """Test that artifacts of another format version are rejected."""
+    X, y = features.drop(columns='target'), features['target']
+    pipe, _ = build_svc_pipeline(make_preprocessor(), 522)
+    manifest_path = export_artifact(pipe.fit(X, y), tmp_path / "artifact")
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    manifest['format_version'] += 1
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f)
+
+    with pytest.raises(ValueError, match="Unsupported model artifact format"):
+        load_artifact(tmp_path / "artifact")
+
+
+def test_load_artifact_missing(tmp_path):
+    """Test that a missing artifact raises a FileNotFoundError."""
+    with pytest.raises(FileNotFoundError, match="does not exist."):
+        load_artifact(tmp_path / "missing")
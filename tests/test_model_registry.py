@@ -0,0 +1,109 @@
+"""
+Tests for the model registry.
+
+This module tests that every model family of `search_model` is tuned and
+refitted on the full pipeline, that the gradient boosting pipeline encodes
+the one-hot encoded columns as native categorical features, and that
+invalid model and search combinations raise.
+"""
+import pytest
+import sys
+import os
+import pandas as pd
+import numpy as np
+from sklearn.compose import make_column_transformer
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline, make_pipeline
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.model_registry import MODEL_BUILDERS, native_categorical_preprocessor, search_model
+
+
+@pytest.fixture
+def features():
+    """Creates processed features with missing categorical values."""
+    rng = np.random.default_rng(7)
+    n = 150
+    df = pd.DataFrame({
+        'job': rng.choice(['admin.', 'technician', 'services', 'retired'], n).astype(object),
+        'month': rng.choice(['jan', 'feb', 'mar'], n),
+        'education': rng.choice(['primary', 'secondary', 'tertiary'], n).astype(object),
+        'age': rng.integers(18, 90, n),
+        'balance': rng.normal(1000, 800, n),
+    })
+    df.loc[::8, 'job'] = np.nan
+    df['target'] = ((df['age'] > 50) ^ (df['job'] == 'retired')).astype(int)
+    return df
+
+
+@pytest.fixture
+def preprocessor():
+    """Creates a preprocessor shaped like scripts/preprocess.py."""
+    return make_column_transformer(
+        (make_pipeline(SimpleImputer(strategy='most_frequent'), OneHotEncoder(handle_unknown='ignore')),
+         ['job', 'month']),
+        (make_pipeline(SimpleImputer(strategy='most_frequent'),
+                       OrdinalEncoder(categories=[['unknown', 'primary', 'secondary', 'tertiary']],
+                                      dtype=np.float64)),
+         ['education']),
+        (StandardScaler(), ['age', 'balance']),
+        sparse_threshold=1.0,
+    )
+
+
+@pytest.mark.parametrize("model", list(MODEL_BUILDERS))
+@pytest.mark.parametrize("search", ["random", "halving"])
+def test_search_model_fits_every_family(features, preprocessor, model, search):
+    """Test that every model family is tuned and refitted on the full pipeline."""
+    X, y = features.drop(columns='target'), features['target']
+    search_cv = search_model(model, X, y, preprocessor, 522, search=search, n_iter=3)
+
+    assert isinstance(search_cv.best_estimator_, Pipeline)
+    assert 0 <= search_cv.best_score_ <= 1
+    assert search_cv.best_estimator_.predict(X).shape == (len(X),)
+
+
+@pytest.mark.parametrize("model", list(MODEL_BUILDERS))
+def test_builders_share_one_signature(preprocessor, model):
+    """Test that every builder takes the preprocessor, a seed and keyword options."""
+    pipe, param_dist = MODEL_BUILDERS[model](preprocessor, 522, mode='approx')
+
+    assert isinstance(pipe, Pipeline)
+    assert all(key.split('__')[0] in pipe.named_steps for key in param_dist)
+
+
+def test_native_categorical_preprocessor(features, preprocessor):
+    """Test that the one-hot encoded columns become leading categorical codes, with NaN for missing values."""
+    native_preprocessor, categorical_mask = native_categorical_preprocessor(preprocessor)
+    X = native_preprocessor.fit_transform(features.drop(columns='target'))
+
+    assert X.shape == (len(features), 5)
+    np.testing.assert_array_equal(categorical_mask, [True, True, False, False, False])
+    assert np.isnan(X[::8, 0]).all()
+    assert set(np.unique(X[:, 1])) == {0.0, 1.0, 2.0}
+
+
+def test_hist_gradient_boosting_uses_native_categories(features, preprocessor):
+    """Test that the gradient boosting model treats the encoded columns as categorical features."""
+    X, y = features.drop(columns='target'), features['target']
+    pipe = search_model('hist_gradient_boosting', X, y, preprocessor, 522, n_iter=2).best_estimator_
+
+    model = pipe[-1]
+    assert isinstance(model, HistGradientBoostingClassifier)
+    np.testing.assert_array_equal(model.is_categorical_, [True, True, False, False, False])
+
+
+def test_search_model_invalid_model(features, preprocessor):
+    """Test that an unknown model family raises a ValueError."""
+    X, y = features.drop(columns='target'), features['target']
+    with pytest.raises(ValueError, match="model must be one of"):
+        search_model('random_forest', X, y, preprocessor, 522)
+
+
+def test_search_model_precomputed_requires_svc(features, preprocessor):
+    """Test that the precomputed kernel search is only available for the SVC."""
+    X, y = features.drop(columns='target'), features['target']
+    with pytest.raises(ValueError, match="search='precomputed' requires an RBF kernel SVC"):
+        search_model('logistic_regression', X, y, preprocessor, 522, search='precomputed')
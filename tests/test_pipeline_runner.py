@@ -0,0 +1,136 @@
+"""
+Tests for the incremental pipeline runner.
+
+This module tests that `PipelineRunner` runs stages in dependency order,
+skips stages whose parameters, inputs and code are unchanged, restores
+cached outputs, reruns stages when the `src` code they import changes, and
+runs independent stages concurrently. The stages are small scripts in a
+temporary project root.
+"""
+import pytest
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.pipeline_runner import PipelineRunner, Stage, code_files, analysis_stages
+
+SCRIPT = """
+import os, sys, time, click
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.helper import transform
+
+@click.command()
+@click.option('--source')
+@click.option('--target')
+@click.option('--suffix', default='')
+@click.option('--sleep', type=float, default=0)
+def main(source, target, suffix, sleep):
+    start = time.time()
+    time.sleep(sleep)
+    with open(source) as f:
+        text = f.read()
+    with open(target, 'w') as f:
+        f.write(transform(text) + suffix)
+    with open(target + '.times', 'w') as f:
+        f.write(f"{start} {time.time()}")
+
+main()
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Creates a project root with a script importing a src module, and raw data."""
+    (tmp_path / "src").mkdir()
+    (tmp_path / "scripts").mkdir()
+    (tmp_path / "src" / "helper.py").write_text("from src.other import upper\n\ndef transform(text):\n    return upper(text)\n")
+    (tmp_path / "src" / "other.py").write_text("def upper(text):\n    return text.upper()\n")
+    (tmp_path / "scripts" / "step.py").write_text(SCRIPT)
+    (tmp_path / "raw.txt").write_text("abc")
+    return tmp_path
+
+
+def _stages(suffix='', sleep=0):
+    return [
+        Stage("first", "scripts/step.py", {"--source": "raw.txt", "--target": "first.txt", "--suffix": suffix},
+              inputs=["raw.txt"], outputs=["first.txt"]),
+        Stage("second", "scripts/step.py", {"--source": "first.txt", "--target": "second.txt", "--sleep": sleep},
+              inputs=["first.txt"], outputs=["second.txt"], deps=["first"]),
+        Stage("side", "scripts/step.py", {"--source": "raw.txt", "--target": "side.txt", "--sleep": sleep},
+              inputs=["raw.txt"], outputs=["side.txt"]),
+    ]
+
+
+def _statuses(summary):
+    return dict(zip(summary['stage'], summary['status']))
+
+
+def test_code_files(project):
+    """Test that the code of a stage includes the src modules imported through other modules."""
+    assert code_files("scripts/step.py", str(project)) == ["scripts/step.py", "src/helper.py", "src/other.py"]
+
+
+def test_runs_then_skips(project):
+    """Test that stages run once, then are up to date, and that only changed stages rerun."""
+    runner = PipelineRunner(_stages(), cache_dir=".cache", root=str(project))
+    assert set(_statuses(runner.run(verbose=False)).values()) == {"ran"}
+    assert (project / "second.txt").read_text() == "ABC"
+    assert set(_statuses(runner.run(verbose=False)).values()) == {"up to date"}
+
+    # a new parameter reruns the stage and the stages that read its output
+    runner = PipelineRunner(_stages(suffix='!'), cache_dir=".cache", root=str(project))
+    assert _statuses(runner.run(verbose=False)) == {"first": "ran", "second": "ran", "side": "up to date"}
+
+    # switching back restores the cached outputs without running
+    runner = PipelineRunner(_stages(), cache_dir=".cache", root=str(project))
+    assert set(_statuses(runner.run(verbose=False)).values()) == {"restored", "up to date"}
+    assert (project / "second.txt").read_text() == "ABC"
+
+
+def test_code_change_reruns(project):
+    """Test that editing an imported src module reruns the stages using it."""
+    runner = PipelineRunner(_stages(), cache_dir=".cache", root=str(project))
+    runner.run(["second"], verbose=False)
+    (project / "src" / "other.py").write_text("def upper(text):\n    return text.upper() * 2\n")
+    assert _statuses(runner.run(["second"], verbose=False)) == {"first": "ran", "second": "ran"}
+    assert (project / "second.txt").read_text() == "ABCABCABCABC"
+
+
+def test_independent_stages_run_concurrently(project):
+    """Test that a stage without dependencies runs alongside a dependency chain."""
+    runner = PipelineRunner(_stages(sleep=1.0), cache_dir=".cache", root=str(project), max_workers=2)
+    runner.run(verbose=False)
+    second = [float(t) for t in (project / "second.txt.times").read_text().split()]
+    side = [float(t) for t in (project / "side.txt.times").read_text().split()]
+    assert side[0] < second[1] and second[0] < side[1]
+
+
+def test_failed_stage_raises(project):
+    """Test that a failing stage raises and is not cached, and that unknown stages are rejected."""
+    (project / "raw.txt").unlink()
+    stages = _stages()
+    stages[0].inputs = []
+    runner = PipelineRunner(stages, cache_dir=".cache", root=str(project))
+    with pytest.raises(RuntimeError, match="Stage 'first' failed"):
+        runner.run(["second"], verbose=False)
+    assert not (project / ".cache" / "stages").exists()
+    with pytest.raises(ValueError, match="Unknown stage"):
+        runner.run(["report"], verbose=False)
+
+
+def test_analysis_stages():
+    """Test that the analysis stages form the Makefile's chain, with the plots independent."""
+    stages = {stage.name: stage for stage in analysis_stages(data_format="parquet")}
+    assert stages["plots"].deps == [] and stages["evaluate"].deps == ["train"]
+    assert "data/processed_data/train.parquet" in stages["preprocess"].inputs
+    PipelineRunner(list(stages.values()))
+
+
+def test_analysis_stages_model_outputs():
+    """Test that the train and evaluate stages name their files after the model."""
+    stages = {stage.name: stage for stage in analysis_stages(model="logistic_regression")}
+    pipeline = "results/models/logistic_regression_pipeline.pickle"
+    assert stages["train"].args["--model"] == "logistic_regression"
+    assert pipeline in stages["train"].outputs and pipeline in stages["evaluate"].inputs
+    assert not any("svc" in path for path in stages["train"].outputs + stages["evaluate"].outputs)
+    assert "results/models/svc_artifact" in analysis_stages()[4].outputs
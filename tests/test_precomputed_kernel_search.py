@@ -0,0 +1,87 @@
+"""
+Tests for the precomputed-kernel SVC search.
+
+This module tests that `PrecomputedKernelSearchCV` selects the same
+parameters as the standard randomized search, that its kernels match
+sklearn's RBF kernel, and that its memory budget is enforced.
+"""
+import pytest
+import sys
+import os
+import pandas as pd
+import numpy as np
+from scipy.stats import loguniform
+from sklearn.compose import make_column_transformer
+from sklearn.metrics.pairwise import rbf_kernel
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.precomputed_kernel_search import (
+    PrecomputedKernelSearchCV, squared_distances, rbf_from_distances
+)
+from src.random_search_svc import search_svc
+
+
+@pytest.fixture
+def training_data():
+    """Creates a small, learnable two-feature classification problem."""
+    rng = np.random.default_rng(7)
+    X = pd.DataFrame({'feat_A': rng.random(80), 'feat_B': rng.random(80)})
+    y = pd.Series((X['feat_A'] + 0.4 * rng.random(80) > 0.7).astype(int), name='target')
+    return X, y
+
+
+@pytest.fixture
+def preprocessor():
+    """Returns a simple preprocessor (StandardScaler) for the SVC test."""
+    return make_column_transformer((StandardScaler(), ['feat_A', 'feat_B']))
+
+
+def test_kernel_matches_rbf_kernel():
+    """Test that the chunked distances give sklearn's RBF kernel."""
+    rng = np.random.default_rng(0)
+    A, B = rng.random((50, 4)), rng.random((30, 4))
+    distances = squared_distances(A, B, chunk_mb=0.001)
+    kernel = rbf_from_distances(distances, 0.5, np.empty_like(distances))
+
+    np.testing.assert_allclose(kernel, rbf_kernel(A, B, gamma=0.5))
+
+
+def test_precomputed_search_matches_random_search(training_data, preprocessor):
+    """Test that both searches score the same candidates and pick the same parameters."""
+    X, y = training_data
+
+    precomputed = search_svc(X, y, preprocessor, seed=42, search="precomputed", n_iter=12)
+    random = search_svc(X, y, preprocessor, seed=42, search="random", n_iter=12)
+
+    assert isinstance(precomputed, PrecomputedKernelSearchCV)
+    assert precomputed.best_params_ == random.best_params_
+    np.testing.assert_allclose(precomputed.cv_results_["mean_test_score"],
+                               random.cv_results_["mean_test_score"])
+    np.testing.assert_allclose(precomputed.cv_results_["mean_train_score"],
+                               random.cv_results_["mean_train_score"])
+    np.testing.assert_array_equal(precomputed.predict(X), random.predict(X))
+
+
+def test_precomputed_search_memory_limit(training_data, preprocessor):
+    """Test that folds exceeding the memory budget raise a MemoryError."""
+    X, y = training_data
+    search = PrecomputedKernelSearchCV(
+        make_pipeline(preprocessor, SVC()),
+        {"svc__C": loguniform(1e-2, 1e3), "svc__gamma": loguniform(1e-2, 1e3)},
+        n_iter=2,
+        max_memory_mb=0.01
+    )
+
+    with pytest.raises(MemoryError, match="max_memory_mb"):
+        search.fit(X, y)
+
+
+def test_precomputed_search_requires_exact_mode(training_data, preprocessor):
+    """Test that the approximate backend cannot use precomputed kernels."""
+    X, y = training_data
+
+    with pytest.raises(ValueError, match="search='precomputed' requires an RBF kernel SVC"):
+        search_svc(X, y, preprocessor, seed=42, mode="approx", search="precomputed")
@@ -13,7 +13,9 @@ import pytest
 import os
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.preprocess_deepcheck import preprocess_deepcheck
+from src.preprocess_deepcheck import (
+    preprocess_deepcheck, run_validation_checks, stratified_sample, CHECK_NAMES
+)
 # --- Fixtures for Test Data ---
 
 @pytest.fixture
@@ -179,3 +181,39 @@ def test_deepchecks_passes_on_valid_data(base_df):
     
     # Check the pass messages in stdout
     pass
+
+def test_preprocess_deepcheck_does_not_modify_input(base_df):
+    """Test that the input dataframe is left unchanged."""
+    original = base_df.copy()
+    target_df, _, _ = preprocess_deepcheck(base_df)
+
+    pd.testing.assert_frame_equal(base_df, original)
+    assert list(target_df.columns)[-2:] == ['target', 'pdays_contacted']
+
+# --- Test Cases for Tiered Validation ---
+
+def test_stratified_sample_keeps_class_proportions(base_df):
+    """Test that the sample has the requested size and class proportions."""
+    df = pd.concat([base_df] * 10, ignore_index=True)
+    sample = stratified_sample(df, 'y', 200)
+
+    assert len(sample) == 200
+    assert (sample['y'] == 'yes').mean() == (df['y'] == 'yes').mean()
+    assert sample.index.is_monotonic_increasing
+    assert stratified_sample(df, 'y', 5000) is df
+
+def test_run_validation_checks_tiered(base_df):
+    """Test the per-check report of the tiered mode."""
+    target_df, _, _ = preprocess_deepcheck(base_df)
+    results = run_validation_checks(target_df, mode='tiered')
+
+    assert results['check'].tolist() == CHECK_NAMES
+    assert results.set_index('check').loc['Outliers', 'tier'] == 'sample'
+    assert results['passed'].all()
+    assert (results['seconds'] > 0).all()
+
+def test_run_validation_checks_invalid_mode(base_df):
+    """Test that an unknown validation mode raises a ValueError."""
+    target_df, _, _ = preprocess_deepcheck(base_df)
+    with pytest.raises(ValueError, match="Unknown validation mode"):
+        run_validation_checks(target_df, mode='fast')
@@ -0,0 +1,45 @@
+"""
+Tests for the preprocessing script.
+
+This module runs scripts/preprocess.py on the sampled train and test
+splits and tests that its outputs do not depend on the number of workers.
+"""
+import os
+import sys
+from click.testing import CliRunner
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from preprocess import main
+
+data_dir = os.path.join(os.path.dirname(__file__), '..', 'data', 'processed_data')
+
+OUTPUTS = ["scaled_train.csv", "scaled_test.csv", "preprocess_train.csv", "preprocess_test.csv"]
+
+
+def run_preprocess(output_dir, workers):
+    """Runs the script with the given number of workers and returns the bytes of its data outputs."""
+    os.makedirs(output_dir)
+    result = CliRunner().invoke(main, [
+        '--train-csv-file', os.path.join(data_dir, 'train.csv'),
+        '--test-csv-file', os.path.join(data_dir, 'test.csv'),
+        '--data-to', str(output_dir),
+        '--preprocessor-to', str(output_dir),
+        '--plot-to', str(output_dir),
+        '--workers', str(workers),
+    ])
+    assert result.exit_code == 0, result.output
+    outputs = {}
+    for name in OUTPUTS:
+        with open(os.path.join(output_dir, name), "rb") as f:
+            outputs[name] = f.read()
+    return outputs
+
+
+def test_preprocess_outputs_do_not_depend_on_workers(tmp_path):
+    """Test that one and two workers write identical processed files."""
+    serial = run_preprocess(tmp_path / "serial", workers=1)
+    parallel = run_preprocess(tmp_path / "parallel", workers=2)
+
+    assert serial.keys() == parallel.keys()
+    for name in OUTPUTS:
+        assert serial[name] == parallel[name], name
@@ -16,6 +16,8 @@ import numpy as np
 from sklearn.preprocessing import StandardScaler
 from sklearn.compose import make_column_transformer
 from sklearn.model_selection import RandomizedSearchCV
+from sklearn.experimental import enable_halving_search_cv
+from sklearn.model_selection import HalvingRandomSearchCV
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from src.random_search_svc import search_svc
@@ -87,4 +89,74 @@ def test_search_svc_wrong_type(test_preprocessor):
     
     # Raises either KeyError, ValueError, or AttributeError if input not a DataFrame.
     with pytest.raises(Exception): 
-        search_svc(X_invalid, y_invalid, test_preprocessor, seed=42)
\ No newline at end of file
+        search_svc(X_invalid, y_invalid, test_preprocessor, seed=42)
+
+def test_search_svc_approx_mode(test_training_data, test_preprocessor):
+    """
+    Test that the 'approx' mode tunes the Nystroem + linear SVM pipeline.
+    """
+    X_train, y_train = test_training_data
+
+    model = search_svc(X_train, y_train, test_preprocessor, seed=42, mode="approx")
+
+    assert isinstance(model, RandomizedSearchCV)
+    assert set(model.best_params_) == {"linearsvc__C", "nystroem__gamma"}
+    assert model.predict(X_train).shape == (20,)
+
+
+def test_search_svc_invalid_mode(test_training_data, test_preprocessor):
+    """
+    Test that an unknown mode raises a ValueError before any fitting.
+    """
+    X_train, y_train = test_training_data
+
+    with pytest.raises(ValueError, match="mode must be one of"):
+        search_svc(X_train, y_train, test_preprocessor, seed=42, mode="linear")
+
+
+def test_search_svc_halving_strategy(test_preprocessor):
+    """
+    Test that the 'halving' search screens candidates on growing row budgets
+    and refits the survivor on all rows.
+    """
+    rng = np.random.default_rng(0)
+    X_train = pd.DataFrame({'feat_A': rng.random(90), 'feat_B': rng.random(90)})
+    y_train = pd.Series((X_train['feat_A'] > 0.5).astype(int), name='target')
+
+    model = search_svc(X_train, y_train, test_preprocessor, seed=42, search="halving", n_iter=9)
+
+    assert isinstance(model, HalvingRandomSearchCV)
+    assert model.n_candidates_[0] == 9
+    assert model.n_resources_[0] < model.n_resources_[-1] <= len(X_train)
+    assert hasattr(model, "best_estimator_")
+
+
+def test_search_svc_invalid_search(test_training_data, test_preprocessor):
+    """
+    Test that an unknown search strategy raises a ValueError.
+    """
+    X_train, y_train = test_training_data
+
+    with pytest.raises(ValueError, match="search must be one of"):
+        search_svc(X_train, y_train, test_preprocessor, seed=42, search="grid")
+
+
+def test_search_svc_cached_folds_match_uncached(test_preprocessor):
+    """
+    Test that caching the fitted preprocessor of every fold gives the same
+    scores and parameters as refitting it inside every candidate.
+    """
+    rng = np.random.default_rng(1)
+    X_train = pd.DataFrame({'feat_A': rng.random(60), 'feat_B': rng.random(60)})
+    y_train = pd.Series((X_train['feat_A'] + 0.3 * rng.random(60) > 0.6).astype(int), name='target')
+
+    cached = search_svc(X_train, y_train, test_preprocessor, seed=42, n_iter=8, cache=True)
+    uncached = search_svc(X_train, y_train, test_preprocessor, seed=42, n_iter=8, cache=False)
+
+    np.testing.assert_allclose(cached.cv_results_["mean_test_score"],
+                               uncached.cv_results_["mean_test_score"])
+    assert cached.best_params_ == uncached.best_params_
+    np.testing.assert_array_equal(cached.predict(X_train), uncached.predict(X_train))
+    # The search is a plain refitted search over the full pipeline
+    assert len(cached.estimator.steps) == len(uncached.estimator.steps)
+    assert cached.best_estimator_.memory is None
@@ -0,0 +1,106 @@
+"""
+Tests for reading the data files written by write_csv.
+
+This module tests that CSV, Parquet and Arrow files round trip through
+`write_csv` and `read_data` with their values and dtypes, that
+`iter_data_chunks` reads them back in order, and that typed reads give
+the schema columns compact dtypes without changing their values.
+"""
+import pytest
+import sys
+import os
+import pandas as pd
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.read_data import read_data, iter_data_chunks, apply_schema_dtypes
+from src.validate_data import CATEGORY_VOCABULARIES
+from src.write_csv import write_csv
+
+RAW_SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'data', 'raw', 'raw_data_sample.csv')
+
+
+@pytest.fixture
+def processed_df():
+    """Creates a processed-data-like frame with missing categorical values."""
+    df = pd.DataFrame({
+        'job': ['admin.', 'technician', None, 'retired', 'admin.'],
+        'education': ['primary', np.nan, 'tertiary', 'secondary', 'primary'],
+        'age': [30, 45, 61, 72, 25],
+        'balance': [1000.5, -20.0, 0.0, 350.25, 12.0],
+        'target': [0, 1, 0, 1, 0],
+    })
+    return df
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet", "arrow"])
+def test_read_data_round_trip(tmp_path, processed_df, fmt):
+    """Test that every format reads back the written values and dtypes."""
+    write_csv(processed_df, str(tmp_path), f"data.{fmt}")
+    df = read_data(str(tmp_path / f"data.{fmt}"))
+
+    pd.testing.assert_frame_equal(df, processed_df.fillna(np.nan))
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_read_data_columnar_options(tmp_path, processed_df, fmt):
+    """Test column selection and categorical string columns for columnar files."""
+    write_csv(processed_df, str(tmp_path), f"data.{fmt}")
+    df = read_data(str(tmp_path / f"data.{fmt}"), columns=['job', 'age'], categorical=True)
+
+    assert list(df.columns) == ['job', 'age']
+    assert isinstance(df['job'].dtype, pd.CategoricalDtype)
+    assert df['age'].dtype == np.int64
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet", "arrow"])
+def test_iter_data_chunks(tmp_path, processed_df, fmt):
+    """Test that chunks have at most chunk_size rows and concatenate to the data."""
+    write_csv(processed_df, str(tmp_path), f"data.{fmt}")
+    chunks = list(iter_data_chunks(str(tmp_path / f"data.{fmt}"), chunk_size=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), processed_df.fillna(np.nan))
+
+
+def test_read_data_missing_file(tmp_path):
+    """Test that a missing file raises a FileNotFoundError."""
+    with pytest.raises(FileNotFoundError, match="does not exist"):
+        read_data(str(tmp_path / "missing.parquet"))
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet", "arrow"])
+def test_typed_read(tmp_path, processed_df, fmt):
+    """Test that typed reads have vocabulary categoricals and small integers with the same values."""
+    write_csv(processed_df, str(tmp_path), f"data.{fmt}")
+    df = read_data(str(tmp_path / f"data.{fmt}"), typed=True)
+
+    assert list(df['job'].cat.categories) == CATEGORY_VOCABULARIES['job']
+    assert list(df['education'].cat.categories) == CATEGORY_VOCABULARIES['education']
+    assert df['age'].dtype == np.int8
+    # columns outside the schema are left as they are
+    assert df['balance'].dtype == np.float64 and df['target'].dtype == np.int64
+    pd.testing.assert_frame_equal(df, processed_df.fillna(np.nan), check_dtype=False, check_categorical=False)
+
+    chunks = list(iter_data_chunks(str(tmp_path / f"data.{fmt}"), chunk_size=2, typed=True))
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), df)
+
+
+def test_apply_schema_dtypes_keeps_values():
+    """Test that out-of-vocabulary and out-of-range values are kept, and that the input is not modified."""
+    df = pd.DataFrame({'job': ['admin.', 'astronaut', None], 'age': [30, 300, 45],
+                       'campaign': [1.0, np.nan, 3.0], 'pdays': ['-1', 'x', '5']})
+    original = df.copy()
+    typed = apply_schema_dtypes(df)
+
+    assert list(typed['job'].cat.categories) == CATEGORY_VOCABULARIES['job'] + ['astronaut']
+    assert typed['age'].dtype == np.int16 and typed['age'].tolist() == [30, 300, 45]
+    assert typed['campaign'].dtype == np.float32
+    assert typed['pdays'].dtype == object
+    pd.testing.assert_frame_equal(df, original)
+
+
+def test_typed_raw_csv_matches_pandas_parser():
+    """Test that the Arrow parse of the raw data sample equals pandas' parse with the schema dtypes."""
+    expected = apply_schema_dtypes(pd.read_csv(RAW_SAMPLE, index_col=0))
+    pd.testing.assert_frame_equal(read_data(RAW_SAMPLE, typed=True, index_col=0), expected)
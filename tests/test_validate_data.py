@@ -0,0 +1,79 @@
+"""
+Tests for the chunked validation of the raw data.
+
+This module tests that `validate_data` with a chunk size reports exactly
+what the whole-file validation reports: value failures across chunks,
+dtype errors from missing values in integer columns, missing columns and
+the dataframe-level checks for duplicates, empty rows and missingness.
+"""
+import pytest
+import sys
+import os
+import numpy as np
+import pandas as pd
+from pandera.errors import SchemaErrors
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.validate_data import validate_data
+
+RAW_SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'data', 'raw', 'raw_data_sample.csv')
+
+
+@pytest.fixture
+def raw_df():
+    """Takes 60 rows of the raw data sample."""
+    return pd.read_csv(RAW_SAMPLE, index_col=0).head(60).reset_index(drop=True)
+
+
+def _report(path, chunk_size):
+    """Returns the message and failure cases of the validation, or None if it passes."""
+    try:
+        validate_data(path, chunk_size=chunk_size)
+    except SchemaErrors as err:
+        return str(err), err.failure_cases.astype(str)
+    return None
+
+
+def _assert_same_report(df, tmp_path, index=False):
+    path = str(tmp_path / "raw.csv")
+    df.to_csv(path, index=index)
+    expected = _report(path, None)
+    for chunk_size in [7, 25, 1000]:
+        result = _report(path, chunk_size)
+        if expected is None:
+            assert result is None
+        else:
+            assert result[0] == expected[0]
+            pd.testing.assert_frame_equal(result[1], expected[1])
+    return expected
+
+
+def test_valid_data_passes_in_chunks(raw_df, tmp_path):
+    """Test that valid data passes with and without chunks."""
+    assert _assert_same_report(raw_df, tmp_path) is None
+
+
+def test_value_and_dtype_failures_match(raw_df, tmp_path):
+    """Test that out-of-range values in several chunks and a float-typed integer column are reported alike."""
+    raw_df.loc[[3, 40], 'age'] = [120, 10]
+    raw_df.loc[55, 'campaign'] = 99
+    raw_df.loc[20, 'job'] = 'astronaut'
+    raw_df.loc[50, 'balance'] = np.nan
+    report = _assert_same_report(raw_df, tmp_path)
+    assert "120" in report[0] and "astronaut" in report[0] and "float64" in report[0]
+
+
+def test_duplicates_across_chunks(raw_df, tmp_path):
+    """Test that a duplicate of a row in an earlier chunk is found."""
+    raw_df.loc[58] = raw_df.loc[2]
+    report = _assert_same_report(raw_df, tmp_path)
+    assert "Duplicate rows found." in report[0]
+
+
+def test_frame_checks_and_missing_column(raw_df, tmp_path):
+    """Test that an empty row, high missingness and a missing column are reported alike."""
+    raw_df = raw_df.drop(columns='poutcome')
+    raw_df.loc[30] = np.nan
+    raw_df.loc[:, 'contact'] = np.nan
+    report = _assert_same_report(raw_df, tmp_path)
+    assert "Empty rows found." in report[0] and "poutcome" in report[0]
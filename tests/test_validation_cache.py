@@ -0,0 +1,74 @@
+"""
+Tests for the validation cache.
+
+This module tests that `dataset_fingerprint` depends on the content of a
+DataFrame only, and that `ValidationCache` records, finds, lists and clears
+passed checks per dataset and check configuration.
+"""
+import pytest
+import sys
+import os
+import pandas as pd
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from src.validation_cache import ValidationCache, dataset_fingerprint
+
+
+@pytest.fixture
+def df():
+    """Creates a small frame with a missing categorical value."""
+    return pd.DataFrame({
+        'job': ['admin.', np.nan, 'retired'],
+        'age': [30, 45, 61],
+        'target': [0, 1, 0],
+    })
+
+
+def test_dataset_fingerprint_content_only(df):
+    """Test that the fingerprint ignores dtypes and the index but not the values or columns."""
+    fingerprint = dataset_fingerprint(df)
+
+    assert dataset_fingerprint(df.astype({'job': 'category'})) == fingerprint
+    assert dataset_fingerprint(df.set_index(pd.Index([7, 8, 9]))) == fingerprint
+    assert dataset_fingerprint(df.assign(age=[30, 45, 62])) != fingerprint
+    assert dataset_fingerprint(df.rename(columns={'age': 'years'})) != fingerprint
+
+
+def test_dataset_fingerprint_ignores_numeric_width(df):
+    """Test that downcast or float numeric columns with the same values keep the fingerprint."""
+    fingerprint = dataset_fingerprint(df)
+    assert dataset_fingerprint(df.astype({'age': 'int8'})) == fingerprint
+    assert dataset_fingerprint(df.astype({'age': 'float64'})) == fingerprint
+    assert dataset_fingerprint(df.astype({'age': 'Int64'})) == fingerprint
+    assert dataset_fingerprint(df.astype({'age': 'str'})) != fingerprint
+
+
+def test_validation_cache_record_and_lookup(df, tmp_path):
+    """Test that a recorded pass is found for the same data and configuration only."""
+    cache = ValidationCache(str(tmp_path / "cache"))
+    config = {"check": "FeatureLabelCorrelation", "threshold": 0.9}
+    fingerprint = dataset_fingerprint(df)
+
+    assert cache.lookup(fingerprint, config) is None
+    assert cache.entries().empty
+    cache.record(fingerprint, config, len(df), 1.5)
+
+    assert cache.lookup(fingerprint, config)["rows"] == 3
+    assert cache.lookup(fingerprint, {**config, "threshold": 0.8}) is None
+    assert cache.lookup(dataset_fingerprint(df.head(2)), config) is None
+
+    entries = cache.entries()
+    assert entries['check'].tolist() == ["FeatureLabelCorrelation"]
+    assert entries['dataset'].iloc[0] == fingerprint[:12]
+
+
+def test_validation_cache_clear(df, tmp_path):
+    """Test that clear deletes all entries."""
+    cache = ValidationCache(str(tmp_path))
+    for threshold in (0.8, 0.9):
+        cache.record(dataset_fingerprint(df), {"check": "FeatureLabelCorrelation", "threshold": threshold}, 3, 0.1)
+
+    assert cache.clear() == 2
+    assert cache.entries().empty
+    assert ValidationCache(str(tmp_path / "missing")).clear() == 0
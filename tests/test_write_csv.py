@@ -80,4 +80,16 @@ def test_write_csv_empty_dataframe(sample_dataframe, temp_directory):
     empty_df = pd.DataFrame()  # Empty DataFrame
     
     with pytest.raises(ValueError, match="DataFrame must contain observations."):
-        write_csv(empty_df, temp_directory, "test_file.csv", index=False)
\ No newline at end of file
+        write_csv(empty_df, temp_directory, "test_file.csv", index=False)
+
+
+@pytest.mark.parametrize("filename", ["sparse.csv", "sparse.parquet", "sparse.arrow"])
+def test_write_csv_sparse_columns(temp_directory, filename):
+    from scipy import sparse
+    from src.read_data import read_data
+    values = sparse.csr_matrix([[1.0, 0.0, 0.5], [0.0, 0.0, -1.25]], dtype="float32")
+    sparse_df = pd.DataFrame.sparse.from_spmatrix(values, columns=["a", "b", "c"])
+    write_csv(sparse_df, temp_directory, filename)
+
+    loaded_df = read_data(os.path.join(temp_directory, filename))
+    pd.testing.assert_frame_equal(sparse_df.sparse.to_dense(), loaded_df, check_dtype=False)